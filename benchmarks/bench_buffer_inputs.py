@@ -0,0 +1,113 @@
+"""
+Compare decoding SparkplugB payloads from different buffer types.
+
+A receive path typically holds payloads as slices of a larger buffer (a socket
+`bytearray` or a memory-mapped capture file). This script decodes the same
+payload
+
+  - after copying it to `bytes` first (what callers had to do before),
+  - directly from the receive `bytearray`,
+  - from a `memoryview` of the whole receive buffer,
+  - from a `memoryview` slice of a larger buffer, and
+  - from a memory-mapped file,
+
+and reports the mean decode time and the peak Python allocation per decode.
+
+Run with:
+    python benchmarks/bench_buffer_inputs.py [--bytes-mb 32] [--rows 20000]
+"""
+
+import argparse
+import gc
+import mmap
+import os
+import tempfile
+import time
+import tracemalloc
+
+import sparkplug_b_parser as spt
+from sparkplug_b_parser import MetricDataType
+
+HEADER = b"\xff" * 64
+
+
+def bytes_value_payload(size: int) -> bytes:
+    payload = spt.Payload(timestamp=1, seq=0)
+    metric = payload.metrics.add()
+    metric.name = "waveform"
+    metric.datatype = MetricDataType.Bytes
+    metric.bytes_value = os.urandom(size)
+    return payload.SerializeToString()
+
+
+def dataset_payload(parser: spt.SparkplugBParser, rows: int) -> bytes:
+    columns = ["idx", "ch1", "ch2", "ch3", "ch4"]
+    types = [MetricDataType.Int32] + [MetricDataType.Double] * 4
+    payload = spt.Payload(timestamp=1, seq=0)
+    dataset = parser.init_dataset_metric(payload, "dataset", types, columns)
+    parser.add_rows_to_dataset(
+        dataset, [[i, i * 0.5, i * 1.5, i * 2.5, i * 3.5] for i in range(rows)]
+    )
+    return payload.SerializeToString()
+
+
+def measure(decode, repeat: int) -> tuple[float, int]:
+    decode()  # warm up
+    gc.collect()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        decode()
+    elapsed = (time.perf_counter() - start) / repeat
+    tracemalloc.start()
+    decode()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def run_case(name: str, parser: spt.SparkplugBParser, raw: bytes, repeat: int) -> None:
+    receive = bytearray(raw)
+    framed = bytearray(HEADER) + raw
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "payload.bin")
+        with open(path, "wb") as f:
+            f.write(raw)
+        with open(path, "rb") as f, mmap.mmap(
+            f.fileno(), 0, access=mmap.ACCESS_READ
+        ) as mapped:
+            slice_view = memoryview(framed)[len(HEADER) :]
+            decode = parser.parse_bytes_to_protobuf
+            cases = {
+                "bytes(memoryview) copy": lambda: decode(bytes(slice_view)),
+                "bytearray": lambda: decode(receive),
+                "memoryview (whole)": lambda: decode(memoryview(receive)),
+                "memoryview (slice)": lambda: decode(slice_view),
+                "mmap": lambda: decode(mapped),
+            }
+            print(f"\n{name}: {len(raw) / 1e6:.2f} MB")
+            print(f"  {'input':<24}{'mean ms':>10}{'peak MB':>10}")
+            for label, func in cases.items():
+                elapsed, peak = measure(func, repeat)
+                print(f"  {label:<24}{elapsed * 1e3:>10.3f}{peak / 1e6:>10.2f}")
+            slice_view.release()
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    arg_parser.add_argument("--bytes-mb", type=float, default=32.0)
+    arg_parser.add_argument("--rows", type=int, default=20_000)
+    arg_parser.add_argument("--repeat", type=int, default=20)
+    args = arg_parser.parse_args()
+
+    parser = spt.SparkplugBParser()
+    run_case(
+        "bytes_value payload",
+        parser,
+        bytes_value_payload(int(args.bytes_mb * 1e6)),
+        args.repeat,
+    )
+    run_case("DataSet payload", parser, dataset_payload(parser, args.rows), args.repeat)
+
+
+if __name__ == "__main__":
+    main()
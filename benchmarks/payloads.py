@@ -0,0 +1,220 @@
+"""
+Deterministic synthetic SparkplugB payloads for the benchmark suite.
+
+Payloads are built as dicts in the shape accepted by
+`SparkplugBParser.parse_dict_to_protobuf`, so the same input can be used for
+every benchmarked path. `validator_payload` builds the equivalent input for the
+pydantic `SparkplugBPayload` model.
+"""
+
+import base64
+
+import numpy as np
+
+from sparkplug_b_parser import MetricDataType
+
+TIMESTAMP = 1737090405000
+
+# PropertyValue types with no MetricDataType counterpart
+PROPERTY_SET = 20
+PROPERTY_SET_LIST = 21
+
+# (datatype, value field, value for metric i) cycled over scalar metrics
+_SCALAR_METRICS = (
+    (MetricDataType.Int32, "int_value", lambda i: i),
+    (MetricDataType.Int64, "long_value", lambda i: i * 1_000_003),
+    (MetricDataType.Double, "double_value", lambda i: i * 0.25),
+    (MetricDataType.Boolean, "boolean_value", lambda i: i % 2 == 0),
+    (MetricDataType.String, "string_value", lambda i: f"value-{i}"),
+)
+
+# (datatype, DataSetValue field, value for row r) cycled over DataSet columns
+_DATASET_COLUMNS = (
+    (MetricDataType.Double, "double_value", lambda r: r * 0.5),
+    (MetricDataType.Int32, "int_value", lambda r: r % 4096),
+    (MetricDataType.Float, "float_value", lambda r: (r % 1024) * 0.25),
+    (MetricDataType.Int64, "long_value", lambda r: r * 1_000_003),
+    (MetricDataType.Boolean, "boolean_value", lambda r: r % 3 == 0),
+)
+
+
+def property_set(depth: int) -> dict | None:
+    """
+    A PropertySet with two scalar properties, nested `depth` levels deep
+    through `propertyset_value`. Depth 0 means no properties.
+    """
+    if depth <= 0:
+        return None
+    keys = ["units", "gain"]
+    values = [
+        {"type": MetricDataType.String, "string_value": "V"},
+        {"type": MetricDataType.Int32, "int_value": 1000},
+    ]
+    child = property_set(depth - 1)
+    if child is not None:
+        keys.append("nested")
+        values.append({"type": PROPERTY_SET, "propertyset_value": child})
+    return {"keys": keys, "values": values}
+
+
+def timeseries_payload(num_metrics: int, property_depth: int = 0) -> dict:
+    """
+    A payload of `num_metrics` scalar metrics of mixed types.
+    """
+    properties = property_set(property_depth)
+    metrics = []
+    for i in range(num_metrics):
+        datatype, field, value = _SCALAR_METRICS[i % len(_SCALAR_METRICS)]
+        metric = {
+            "name": f"metric_{i}",
+            "alias": i,
+            "timestamp": TIMESTAMP + i,
+            "datatype": datatype,
+            field: value(i),
+        }
+        if properties is not None:
+            metric["properties"] = properties
+        metrics.append(metric)
+    return {"timestamp": TIMESTAMP, "seq": 0, "metrics": metrics}
+
+
+def dataset_columns(num_columns: int) -> tuple[list[str], list[int]]:
+    """
+    Column names and types of a synthetic DataSet with `num_columns` columns.
+    """
+    columns = [f"ch{c}" for c in range(num_columns)]
+    types = [
+        _DATASET_COLUMNS[c % len(_DATASET_COLUMNS)][0] for c in range(num_columns)
+    ]
+    return columns, types
+
+
+def dataset_rows(num_rows: int, num_columns: int) -> list[list]:
+    """
+    Row values of a synthetic DataSet, as accepted by `add_rows_to_dataset`.
+    """
+    getters = [
+        _DATASET_COLUMNS[c % len(_DATASET_COLUMNS)][2] for c in range(num_columns)
+    ]
+    return [[get(r) for get in getters] for r in range(num_rows)]
+
+
+def dataset_payload(num_rows: int, num_columns: int, property_depth: int = 1) -> dict:
+    """
+    A payload with a single DataSet metric of `num_rows` x `num_columns`.
+    """
+    columns, types = dataset_columns(num_columns)
+    fields = [
+        _DATASET_COLUMNS[c % len(_DATASET_COLUMNS)][1] for c in range(num_columns)
+    ]
+    rows = [
+        {"elements": [{field: value} for field, value in zip(fields, row)]}
+        for row in dataset_rows(num_rows, num_columns)
+    ]
+    metric = {
+        "name": "dataset",
+        "timestamp": TIMESTAMP,
+        "datatype": MetricDataType.DataSet,
+        "dataset_value": {
+            "num_of_columns": num_columns,
+            "columns": columns,
+            "types": types,
+            "rows": rows,
+        },
+    }
+    properties = property_set(property_depth)
+    if properties is not None:
+        metric["properties"] = properties
+    return {"timestamp": TIMESTAMP, "seq": 0, "metrics": [metric]}
+
+
+def waveform_payload(num_channels: int, num_samples: int) -> dict:
+    """
+    A payload of `num_channels` Bytes metrics, each holding `num_samples`
+    16-bit big-endian samples with the acquisition properties of
+    `example_payloads/byte.py`.
+    """
+    keys = [
+        "channel_id",
+        "ch_gain",
+        "ch_offset",
+        "wave_byte_order",
+        "time_zero",
+        "acq_srate",
+        "acq_bit_res",
+        "acq_total_samples",
+    ]
+    samples = (np.arange(num_samples) % 65536 - 32768).astype(">i2").tobytes()
+    metrics = []
+    for channel in range(num_channels):
+        values = [
+            {"type": MetricDataType.Int32, "int_value": channel},
+            {"type": MetricDataType.Float, "float_value": 1000.0},
+            {"type": MetricDataType.Float, "float_value": 0.5},
+            {"type": MetricDataType.Int32, "int_value": 0},
+            {"type": MetricDataType.Float, "float_value": 0.0},
+            {"type": MetricDataType.Int32, "int_value": 250000},
+            {"type": MetricDataType.Int32, "int_value": 16},
+            {"type": MetricDataType.Int32, "int_value": num_samples},
+        ]
+        metrics.append(
+            {
+                "name": f"AXUV_ch{channel}",
+                "timestamp": TIMESTAMP,
+                "datatype": MetricDataType.Bytes,
+                "properties": {"keys": keys, "values": values},
+                "bytes_value": base64.b64encode(samples).decode(),
+            }
+        )
+    return {"timestamp": TIMESTAMP, "seq": 0, "metrics": metrics}
+
+
+def _validator_property_set(depth: int) -> dict | None:
+    if depth <= 0:
+        return None
+    keys = ["units", "gain"]
+    values = [
+        {"type": MetricDataType.String, "value": "V"},
+        {"type": MetricDataType.Int32, "value": 1000},
+    ]
+    child = _validator_property_set(depth - 1)
+    if child is not None:
+        keys.append("nested")
+        values.append({"type": PROPERTY_SET_LIST, "value": [child]})
+    return {"keys": keys, "values": values}
+
+
+def validator_payload(
+    num_metrics: int, property_depth: int = 0, dataset_shape: tuple[int, int] = (0, 0)
+) -> dict:
+    """
+    Input for the pydantic `SparkplugBPayload` model: `num_metrics` scalar
+    metrics plus, if `dataset_shape` is non-empty, one DataSet metric.
+    """
+    properties = _validator_property_set(property_depth)
+    metrics = []
+    for i in range(num_metrics):
+        datatype, _, value = _SCALAR_METRICS[i % len(_SCALAR_METRICS)]
+        metric = {"name": f"metric_{i}", "dataType": datatype, "value": value(i)}
+        if properties is not None:
+            metric["properties"] = properties
+        metrics.append(metric)
+    num_rows, num_columns = dataset_shape
+    if num_rows and num_columns:
+        columns, types = dataset_columns(num_columns)
+        metrics.append(
+            {
+                "name": "dataset",
+                "dataType": MetricDataType.DataSet,
+                "value": {
+                    "num_of_columns": num_columns,
+                    "columns": columns,
+                    "types": types,
+                    "rows": [
+                        {"elements": row}
+                        for row in dataset_rows(num_rows, num_columns)
+                    ],
+                },
+            }
+        )
+    return {"timestamp": TIMESTAMP, "metrics": metrics}
@@ -0,0 +1,340 @@
+"""
+Offline benchmark suite for the encode, decode and DataFrame paths.
+
+Every case runs against deterministic synthetic payloads (see `payloads.py`)
+and reports operations per second and MB/s, where the byte count is the size
+of the serialized payload handled by one operation. Results can be saved as a
+baseline and later runs compared against it; a case whose ops/s dropped by more
+than `--threshold` is reported as a regression and the script exits with
+status 1.
+
+Run with:
+    python benchmarks/run.py                       # compare with baseline.json
+    python benchmarks/run.py --save-baseline       # overwrite baseline.json
+    python benchmarks/run.py -k datasets_to_dfs    # only matching cases
+    python benchmarks/run.py --json results.json   # also write raw results
+
+Baselines are machine-specific: record one on the machine that runs the
+comparison before relying on it.
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import sys
+import timeit
+from dataclasses import dataclass
+from typing import Callable, Iterator
+
+import google.protobuf
+import pandas as pd
+import pydantic
+
+import sparkplug_b_parser as spt
+from proto_parser import LRUCache
+from sparkplug_b_parser.validator import SparkplugBPayload
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, HERE)
+import payloads  # noqa: E402
+
+DEFAULT_BASELINE = os.path.join(HERE, "baseline.json")
+
+
+@dataclass
+class Case:
+    """
+    A benchmark case: `func` is timed, and `nbytes` is the serialized size of
+    the payload it handles per call.
+    """
+
+    name: str
+    func: Callable[[], object]
+    nbytes: int
+
+
+def _scalar_params() -> Iterator[tuple[int, int]]:
+    # (metric count, property nesting depth)
+    yield from ((10, 0), (100, 0), (1000, 0), (100, 3))
+
+
+def _dataset_params() -> Iterator[tuple[int, int, int]]:
+    # (rows, columns, property nesting depth)
+    yield from ((100, 5, 1), (1000, 10, 1), (10000, 10, 1), (1000, 10, 4))
+
+
+def _validator_params() -> Iterator[tuple[int, int, tuple[int, int]]]:
+    # (metric count, property nesting depth, DataSet rows x columns)
+    yield from ((10, 0, (0, 0)), (100, 3, (0, 0)), (10, 1, (1000, 10)))
+
+
+def build_cases(parser: spt.SparkplugBParser) -> Iterator[Case]:
+    """
+    Yield every benchmark case. Payloads are built once, outside the timed code.
+    """
+    for num_metrics, depth in _scalar_params():
+        tag = f"metrics={num_metrics},depth={depth}"
+        data = payloads.timeseries_payload(num_metrics, depth)
+        raw = parser.parse_dict_to_bytes(data)
+        yield Case(
+            f"parse_bytes_to_protobuf[{tag}]",
+            lambda raw=raw: parser.parse_bytes_to_protobuf(raw),
+            len(raw),
+        )
+        yield Case(
+            f"parse_dict_to_bytes[{tag}]",
+            lambda data=data: parser.parse_dict_to_bytes(data),
+            len(raw),
+        )
+        yield Case(
+            f"parse_bytes_to_dict[{tag}]",
+            lambda raw=raw: parser.parse_bytes_to_dict(raw),
+            len(raw),
+        )
+
+    cached = spt.SparkplugBParser()
+    cached.property_cache = LRUCache(maxsize=1024)
+    for num_metrics, depth in ((100, 1), (100, 3)):
+        tag = f"metrics={num_metrics},depth={depth}"
+        data = payloads.timeseries_payload(num_metrics, depth)
+        raw = parser.parse_dict_to_bytes(data)
+        payload = parser.parse_bytes_to_protobuf(raw)
+        for prefix, target in (("", parser), ("cached,", cached)):
+            yield Case(
+                f"parse_metric_properties_to_dict[{prefix}{tag}]",
+                lambda payload=payload, target=target: [
+                    target.parse_metric_properties_to_dict(metric)
+                    for metric in payload.metrics
+                ],
+                len(raw),
+            )
+
+    for num_rows, num_columns, depth in _dataset_params():
+        tag = f"rows={num_rows},cols={num_columns},depth={depth}"
+        raw = parser.parse_dict_to_bytes(
+            payloads.dataset_payload(num_rows, num_columns, depth), compiled=True
+        )
+        payload = parser.parse_bytes_to_protobuf(raw)
+        yield Case(
+            f"parse_bytes_to_protobuf[dataset,{tag}]",
+            lambda raw=raw: parser.parse_bytes_to_protobuf(raw),
+            len(raw),
+        )
+        yield Case(
+            f"parse_datasets_to_dfs[{tag}]",
+            lambda payload=payload: parser.parse_datasets_to_dfs(payload),
+            len(raw),
+        )
+        yield Case(
+            f"parse_datasets_to_dfs[columnar,{tag}]",
+            lambda payload=payload: parser.parse_datasets_to_dfs(
+                payload, columnar=True
+            ),
+            len(raw),
+        )
+        yield Case(
+            f"parse_bytes_to_dfs[{tag}]",
+            lambda raw=raw: parser.parse_bytes_to_dfs(raw),
+            len(raw),
+        )
+        if depth == 1:
+            columns, types = payloads.dataset_columns(num_columns)
+            rows = payloads.dataset_rows(num_rows, num_columns)
+
+            def add_rows(columns=columns, types=types, rows=rows):
+                dataset = parser.init_dataset_metric(
+                    spt.Payload(), "dataset", types, columns, payloads.TIMESTAMP
+                )
+                return parser.add_rows_to_dataset(dataset, rows)
+
+            yield Case(
+                f"add_rows_to_dataset[rows={num_rows},cols={num_columns}]",
+                add_rows,
+                len(raw),
+            )
+
+            df = parser.parse_datasets_to_dfs(payload, columnar=True)[0]
+
+            def add_dataframe(columns=columns, types=types, df=df):
+                dataset = parser.init_dataset_metric(
+                    spt.Payload(), "dataset", types, columns, payloads.TIMESTAMP
+                )
+                return parser.add_dataframe_to_dataset(dataset, df)
+
+            yield Case(
+                f"add_dataframe_to_dataset[rows={num_rows},cols={num_columns}]",
+                add_dataframe,
+                len(raw),
+            )
+            yield Case(
+                f"dataframe_to_dataset_bytes[rows={num_rows},cols={num_columns}]",
+                lambda df=df, types=types: parser.dataframe_to_dataset_bytes(
+                    spt.Payload(), df, "dataset", types, timestamp=payloads.TIMESTAMP
+                ),
+                len(raw),
+            )
+
+    for num_payloads, num_rows, num_columns in ((1000, 50, 5),):
+        tag = f"payloads={num_payloads},rows={num_rows},cols={num_columns}"
+        raw = parser.parse_dict_to_bytes(
+            payloads.dataset_payload(num_rows, num_columns), compiled=True
+        )
+        messages = [raw] * num_payloads
+        yield Case(
+            f"concat_datasets[{tag}]",
+            lambda messages=messages: parser.concat_datasets(
+                messages, "dataset", payload_timestamp=True, seq=True
+            ),
+            len(raw) * num_payloads,
+        )
+
+    for num_payloads, num_metrics in ((1000, 10), (100, 100)):
+        tag = f"payloads={num_payloads},metrics={num_metrics}"
+        raw = parser.parse_dict_to_bytes(payloads.timeseries_payload(num_metrics))
+        messages = [raw] * num_payloads
+        for prefix, pivot in (("", False), ("pivot,", True)):
+            yield Case(
+                f"concat_metrics[{prefix}{tag}]",
+                lambda messages=messages, pivot=pivot: parser.concat_metrics(
+                    messages, pivot=pivot
+                ),
+                len(raw) * num_payloads,
+            )
+
+    for num_channels, num_samples in ((4, 8191), (16, 65536)):
+        tag = f"channels={num_channels},samples={num_samples}"
+        raw = parser.parse_dict_to_bytes(
+            payloads.waveform_payload(num_channels, num_samples), compiled=True
+        )
+        yield Case(
+            f"parse_waveforms[{tag}]",
+            lambda raw=raw: parser.parse_waveforms(raw),
+            len(raw),
+        )
+
+    for num_metrics, depth, shape in _validator_params():
+        tag = f"metrics={num_metrics},depth={depth},dataset={shape[0]}x{shape[1]}"
+        data = payloads.validator_payload(num_metrics, depth, shape)
+        nbytes = len(json.dumps(data).encode())
+        yield Case(
+            f"SparkplugBPayload.model_validate[{tag}]",
+            lambda data=data: SparkplugBPayload.model_validate(data),
+            nbytes,
+        )
+
+
+def measure(case: Case, repeat: int, min_time: float) -> dict:
+    """
+    Time `case.func` and return the best of `repeat` rounds of at least
+    `min_time` seconds each.
+    """
+    timer = timeit.Timer(case.func)
+    number = 1
+    while True:
+        elapsed = timer.timeit(number)
+        if elapsed >= min_time:
+            break
+        number = max(number * 2, int(number * min_time / max(elapsed, 1e-9)))
+    best = min([elapsed] + timer.repeat(repeat - 1, number)) / number
+    return {
+        "ops_per_s": 1 / best,
+        "mb_per_s": case.nbytes / best / 1e6,
+        "bytes": case.nbytes,
+    }
+
+
+def environment() -> dict:
+    return {
+        "python": platform.python_version(),
+        "protobuf": google.protobuf.__version__,
+        "pandas": pd.__version__,
+        "pydantic": pydantic.VERSION,
+        "machine": platform.machine(),
+        "platform": platform.platform(),
+    }
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list[str]:
+    """
+    Return the names of cases whose ops/s dropped by more than `threshold`
+    relative to `baseline`.
+    """
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base and result["ops_per_s"] < base["ops_per_s"] * (1 - threshold):
+            regressions.append(name)
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    arg_parser = argparse.ArgumentParser(
+        description="Offline benchmark suite for sparkplug-b-toolkit."
+    )
+    arg_parser.add_argument(
+        "-k", "--filter", default="", help="Only run cases containing this text."
+    )
+    arg_parser.add_argument(
+        "--baseline", default=DEFAULT_BASELINE, help="Baseline file to compare with."
+    )
+    arg_parser.add_argument(
+        "--save-baseline", action="store_true", help="Write results as the baseline."
+    )
+    arg_parser.add_argument("--json", help="Also write results to this file.")
+    arg_parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.25,
+        help="Relative ops/s drop reported as a regression. Defaults to 0.25.",
+    )
+    arg_parser.add_argument("--repeat", type=int, default=5)
+    arg_parser.add_argument("--min-time", type=float, default=0.2)
+    args = arg_parser.parse_args(argv)
+
+    # Keep per-call logging (e.g. missing DataSet warnings) out of the timings.
+    logging.disable(logging.WARNING)
+    parser = spt.SparkplugBParser()
+
+    baseline = {}
+    if not args.save_baseline and os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+
+    results = {}
+    print(f"{'case':<72}{'ops/s':>12}{'MB/s':>10}{'vs base':>10}")
+    for case in build_cases(parser):
+        if args.filter not in case.name:
+            continue
+        result = results[case.name] = measure(case, args.repeat, args.min_time)
+        base = baseline.get(case.name)
+        change = (
+            f"{result['ops_per_s'] / base['ops_per_s'] - 1:+.0%}" if base else "-"
+        )
+        print(
+            f"{case.name:<72}{result['ops_per_s']:>12.1f}"
+            f"{result['mb_per_s']:>10.2f}{change:>10}"
+        )
+
+    document = {"environment": environment(), "results": results}
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(document, f, indent=2)
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(document, f, indent=2)
+        print(f"Saved baseline to {args.baseline}.")
+        return 0
+
+    regressions = compare(results, baseline, args.threshold)
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) beyond {args.threshold:.0%}:")
+        for name in regressions:
+            print(f"  {name}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1 +1,7 @@
 from .parser import ProtobufParser
+from .parser import ParseResult
+from .cache import CacheInfo, FrozenDict, FrozenList, LRUCache, freeze
+from .stream import DelimitedReader, DelimitedWriter
+from .profiling import Instrumentation, instrumentation
+from .aio import AsyncProtobufParser
+from .ndjson import convert_ndjson_to_delimited, iter_parse_ndjson
@@ -0,0 +1,137 @@
+"""
+asyncio adaptors for `ProtobufParser`.
+
+Small messages are decoded and encoded inline on the event loop, where the cost
+of a thread or process hop would exceed the work itself. Messages at or above
+`offload_threshold` bytes are run in an executor so they do not block the loop.
+"""
+
+import asyncio
+import collections
+import logging
+from collections.abc import Buffer
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import AsyncIterable, AsyncIterator, Callable, Generic, Optional
+
+from google.protobuf.message import Message
+
+from .parser import ProtobufParser, T
+
+logger = logging.getLogger(__name__)
+
+
+def _nbytes(data: Buffer) -> int:
+    """
+    Size of a buffer in bytes. `len()` counts the items of the first dimension,
+    which differs for multi-byte or multi-dimensional memoryviews.
+    """
+    if isinstance(data, (bytes, bytearray)):
+        return len(data)
+    with memoryview(data) as view:
+        return view.nbytes
+
+
+class AsyncProtobufParser(Generic[T]):
+    """
+    Async counterpart of a `ProtobufParser`.
+
+    Example:
+        aparser = AsyncProtobufParser(MyParser(), offload_threshold=32 * 1024)
+        message = await aparser.decode(raw_bytes)
+        async for message in aparser.decode_stream(mqtt_messages(), concurrency=8):
+            ...
+    """
+
+    def __init__(
+        self,
+        parser: ProtobufParser[T],
+        executor: Optional[Executor] = None,
+        offload_threshold: int = 64 * 1024,
+        max_concurrency: int = 8,
+    ):
+        """
+        Args:
+            parser (ProtobufParser[T]): The synchronous parser doing the work.
+            executor (Executor, optional): Executor used for offloaded work. A
+                `ProcessPoolExecutor` requires the parser to be picklable. Defaults
+                to the event loop's default thread pool.
+            offload_threshold (int): Messages whose serialized size is at least
+                this many bytes are processed in the executor. Use 0 to offload
+                everything. Defaults to 64 KiB.
+            max_concurrency (int): Default number of in-flight decodes for
+                `decode_stream`. Defaults to 8.
+        """
+        self.parser = parser
+        self.executor = executor
+        self.offload_threshold = offload_threshold
+        self.max_concurrency = max_concurrency
+
+    async def _run(self, size: int, func: Callable, *args):
+        if size < self.offload_threshold:
+            return func(*args)
+        if isinstance(self.executor, ProcessPoolExecutor):
+            # memoryview, mmap and other buffers cannot be pickled
+            args = tuple(
+                bytes(arg)
+                if isinstance(arg, Buffer) and not isinstance(arg, bytes)
+                else arg
+                for arg in args
+            )
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, func, *args)
+
+    async def decode(self, data: Buffer) -> T:
+        """
+        Async version of `parse_bytes_to_protobuf`.
+        """
+        return await self._run(_nbytes(data), self.parser.parse_bytes_to_protobuf, data)
+
+    async def encode(self, message: Message) -> bytes | None:
+        """
+        Async version of `parse_protobuf_to_bytes`.
+        """
+        return await self._run(
+            message.ByteSize(), self.parser.parse_protobuf_to_bytes, message
+        )
+
+    async def decode_stream(
+        self, source: AsyncIterable[bytes], concurrency: Optional[int] = None
+    ) -> AsyncIterator[T]:
+        """
+        Decode raw messages from an async source, yielding them in source order.
+
+        At most `concurrency` decodes are in flight at once, and the source is
+        only read as results are consumed, so a slow consumer applies
+        backpressure to the source.
+
+        Args:
+            source (AsyncIterable[bytes]): Async iterable of serialized messages.
+            concurrency (int, optional): Maximum number of in-flight decodes.
+                Defaults to `max_concurrency`.
+
+        Yields:
+            T: Decoded messages, in the order they were read from `source`.
+        """
+        async for result in self._map_stream(self.decode, source, concurrency):
+            yield result
+
+    async def _map_stream(
+        self,
+        func: Callable,
+        source: AsyncIterable,
+        concurrency: Optional[int] = None,
+    ) -> AsyncIterator:
+        concurrency = concurrency or self.max_concurrency
+        if concurrency < 1:
+            raise ValueError(f"concurrency must be at least 1, got {concurrency}.")
+        pending: collections.deque[asyncio.Future] = collections.deque()
+        try:
+            async for item in source:
+                pending.append(asyncio.ensure_future(func(item)))
+                if len(pending) >= concurrency:
+                    yield await pending.popleft()
+            while pending:
+                yield await pending.popleft()
+        finally:
+            for future in pending:
+                future.cancel()
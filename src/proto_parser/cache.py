@@ -0,0 +1,177 @@
+"""
+A bounded least-recently-used cache with hit and miss statistics.
+
+Parsers use it for objects compiled once per message shape (e.g. per DataSet
+schema) that many later messages reuse. Unlike `functools.lru_cache`, values
+are built by a factory passed per lookup, so the key can be a cheap signature
+of an argument rather than the argument itself.
+
+Cached values are shared by every caller that hits them; `freeze` turns parsed
+dicts and lists into immutable equivalents that are safe to share.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Generic, Hashable, NamedTuple, TypeVar
+
+V = TypeVar("V")
+
+
+class CacheInfo(NamedTuple):
+    """
+    Statistics of an `LRUCache`.
+
+    Attributes:
+        hits (int): Lookups served from the cache.
+        misses (int): Lookups that built a new value.
+        evictions (int): Values dropped to stay within `maxsize`.
+        maxsize (int): Maximum number of values held.
+        currsize (int): Number of values held.
+    """
+
+    hits: int
+    misses: int
+    evictions: int
+    maxsize: int
+    currsize: int
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups served from the cache; 0 before any lookup."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class LRUCache(Generic[V]):
+    """
+    Thread-safe mapping from hashable keys to values, holding at most `maxsize`
+    values and dropping the least recently used one when full.
+
+    A pickled cache unpickles as a new, empty cache of the same `maxsize`, so a
+    parser holding one can be sent to worker processes.
+    """
+
+    def __init__(self, maxsize: int = 256):
+        if maxsize < 1:
+            raise ValueError(f"maxsize must be at least 1, got {maxsize}.")
+        self.maxsize = maxsize
+        self._values: OrderedDict[Hashable, V] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __reduce__(self):
+        # Neither the lock nor the cached values are sent along
+        return (type(self), (self.maxsize,))
+
+    def get(self, key: Hashable, factory: Callable[[], V]) -> V:
+        """
+        Return the value cached for `key`, calling `factory()` to build and
+        cache it on a miss. Exceptions from `factory` propagate and nothing is
+        cached.
+
+        Args:
+            key (Hashable): The cache key.
+            factory (Callable[[], V]): Builds the value for `key`.
+
+        Returns:
+            V: The cached or newly built value.
+        """
+        with self._lock:
+            value = self._values.get(key)
+            if value is not None:
+                self._values.move_to_end(key)
+                self._hits += 1
+                return value
+            self._misses += 1
+        # Build outside the lock; concurrent misses on one key build it twice,
+        # and the last value stored wins.
+        value = factory()
+        with self._lock:
+            self._values[key] = value
+            self._values.move_to_end(key)
+            while len(self._values) > self.maxsize:
+                self._values.popitem(last=False)
+                self._evictions += 1
+        return value
+
+    def info(self) -> CacheInfo:
+        """
+        Return the cache statistics.
+
+        Returns:
+            CacheInfo: Hits, misses, evictions, maximum and current size.
+        """
+        with self._lock:
+            return CacheInfo(
+                self._hits,
+                self._misses,
+                self._evictions,
+                self.maxsize,
+                len(self._values),
+            )
+
+    def clear(self) -> None:
+        """Drop all cached values and reset the statistics."""
+        with self._lock:
+            self._values.clear()
+            self._hits = self._misses = self._evictions = 0
+
+
+class FrozenDict(dict):
+    """
+    A dict that cannot be modified. It is still a `dict`, so it compares,
+    serializes (e.g. with `json`) and copies like one; `dict(frozen)` or
+    `copy.copy(frozen)` give a mutable copy.
+    """
+
+    __slots__ = ()
+
+    def _immutable(self, *args, **kwargs):
+        raise TypeError(f"{type(self).__name__} is immutable")
+
+    __setitem__ = __delitem__ = __ior__ = _immutable
+    clear = pop = popitem = setdefault = update = _immutable
+
+    def __copy__(self) -> dict:
+        return dict(self)
+
+    def __reduce__(self):
+        return (type(self), (dict(self),))
+
+
+class FrozenList(list):
+    """
+    A list that cannot be modified; the list counterpart of `FrozenDict`.
+    """
+
+    __slots__ = ()
+
+    def _immutable(self, *args, **kwargs):
+        raise TypeError(f"{type(self).__name__} is immutable")
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _immutable
+    append = clear = extend = insert = pop = remove = reverse = sort = _immutable
+
+    def __copy__(self) -> list:
+        return list(self)
+
+    def __reduce__(self):
+        return (type(self), (list(self),))
+
+
+def freeze(value: Any) -> Any:
+    """
+    Return an immutable equivalent of `value`: dicts become `FrozenDict` and
+    lists `FrozenList`, recursively. Frozen values compare equal to the
+    originals. Other values are returned as they are.
+    """
+    if isinstance(value, dict):
+        return FrozenDict((key, freeze(item)) for key, item in value.items())
+    if isinstance(value, list):
+        return FrozenList(freeze(item) for item in value)
+    return value
@@ -0,0 +1,245 @@
+"""
+Bulk conversion of newline-delimited JSON (NDJSON) to Protobuf messages.
+
+The input is read in fixed-size blocks and split into lines, and lines are
+converted in batches with the parser's compiled dict builder (see
+`ProtobufParser.parse_dict_to_protobuf(compiled=True)`). Batches can be
+converted in a process pool; at most a few batches per worker are in flight at
+once, so memory use is bounded regardless of the size of the input.
+"""
+
+import collections
+import json
+import logging
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor
+from itertools import islice
+from typing import BinaryIO, Iterator, Optional, Union
+
+from .compiled import compile_dict_to_message
+from .parser import ParseResult, ProtobufParser, T
+from .stream import DelimitedWriter
+
+logger = logging.getLogger(__name__)
+
+Source = Union[str, os.PathLike, BinaryIO]
+
+
+def _iter_lines(file: BinaryIO, read_size: int) -> Iterator[tuple[int, bytes]]:
+    """
+    Yield (line number, line) for every non-blank line, reading `read_size`
+    bytes at a time. Line numbers are zero-based.
+    """
+    lineno = 0
+    tail = b""
+    while block := file.read(read_size):
+        lines = (tail + block).split(b"\n")
+        tail = lines.pop()
+        for line in lines:
+            if line.strip():
+                yield lineno, line
+            lineno += 1
+    if tail.strip():
+        yield lineno, tail
+
+
+def _batched(items: Iterator, batch_size: int) -> Iterator[list]:
+    while batch := list(islice(items, batch_size)):
+        yield batch
+
+
+def _convert_batch(
+    parser: ProtobufParser,
+    batch: list[tuple[int, bytes]],
+    ignore_unknown_fields: bool,
+    serialize: bool,
+) -> list[tuple]:
+    """
+    Convert a batch of (line number, JSON line) into (line number, message, error)
+    tuples. Messages are serialized if `serialize` is True, which is how results
+    are returned from worker processes.
+    """
+    message_type = parser.message_type
+    build = parser._get_compiled(
+        compile_dict_to_message,
+        message_type.DESCRIPTOR,
+        ignore_unknown_fields,
+        None,
+    )
+    results = []
+    for lineno, line in batch:
+        message = message_type()
+        try:
+            build(json.loads(line), message)
+        except Exception as e:
+            results.append((lineno, None, e))
+            continue
+        if serialize:
+            message = message.SerializeToString()
+        results.append((lineno, message, None))
+    return results
+
+
+def _iter_converted(
+    parser: ProtobufParser,
+    source: Source,
+    batch_size: int,
+    max_workers: Optional[int],
+    executor: Optional[Executor],
+    ignore_unknown_fields: bool,
+    serialize: bool,
+    read_size: int,
+) -> Iterator[tuple]:
+    if batch_size < 1:
+        raise ValueError(f"batch_size must be at least 1, got {batch_size}.")
+    owns_file = not hasattr(source, "read")
+    file = open(source, "rb") if owns_file else source
+    parallel = executor is not None or max_workers is not None
+    owns_executor = parallel and executor is None
+    if owns_executor:
+        executor = ProcessPoolExecutor(max_workers=max_workers)
+    try:
+        batches = _batched(_iter_lines(file, read_size), batch_size)
+        if not parallel:
+            for batch in batches:
+                yield from _convert_batch(
+                    parser, batch, ignore_unknown_fields, serialize
+                )
+            return
+        # Results from workers are always serialized; they are cheaper to pickle
+        # than messages and can be written to a record file as they are.
+        # Keep about two batches in flight per worker. The size of a given
+        # executor is not public, so `max_workers` (if set) describes it.
+        workers = max_workers or os.cpu_count() or 1
+        max_pending = 2 * workers
+        pending = collections.deque()
+        for batch in batches:
+            pending.append(
+                executor.submit(
+                    _convert_batch, parser, batch, ignore_unknown_fields, True
+                )
+            )
+            if len(pending) >= max_pending:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+    finally:
+        if owns_executor:
+            executor.shutdown(cancel_futures=True)
+        if owns_file:
+            file.close()
+
+
+def iter_parse_ndjson(
+    parser: ProtobufParser[T],
+    source: Source,
+    batch_size: int = 1000,
+    max_workers: Optional[int] = None,
+    executor: Optional[Executor] = None,
+    ignore_unknown_fields: bool = False,
+    read_size: int = 1 << 20,
+) -> Iterator[ParseResult[T]]:
+    """
+    Lazily convert an NDJSON file or stream into messages of the parser's
+    `message_type`, yielding one `ParseResult` per non-blank line.
+
+    Args:
+        parser (ProtobufParser[T]): Parser whose `message_type` is built.
+        source (str | PathLike | BinaryIO): Path of the NDJSON file, or a binary
+            file object to read from.
+        batch_size (int): Number of lines converted per batch or worker task.
+            Defaults to 1000.
+        max_workers (int, optional): If set, and no `executor` is given, convert
+            batches in a process pool of this size. With an `executor`, the
+            number of its workers, used to bound the batches in flight (the CPU
+            count if unset). Defaults to None, which converts in the calling
+            process.
+        executor (Executor, optional): An existing executor to convert batches in.
+            It is not shut down afterwards. Defaults to None.
+        ignore_unknown_fields (bool): If True, ignore fields not recognized by the
+            `message_type`. Defaults to False.
+        read_size (int): Number of bytes read from `source` at a time.
+            Defaults to 1 MiB.
+
+    Yields:
+        ParseResult[T]: The message (or error) for each line, in file order.
+            `index` is the zero-based line number.
+    """
+    message_type = parser.message_type
+    for lineno, message, error in _iter_converted(
+        parser,
+        source,
+        batch_size,
+        max_workers,
+        executor,
+        ignore_unknown_fields,
+        False,
+        read_size,
+    ):
+        if isinstance(message, bytes):
+            message = message_type.FromString(message)
+        yield ParseResult(lineno, message, error)
+
+
+def convert_ndjson_to_delimited(
+    parser: ProtobufParser,
+    source: Source,
+    destination: Union[str, os.PathLike, BinaryIO, DelimitedWriter],
+    batch_size: int = 1000,
+    max_workers: Optional[int] = None,
+    executor: Optional[Executor] = None,
+    ignore_unknown_fields: bool = False,
+    read_size: int = 1 << 20,
+) -> tuple[int, int]:
+    """
+    Convert an NDJSON file or stream into a length-delimited record file (see
+    `DelimitedWriter`). Lines that fail to convert are logged and skipped.
+
+    Args:
+        parser (ProtobufParser): Parser whose `message_type` is built.
+        source (str | PathLike | BinaryIO): Path of the NDJSON file, or a binary
+            file object to read from.
+        destination (str | PathLike | BinaryIO | DelimitedWriter): Path or file
+            object to write a new record file to, or an open `DelimitedWriter`
+            to append to. A given writer is not closed afterwards.
+        batch_size (int): Number of lines converted per batch or worker task.
+            Defaults to 1000.
+        max_workers (int, optional): If set, and no `executor` is given, convert
+            batches in a process pool of this size. With an `executor`, the
+            number of its workers, used to bound the batches in flight (the CPU
+            count if unset). Defaults to None.
+        executor (Executor, optional): An existing executor to convert batches in.
+            It is not shut down afterwards. Defaults to None.
+        ignore_unknown_fields (bool): If True, ignore fields not recognized by the
+            `message_type`. Defaults to False.
+        read_size (int): Number of bytes read from `source` at a time.
+            Defaults to 1 MiB.
+
+    Returns:
+        tuple[int, int]: The number of records written and of lines skipped.
+    """
+    owns_writer = not isinstance(destination, DelimitedWriter)
+    writer = DelimitedWriter(destination) if owns_writer else destination
+    written = failed = 0
+    try:
+        for lineno, message, error in _iter_converted(
+            parser,
+            source,
+            batch_size,
+            max_workers,
+            executor,
+            ignore_unknown_fields,
+            True,
+            read_size,
+        ):
+            if error is not None:
+                logger.warning("Skipping NDJSON line %d: %s", lineno, error)
+                failed += 1
+                continue
+            writer.append(message)
+            written += 1
+    finally:
+        if owns_writer:
+            writer.close()
+    logger.info("Converted %d NDJSON line(s), skipped %d.", written, failed)
+    return written, failed
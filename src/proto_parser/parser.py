@@ -1,15 +1,70 @@
 import json
 import logging
-from typing import TypeVar, ClassVar, Generic, Optional
+from collections.abc import Buffer
+from typing import (
+    TypeVar,
+    ClassVar,
+    Generic,
+    Iterable,
+    Iterator,
+    NamedTuple,
+    Optional,
+    Sequence,
+)
 from google.protobuf.json_format import ParseDict, MessageToDict
 from google.protobuf.descriptor_pool import DescriptorPool
 from google.protobuf.message import DecodeError, Message
 
+from .compiled import compile_dict_to_message, compile_message_to_dict
+from .profiling import instrumented, mark_failed
+
 logger = logging.getLogger(__name__)
 
 T = TypeVar("T", bound=Message)
 
 
+def _as_parse_input(data: Buffer) -> bytes | bytearray | memoryview:
+    """
+    Return `data` in a form `ParseFromString` accepts, without copying it.
+
+    `bytes` and `bytearray` are parsed in place by the protobuf runtime and are
+    passed through. A `memoryview` spanning the whole of a `bytes` or
+    `bytearray` object is unwrapped to that object, since the runtime copies
+    `memoryview` input before parsing. Any other buffer (`mmap`, `array`, ...)
+    is wrapped in a `memoryview`, which the runtime accepts.
+    """
+    if isinstance(data, (bytes, bytearray)):
+        return data
+    view = data if isinstance(data, memoryview) else memoryview(data)
+    obj = view.obj
+    if (
+        isinstance(obj, (bytes, bytearray))
+        and view.c_contiguous
+        and view.nbytes == len(obj)
+    ):
+        return obj
+    return view
+
+
+class ParseResult(NamedTuple, Generic[T]):
+    """
+    Outcome of decoding a single item in a batch.
+
+    Attributes:
+        index (int): Position of the item in the input iterable.
+        message (T | None): The decoded message, or None if decoding failed.
+        error (Exception | None): The error raised while decoding, if any.
+    """
+
+    index: int
+    message: Optional[T]
+    error: Optional[Exception] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
 class ProtobufParser(Generic[T]):
     """
     A generic parser for Protocol Buffer (Protobuf) messages, using a class-level
@@ -29,12 +84,15 @@ class ProtobufParser(Generic[T]):
     #         message_type = MyMessage
     message_type: ClassVar[type[T]]
 
-    def parse_bytes_to_protobuf(self, data: bytes) -> T:
+    @instrumented(bytes_from="input", payload_from="output")
+    def parse_bytes_to_protobuf(self, data: Buffer) -> T:
         """
         Deserialize raw bytes into an instance of the subclass's `message_type`.
 
         Args:
-            data (bytes): Serialized Protobuf bytes.
+            data (Buffer): Serialized Protobuf bytes. Any object supporting the
+                buffer protocol (`bytes`, `bytearray`, `memoryview`, `mmap`, ...)
+                is accepted; `bytes` and `bytearray` are parsed without a copy.
 
         Returns:
             T: A Protobuf message instance of type `message_type`.
@@ -42,12 +100,85 @@ class ProtobufParser(Generic[T]):
         logger.debug("Parsing bytes into Protobuf message.")
         payload = self.message_type()
         try:
-            payload.ParseFromString(data)
+            payload.ParseFromString(_as_parse_input(data))
             logger.debug("Successfully parsed bytes into Protobuf message.")
         except DecodeError as e:
-            logger.error(f"Error decoding Protobuf message: {e}", exc_info=True)
+            logger.error("Error decoding Protobuf message: %s", e, exc_info=True)
+            mark_failed()
         return payload
 
+    def iter_parse_many(
+        self, data: Iterable[Buffer], reuse_message: bool = False
+    ) -> Iterator[ParseResult[T]]:
+        """
+        Lazily deserialize an iterable of raw byte blobs, yielding one
+        `ParseResult` per item. No logging is performed per message; decode
+        failures are reported through `ParseResult.error` instead.
+
+        Args:
+            data (Iterable[Buffer]): Serialized Protobuf messages, as any
+                buffer-protocol objects (see `parse_bytes_to_protobuf`).
+            reuse_message (bool): If True, a single message instance is cleared
+                and re-filled for every item. The yielded message is then only
+                valid until the generator is advanced again, so callers must copy
+                anything they want to keep. Defaults to False.
+
+        Yields:
+            ParseResult[T]: The decoded message (or error) for each item, in order.
+        """
+        message_type = self.message_type
+        message = message_type() if reuse_message else None
+        for index, item in enumerate(data):
+            if reuse_message:
+                message.Clear()
+            else:
+                message = message_type()
+            try:
+                message.ParseFromString(_as_parse_input(item))
+            except DecodeError as e:
+                yield ParseResult(index, None, e)
+                continue
+            yield ParseResult(index, message, None)
+
+    @instrumented()
+    def parse_many(
+        self, data: Iterable[Buffer], recycle: Optional[Sequence[T]] = None
+    ) -> list[ParseResult[T]]:
+        """
+        Deserialize an iterable of raw byte blobs into a list of `ParseResult`.
+
+        Args:
+            data (Iterable[Buffer]): Serialized Protobuf messages, as any
+                buffer-protocol objects (see `parse_bytes_to_protobuf`).
+            recycle (Sequence[T], optional): Previously returned messages that the
+                caller no longer needs. They are cleared and re-filled in order
+                before any new message is allocated. Defaults to None.
+
+        Returns:
+            list[ParseResult[T]]: One result per input item, in input order. Failed
+                items carry the error and a `message` of None.
+        """
+        message_type = self.message_type
+        pool = list(recycle) if recycle else []
+        pool.reverse()
+        results = []
+        append = results.append
+        for index, item in enumerate(data):
+            if pool:
+                message = pool.pop()
+                message.Clear()
+            else:
+                message = message_type()
+            try:
+                message.ParseFromString(_as_parse_input(item))
+            except DecodeError as e:
+                pool.append(message)
+                append(ParseResult(index, None, e))
+                continue
+            append(ParseResult(index, message, None))
+        return results
+
+    @instrumented(bytes_from="output", payload_from="input")
     def parse_protobuf_to_bytes(self, protobuf: Message) -> bytes | None:
         """
         Serialize a Protobuf message instance to raw bytes.
@@ -61,20 +192,26 @@ class ProtobufParser(Generic[T]):
         logger.debug("Serializing Protobuf message to bytes.")
         if not isinstance(protobuf, self.message_type):
             logger.error(
-                f"Invalid message type: {type(protobuf)} (expected {self.message_type})"
+                "Invalid message type: %s (expected %s)",
+                type(protobuf),
+                self.message_type,
             )
+            mark_failed()
             return
         try:
             return protobuf.SerializeToString()
         except Exception as e:
-            logger.error(f"Error serializing Protobuf message: {e}", exc_info=True)
+            logger.error("Error serializing Protobuf message: %s", e, exc_info=True)
+            mark_failed()
             return None
 
+    @instrumented(payload_from="output")
     def parse_dict_to_protobuf(
         self,
         data: dict,
         ignore_unknown_fields: bool = False,
         descriptor_pool: Optional[DescriptorPool] = None,
+        compiled: bool = False,
     ) -> T:
         """
         Convert a Python dictionary to an instance of the subclass's `message_type`,
@@ -86,6 +223,10 @@ class ProtobufParser(Generic[T]):
                 by the `message_type`. Defaults to False.
             descriptor_pool (DescriptorPool, optional): A descriptor pool used
                 to resolve field information during parsing. Defaults to None.
+            compiled (bool): If True, use a builder compiled once for
+                `message_type` (and cached on the parser subclass) instead of
+                `ParseDict`. It produces the same message for valid input.
+                Defaults to False.
 
         Returns:
             T: A Protobuf message instance of type `message_type`.
@@ -93,22 +234,34 @@ class ProtobufParser(Generic[T]):
         logger.debug("Converting dict to Protobuf message.")
         payload = self.message_type()
         try:
-            ParseDict(
-                js_dict=data,
-                message=payload,
-                ignore_unknown_fields=ignore_unknown_fields,
-                descriptor_pool=descriptor_pool,
-            )
+            if compiled:
+                build = self._get_compiled(
+                    compile_dict_to_message,
+                    self.message_type.DESCRIPTOR,
+                    ignore_unknown_fields,
+                    descriptor_pool,
+                )
+                build(data, payload)
+            else:
+                ParseDict(
+                    js_dict=data,
+                    message=payload,
+                    ignore_unknown_fields=ignore_unknown_fields,
+                    descriptor_pool=descriptor_pool,
+                )
             logger.debug("Dictionary successfully converted to Protobuf message.")
         except Exception as e:
-            logger.error(f"Error parsing dict into Protobuf: {e}", exc_info=True)
+            logger.error("Error parsing dict into Protobuf: %s", e, exc_info=True)
+            mark_failed()
         return payload
 
+    @instrumented(bytes_from="output")
     def parse_dict_to_bytes(
         self,
         data: dict,
         ignore_unknown_fields: bool = False,
         descriptor_pool: Optional[DescriptorPool] = None,
+        compiled: bool = False,
     ) -> bytes:
         """
         Convert a Python dictionary to an instance of the subclass's `message_type`,
@@ -120,6 +273,8 @@ class ProtobufParser(Generic[T]):
                 by the `message_type`. Defaults to False.
             descriptor_pool (DescriptorPool, optional): A descriptor pool used
                 to resolve field information. Defaults to None.
+            compiled (bool): If True, use the compiled dict builder instead of
+                `ParseDict` (see `parse_dict_to_protobuf`). Defaults to False.
 
         Returns:
             bytes: The serialized Protobuf message as raw bytes.
@@ -129,12 +284,14 @@ class ProtobufParser(Generic[T]):
             data,
             ignore_unknown_fields=ignore_unknown_fields,
             descriptor_pool=descriptor_pool,
+            compiled=compiled,
         )
         return self.parse_protobuf_to_bytes(protobuf_msg)
 
+    @instrumented(bytes_from="input")
     def parse_bytes_to_dict(
         self,
-        data: bytes,
+        data: Buffer,
         always_print_fields_with_no_presence: bool = False,
         preserving_proto_field_name: bool = True,
         use_integers_for_enums: bool = False,
@@ -146,7 +303,7 @@ class ProtobufParser(Generic[T]):
         then convert it into a Python dictionary.
 
         Args:
-            data (bytes): Serialized Protobuf bytes.
+            data (Buffer): Serialized Protobuf bytes, as any buffer-protocol object.
             always_print_fields_with_no_presence (bool): If True, include fields
                 in the output even if they have no presence. Defaults to False.
             preserving_proto_field_name (bool): If True, keep the original field
@@ -175,10 +332,12 @@ class ProtobufParser(Generic[T]):
             )
         except Exception as e:
             logger.error(
-                f"Error converting Protobuf message to dict: {e}", exc_info=True
+                "Error converting Protobuf message to dict: %s", e, exc_info=True
             )
+            mark_failed()
             return None
 
+    @instrumented(payload_from="input")
     def parse_protobuf_to_dict(
         self,
         protobuf: Message,
@@ -220,16 +379,132 @@ class ProtobufParser(Generic[T]):
             )
         except Exception as e:
             logger.error(
-                f"Error converting Protobuf message to dict: {e}", exc_info=True
+                "Error converting Protobuf message to dict: %s", e, exc_info=True
             )
+            mark_failed()
             return None
         
-    def parse_json_to_protobuf(self, data: str) -> T:
+    @instrumented(bytes_from="input")
+    def parse_bytes_to_native_dict(
+        self,
+        data: Buffer,
+        always_print_fields_with_no_presence: bool = False,
+        preserving_proto_field_name: bool = True,
+        use_integers_for_enums: bool = False,
+        float_precision: Optional[int] = None,
+    ) -> dict | None:
+        """
+        Deserialize raw bytes into an instance of the subclass's `message_type`,
+        then convert it into a Python dictionary of native values using a
+        converter compiled for `message_type` (see `parse_protobuf_to_native_dict`).
+
+        Args:
+            data (Buffer): Serialized Protobuf bytes, as any buffer-protocol object.
+            always_print_fields_with_no_presence (bool): If True, include fields
+                in the output even if they have no presence. Defaults to False.
+            preserving_proto_field_name (bool): If True, keep the original field
+                names defined in the .proto file. Defaults to True.
+            use_integers_for_enums (bool): If True, enum fields are returned as
+                integers instead of strings. Defaults to False.
+            float_precision (Optional[int]): If set, the output for float fields
+                is rounded to this many significant digits. Defaults to None.
+
+        Returns:
+            dict: A dictionary representation of the Protobuf message, or None
+                  if an error occurs.
+        """
+        logger.debug("Converting bytes to native dict via Protobuf message.")
+        payload = self.parse_bytes_to_protobuf(data)
+        return self.parse_protobuf_to_native_dict(
+            payload,
+            always_print_fields_with_no_presence=always_print_fields_with_no_presence,
+            preserving_proto_field_name=preserving_proto_field_name,
+            use_integers_for_enums=use_integers_for_enums,
+            float_precision=float_precision,
+        )
+
+    @instrumented(payload_from="input")
+    def parse_protobuf_to_native_dict(
+        self,
+        protobuf: Message,
+        always_print_fields_with_no_presence: bool = False,
+        preserving_proto_field_name: bool = True,
+        use_integers_for_enums: bool = False,
+        float_precision: Optional[int] = None,
+    ) -> dict | None:
+        """
+        Convert a Protobuf message instance to a Python dictionary of native values.
+
+        Unlike `parse_protobuf_to_dict`, 64-bit integers are kept as `int` and
+        bytes as `bytes` rather than JSON-style strings. The converter is compiled
+        once per message descriptor and set of options, and cached on the parser
+        subclass.
+
+        Args:
+            protobuf (Message): A Protobuf message instance to convert.
+            always_print_fields_with_no_presence (bool): If True, include fields
+                in the output even if they have no presence. Defaults to False.
+            preserving_proto_field_name (bool): If True, keep the original field
+                names defined in the .proto file. Defaults to True.
+            use_integers_for_enums (bool): If True, enum fields are returned as
+                integers instead of strings. Defaults to False.
+            float_precision (Optional[int]): If set, the output for float fields
+                is rounded to this many significant digits. Defaults to None.
+
+        Returns:
+            dict: A dictionary representation of the Protobuf message, or None
+                  if an error occurs.
+        """
+        logger.debug("Converting Protobuf message to native dict.")
+        try:
+            converter = self._get_compiled(
+                compile_message_to_dict,
+                protobuf.DESCRIPTOR,
+                always_print_fields_with_no_presence,
+                preserving_proto_field_name,
+                use_integers_for_enums,
+                float_precision,
+            )
+            return converter(protobuf)
+        except Exception as e:
+            logger.error(
+                "Error converting Protobuf message to native dict: %s", e, exc_info=True
+            )
+            mark_failed()
+            return None
+
+    def _count_metrics(self, message) -> Optional[int]:
+        """
+        Number of metrics in `message`, recorded by instrumentation as the
+        metrics-per-payload distribution. Generic messages have no metrics, so
+        this returns None; subclasses override it.
+        """
+        return None
+
+    @classmethod
+    def _get_compiled(cls, compiler, descriptor, *options):
+        """
+        Return the result of `compiler(descriptor, *options)`, compiling it on
+        first use and caching it on this class.
+        """
+        cache = cls.__dict__.get("_compiled_converters")
+        if cache is None:
+            cache = {}
+            cls._compiled_converters = cache
+        key = (compiler, descriptor, *options)
+        converter = cache.get(key)
+        if converter is None:
+            converter = cache[key] = compiler(descriptor, *options)
+        return converter
+
+    @instrumented(bytes_from="input", payload_from="output")
+    def parse_json_to_protobuf(self, data: str | Buffer) -> T:
         """
         Convert a JSON string to an instance of the subclass's `message_type`.
 
         Args:
-            data (str): A JSON string representing fields for the Protobuf message.
+            data (str | Buffer): A JSON document representing fields for the
+                Protobuf message, as a string or as UTF-8 encoded bytes.
 
         Returns:
             T: A Protobuf message instance of type `message_type`.
@@ -237,8 +512,11 @@ class ProtobufParser(Generic[T]):
         logger.debug("Converting JSON to Protobuf message.")
         payload = self.message_type()
         try:
+            if not isinstance(data, (str, bytes, bytearray)):
+                data = str(data, "utf-8")
             ParseDict(js_dict=json.loads(data), message=payload)
             logger.debug("JSON successfully converted to Protobuf message.")
         except Exception as e:
-            logger.error(f"Error parsing JSON into Protobuf: {e}", exc_info=True)
+            logger.error("Error parsing JSON into Protobuf: %s", e, exc_info=True)
+            mark_failed()
         return payload
\ No newline at end of file
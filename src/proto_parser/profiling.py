@@ -0,0 +1,273 @@
+"""
+Opt-in instrumentation for parser operations.
+
+Parser methods decorated with `instrumented` record per-method call and error
+counters, latency histograms, byte totals and metrics-per-payload
+distributions into the module-level `instrumentation` registry. Recording is
+disabled by default; while disabled, a decorated call costs one attribute check.
+
+A call counts as an error if it raises, or if the method handles a failure
+itself (e.g. logs a `DecodeError` and returns None) and reports it through
+`mark_failed()`.
+
+Example:
+    from proto_parser import instrumentation
+
+    instrumentation.enable()
+    ...  # decode traffic
+    stats = instrumentation.snapshot()
+    print(stats["SparkplugBParser.parse_bytes_to_protobuf"]["latency_s"]["p99"])
+"""
+
+import functools
+import threading
+import time
+from typing import Callable, Literal, Optional
+
+# Histograms use power-of-two buckets: a value v falls into bucket v.bit_length(),
+# i.e. bucket i holds values in [2**(i-1), 2**i).
+_NUM_BUCKETS = 65
+
+
+class _MethodStats:
+    __slots__ = (
+        "calls",
+        "errors",
+        "total_ns",
+        "min_ns",
+        "max_ns",
+        "latency_buckets",
+        "bytes_total",
+        "payloads",
+        "metrics_total",
+        "metrics_buckets",
+    )
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.total_ns = 0
+        self.min_ns = None
+        self.max_ns = 0
+        self.latency_buckets = [0] * _NUM_BUCKETS
+        self.bytes_total = 0
+        self.payloads = 0
+        self.metrics_total = 0
+        self.metrics_buckets = [0] * _NUM_BUCKETS
+
+
+def _histogram(buckets: list[int], scale: float = 1.0) -> dict:
+    """
+    Convert power-of-two buckets to {upper_bound: count}, skipping empty buckets.
+    """
+    return {(1 << i) * scale: count for i, count in enumerate(buckets) if count}
+
+
+def _percentile(buckets: list[int], total: int, fraction: float) -> Optional[int]:
+    """
+    Upper bound of the bucket containing the given fraction of observations.
+    """
+    if not total:
+        return None
+    threshold = fraction * total
+    seen = 0
+    for i, count in enumerate(buckets):
+        seen += count
+        if seen >= threshold:
+            return 1 << i
+    return 1 << (_NUM_BUCKETS - 1)
+
+
+class Instrumentation:
+    """
+    Registry of per-method statistics for instrumented parser methods.
+    """
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self._stats: dict[str, _MethodStats] = {}
+        self._lock = threading.Lock()
+
+    def enable(self) -> None:
+        """
+        Start recording statistics.
+        """
+        self.enabled = True
+
+    def disable(self) -> None:
+        """
+        Stop recording statistics. Recorded values are kept until `reset()`.
+        """
+        self.enabled = False
+
+    def reset(self) -> None:
+        """
+        Discard all recorded statistics.
+        """
+        with self._lock:
+            self._stats.clear()
+
+    def record(
+        self,
+        name: str,
+        elapsed_ns: int,
+        nbytes: Optional[int] = None,
+        nmetrics: Optional[int] = None,
+        error: bool = False,
+    ) -> None:
+        """
+        Record a single call of the operation `name`.
+
+        Args:
+            name (str): Operation name, e.g. "SparkplugBParser.parse_bytes_to_protobuf".
+            elapsed_ns (int): Wall-clock duration of the call in nanoseconds.
+            nbytes (int, optional): Serialized size handled by the call.
+            nmetrics (int, optional): Number of metrics in the payload handled.
+            error (bool): True if the call raised or reported a handled failure.
+                Defaults to False.
+        """
+        with self._lock:
+            stats = self._stats.get(name)
+            if stats is None:
+                stats = self._stats[name] = _MethodStats()
+            stats.calls += 1
+            if error:
+                stats.errors += 1
+            stats.total_ns += elapsed_ns
+            if stats.min_ns is None or elapsed_ns < stats.min_ns:
+                stats.min_ns = elapsed_ns
+            if elapsed_ns > stats.max_ns:
+                stats.max_ns = elapsed_ns
+            stats.latency_buckets[elapsed_ns.bit_length()] += 1
+            if nbytes is not None:
+                stats.bytes_total += nbytes
+            if nmetrics is not None:
+                stats.payloads += 1
+                stats.metrics_total += nmetrics
+                stats.metrics_buckets[nmetrics.bit_length()] += 1
+
+    def snapshot(self) -> dict[str, dict]:
+        """
+        Return a copy of the recorded statistics.
+
+        Returns:
+            dict[str, dict]: Per operation name, a dict with `calls`, `errors`,
+                `bytes_total`, `latency_s` (total, mean, min, max, p50, p90, p99 and
+                a `histogram` of {upper_bound_seconds: count}) and
+                `metrics_per_payload` (payloads, total, mean and a `histogram` of
+                {upper_bound: count}). Percentiles are bucket upper bounds.
+        """
+        with self._lock:
+            items = [
+                (name, stats, list(stats.latency_buckets), list(stats.metrics_buckets))
+                for name, stats in self._stats.items()
+            ]
+            result = {}
+            for name, stats, latency_buckets, metrics_buckets in items:
+                calls = stats.calls
+                latency = {
+                    "total": stats.total_ns / 1e9,
+                    "mean": stats.total_ns / calls / 1e9,
+                    "min": stats.min_ns / 1e9,
+                    "max": stats.max_ns / 1e9,
+                    "histogram": _histogram(latency_buckets, 1e-9),
+                }
+                for label, fraction in (("p50", 0.5), ("p90", 0.9), ("p99", 0.99)):
+                    latency[label] = _percentile(latency_buckets, calls, fraction) / 1e9
+                payloads = stats.payloads
+                result[name] = {
+                    "calls": calls,
+                    "errors": stats.errors,
+                    "bytes_total": stats.bytes_total,
+                    "latency_s": latency,
+                    "metrics_per_payload": {
+                        "payloads": payloads,
+                        "total": stats.metrics_total,
+                        "mean": stats.metrics_total / payloads if payloads else None,
+                        "histogram": _histogram(metrics_buckets),
+                    },
+                }
+        return result
+
+
+instrumentation = Instrumentation()
+
+_Source = Optional[Literal["input", "output"]]
+
+_call_state = threading.local()
+
+
+def mark_failed() -> None:
+    """
+    Report that the running instrumented call handled a failure without raising,
+    so that it is recorded as an error. No-op while instrumentation is disabled.
+    """
+    if instrumentation.enabled:
+        _call_state.failed = True
+
+
+def _size(value) -> Optional[int]:
+    if isinstance(value, str):
+        return len(value.encode())
+    nbytes = getattr(value, "nbytes", None)
+    if nbytes is not None:
+        return nbytes
+    try:
+        return len(value)
+    except TypeError:
+        return None
+
+
+def instrumented(bytes_from: _Source = None, payload_from: _Source = None) -> Callable:
+    """
+    Decorator recording calls of a parser method into `instrumentation`.
+
+    The operation name is `<ClassName>.<method name>` of the instance's class.
+
+    Args:
+        bytes_from ("input" | "output", optional): Record the size of the first
+            argument or of the return value as the bytes handled by the call.
+            Strings are measured by their UTF-8 encoded size.
+        payload_from ("input" | "output", optional): Record the number of metrics
+            in the first argument or in the return value, as reported by the
+            parser's `_count_metrics` method.
+    """
+
+    def decorator(func: Callable) -> Callable:
+        method_name = func.__name__
+
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            if not instrumentation.enabled:
+                return func(self, *args, **kwargs)
+            name = f"{type(self).__name__}.{method_name}"
+            # A failure handled by a nested call also fails the enclosing ones.
+            outer_failed = getattr(_call_state, "failed", False)
+            _call_state.failed = False
+            start = time.perf_counter_ns()
+            try:
+                result = func(self, *args, **kwargs)
+            except BaseException:
+                instrumentation.record(
+                    name, time.perf_counter_ns() - start, error=True
+                )
+                _call_state.failed = outer_failed
+                raise
+            elapsed_ns = time.perf_counter_ns() - start
+            failed = _call_state.failed
+            _call_state.failed = outer_failed or failed
+
+            first = args[0] if args else next(iter(kwargs.values()), None)
+            nbytes = nmetrics = None
+            if bytes_from is not None:
+                nbytes = _size(first if bytes_from == "input" else result)
+            if payload_from is not None:
+                nmetrics = self._count_metrics(
+                    first if payload_from == "input" else result
+                )
+            instrumentation.record(name, elapsed_ns, nbytes, nmetrics, failed)
+            return result
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,287 @@
+"""
+Length-delimited record files for sequences of Protobuf messages.
+
+File layout:
+
+    record*  [index]
+
+where each record is a varint length prefix followed by the serialized message,
+and the optional index is a footer of the form
+
+    offset (uint64 LE) * count | index_offset (uint64 LE) | count (uint64 LE) | MAGIC
+
+`offset` values are positions of the record length prefixes relative to the start
+of the file, so readers can seek to any record without scanning. Records may be
+preceded by other data (e.g. a file header); readers of such files without an
+index need to be given the position of the first record.
+"""
+
+import logging
+import mmap
+import os
+import struct
+from typing import BinaryIO, Generic, Iterable, Iterator, Optional, Union
+
+from google.protobuf.message import DecodeError, Message
+
+from .parser import ParseResult, ProtobufParser, T
+from .varint import decode_varint, encode_varint
+
+logger = logging.getLogger(__name__)
+
+INDEX_MAGIC = b"PBDIDX01"
+_TRAILER = struct.Struct("<QQ8s")
+
+
+class DelimitedWriter:
+    """
+    Buffered writer for length-delimited Protobuf record files.
+
+    Records are accumulated in memory and flushed to the underlying file once
+    `buffer_size` bytes are pending. If `write_index` is True, a footer index with
+    the offset of every record is written on `close()`.
+
+    Example:
+        with DelimitedWriter("capture.pbd") as writer:
+            for raw in mqtt_payloads:
+                writer.append(raw)
+    """
+
+    def __init__(
+        self,
+        file: Union[str, os.PathLike, BinaryIO],
+        buffer_size: int = 1 << 20,
+        write_index: bool = True,
+    ):
+        """
+        Args:
+            file (str | PathLike | BinaryIO): Path of the file to create, or an
+                already opened binary file object positioned where the stream
+                should start. Offsets are recorded relative to the start of the
+                file, so the object should be seekable if it is not positioned
+                at its start.
+            buffer_size (int): Number of pending bytes that triggers a flush.
+                Defaults to 1 MiB.
+            write_index (bool): If True, write a footer index on close.
+                Defaults to True.
+        """
+        position = 0
+        if hasattr(file, "write"):
+            self._file = file
+            self._owns_file = False
+            try:
+                position = file.tell()
+            except (AttributeError, OSError):
+                logger.debug("File object is not seekable; recording offsets from 0.")
+        else:
+            self._file = open(file, "wb")
+            self._owns_file = True
+        self.buffer_size = buffer_size
+        self.write_index = write_index
+        self._buffer = bytearray()
+        self._position = position
+        self._offsets: list[int] = []
+        self._closed = False
+
+    def append(self, record: Union[Message, bytes, bytearray, memoryview]) -> int:
+        """
+        Append a single record.
+
+        Args:
+            record (Message | bytes-like): A Protobuf message, or its serialized bytes.
+
+        Returns:
+            int: The index of the appended record.
+        """
+        if self._closed:
+            raise ValueError("Cannot append to a closed DelimitedWriter.")
+        if isinstance(record, Message):
+            record = record.SerializeToString()
+        prefix = encode_varint(len(record))
+        self._offsets.append(self._position)
+        self._buffer += prefix
+        self._buffer += record
+        self._position += len(prefix) + len(record)
+        if len(self._buffer) >= self.buffer_size:
+            self.flush()
+        return len(self._offsets) - 1
+
+    def extend(self, records: Iterable[Union[Message, bytes]]) -> None:
+        """
+        Append every record from an iterable.
+        """
+        for record in records:
+            self.append(record)
+
+    def flush(self) -> None:
+        """
+        Write any pending records to the underlying file.
+        """
+        if self._buffer:
+            self._file.write(self._buffer)
+            self._buffer.clear()
+        self._file.flush()
+
+    def close(self) -> None:
+        """
+        Flush pending records, write the footer index if enabled, and close the
+        file if it was opened by this writer.
+        """
+        if self._closed:
+            return
+        if self.write_index:
+            count = len(self._offsets)
+            self._buffer += struct.pack(f"<{count}Q", *self._offsets)
+            self._buffer += _TRAILER.pack(self._position, count, INDEX_MAGIC)
+        self.flush()
+        if self._owns_file:
+            self._file.close()
+        self._closed = True
+        logger.debug("Closed DelimitedWriter after %d record(s).", len(self._offsets))
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def __enter__(self) -> "DelimitedWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+
+class DelimitedReader(Generic[T]):
+    """
+    Reader for length-delimited Protobuf record files written by `DelimitedWriter`.
+
+    The file is memory-mapped and records are exposed as `memoryview` slices of
+    the mapping, so iterating does not copy record bytes. Decoding is delegated to
+    the given `ProtobufParser`.
+
+    Record views remain valid only while the reader is open. If views are still
+    referenced when `close()` is called, the mapping is released once they are
+    garbage collected.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, os.PathLike],
+        parser: Optional[ProtobufParser[T]] = None,
+        start: int = 0,
+    ):
+        """
+        Args:
+            path (str | PathLike): Path of the record file.
+            parser (ProtobufParser[T], optional): Parser used to decode records
+                when iterating over messages. Defaults to None.
+            start (int): Position of the first record in the file, for files
+                whose records follow other data. Ignored if the file has a
+                non-empty footer index, which records it. Defaults to 0.
+        """
+        self.parser = parser
+        self._start = start
+        self._file = open(path, "rb")
+        size = os.fstat(self._file.fileno()).st_size
+        if size:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            self._view = memoryview(self._mmap)
+        else:
+            self._mmap = None
+            self._view = memoryview(b"")
+        self._offsets: Optional[list[int]] = None
+        self._data_end = size
+        self._read_index()
+
+    def _read_index(self) -> None:
+        view = self._view
+        size = len(view)
+        if size < _TRAILER.size or view[-8:] != INDEX_MAGIC:
+            return
+        index_offset, count, _ = _TRAILER.unpack_from(view, size - _TRAILER.size)
+        if index_offset + 8 * count + _TRAILER.size != size:
+            logger.warning("Ignoring inconsistent footer index in record file.")
+            return
+        self._offsets = list(struct.unpack_from(f"<{count}Q", view, index_offset))
+        self._data_end = index_offset
+        if self._offsets:
+            self._start = self._offsets[0]
+
+    @property
+    def has_index(self) -> bool:
+        """
+        True if offsets are available without scanning the file.
+        """
+        return self._offsets is not None
+
+    @property
+    def offsets(self) -> list[int]:
+        """
+        Offsets of every record's length prefix. Built by scanning the file once
+        if it has no footer index.
+        """
+        if self._offsets is None:
+            self._offsets = [offset for offset, _, _ in self._scan()]
+        return self._offsets
+
+    def _scan(self) -> Iterator[tuple[int, int, int]]:
+        view = self._view
+        end = self._data_end
+        pos = self._start
+        while pos < end:
+            length, start = decode_varint(view, pos)
+            stop = start + length
+            if stop > end:
+                raise DecodeError(f"Truncated record at offset {pos}.")
+            yield pos, start, stop
+            pos = stop
+
+    def iter_records(self) -> Iterator[memoryview]:
+        """
+        Iterate over the raw record bytes as zero-copy `memoryview` slices.
+        """
+        view = self._view
+        for _, start, stop in self._scan():
+            yield view[start:stop]
+
+    def iter_parse_many(self, reuse_message: bool = False) -> Iterator[ParseResult[T]]:
+        """
+        Decode every record with the reader's parser, yielding `ParseResult`
+        items as `ProtobufParser.iter_parse_many` does.
+        """
+        if self.parser is None:
+            raise ValueError("A parser is required to decode records.")
+        return self.parser.iter_parse_many(self.iter_records(), reuse_message)
+
+    def __iter__(self) -> Iterator[T]:
+        for result in self.iter_parse_many():
+            if result.error is not None:
+                raise result.error
+            yield result.message
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    def __getitem__(self, index: int) -> memoryview:
+        """
+        Return the raw bytes of a single record as a `memoryview`.
+        """
+        offset = self.offsets[index]
+        length, start = decode_varint(self._view, offset)
+        return self._view[start : start + length]
+
+    def close(self) -> None:
+        """
+        Release the memory mapping and close the file.
+        """
+        self._view.release()
+        if self._mmap is not None:
+            try:
+                self._mmap.close()
+            except BufferError:
+                logger.debug("Record views still referenced; deferring unmap.")
+        self._file.close()
+
+    def __enter__(self) -> "DelimitedReader[T]":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
@@ -0,0 +1,57 @@
+"""
+Helpers for the base-128 varint encoding used by the Protobuf wire format.
+"""
+
+from google.protobuf.message import DecodeError
+
+
+def encode_varint(value: int) -> bytes:
+    """
+    Encode a non-negative integer as a Protobuf base-128 varint.
+
+    Args:
+        value (int): The integer to encode. Must be in the range [0, 2**64).
+
+    Returns:
+        bytes: The varint encoding of `value`.
+    """
+    if value < 0x80:
+        if value < 0:
+            raise ValueError(f"Cannot encode negative value as varint: {value}")
+        return bytes((value,))
+    out = bytearray()
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+    return bytes(out)
+
+
+def decode_varint(buffer, pos: int = 0) -> tuple[int, int]:
+    """
+    Decode a Protobuf base-128 varint from a buffer.
+
+    Args:
+        buffer: Any object supporting integer indexing of bytes (bytes, bytearray,
+            memoryview, mmap).
+        pos (int): Offset at which the varint starts. Defaults to 0.
+
+    Returns:
+        tuple[int, int]: The decoded value and the offset just past the varint.
+
+    Raises:
+        DecodeError: If the varint is truncated or longer than 10 bytes.
+    """
+    result = 0
+    shift = 0
+    end = len(buffer)
+    while pos < end:
+        byte = buffer[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return result, pos
+        shift += 7
+        if shift >= 70:
+            raise DecodeError("Varint is too long.")
+    raise DecodeError("Truncated varint.")
@@ -3,8 +3,14 @@ from .sparkplug_b_pb2 import (
 )
 from .sparkplugb_parser import (
     AliasMap,
+    DataSetChunk,
     DataSetDataType,
     MetricDataType,
     ParameterDataType,
+    Waveform,
 )
 from .sparkplugb_parser import SparkplugBParser
+from .aliases import AliasRegistry, DeviceKey
+from .sequence import SeqStatus, SequenceTracker
+from .view import MetricView, PayloadView
+from .aio import AsyncSparkplugBParser
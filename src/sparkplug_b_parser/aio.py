@@ -0,0 +1,71 @@
+"""
+asyncio adaptor for `SparkplugBParser`.
+"""
+
+from collections.abc import Buffer
+from concurrent.futures import Executor
+from typing import AsyncIterable, AsyncIterator, Optional
+
+from . import sparkplug_b_pb2
+from .sparkplugb_parser import SparkplugBParser
+from proto_parser.aio import AsyncProtobufParser, _nbytes
+
+
+def _decode_to_dfs(parser: SparkplugBParser, data: Buffer) -> tuple:
+    # Module-level so that it can be sent to a process pool.
+    payload = parser.parse_bytes_to_protobuf(data)
+    return parser.parse_datasets_to_dfs(payload)
+
+
+class AsyncSparkplugBParser(AsyncProtobufParser[sparkplug_b_pb2.Payload]):
+    """
+    Async counterpart of `SparkplugBParser`, adding DataSet extraction to the
+    decode/encode methods of `AsyncProtobufParser`.
+    """
+
+    def __init__(
+        self,
+        parser: Optional[SparkplugBParser] = None,
+        executor: Optional[Executor] = None,
+        offload_threshold: int = 64 * 1024,
+        max_concurrency: int = 8,
+    ):
+        """
+        Args:
+            parser (SparkplugBParser, optional): The synchronous parser doing the
+                work. Defaults to a new `SparkplugBParser`.
+            executor (Executor, optional): Executor used for offloaded work.
+                Defaults to the event loop's default thread pool.
+            offload_threshold (int): Payloads whose serialized size is at least
+                this many bytes are processed in the executor. Defaults to 64 KiB.
+            max_concurrency (int): Default number of in-flight operations for the
+                stream methods. Defaults to 8.
+        """
+        super().__init__(
+            parser or SparkplugBParser(), executor, offload_threshold, max_concurrency
+        )
+
+    async def to_dfs(self, payload: sparkplug_b_pb2.Payload) -> tuple:
+        """
+        Async version of `parse_datasets_to_dfs`.
+        """
+        return await self._run(
+            payload.ByteSize(), self.parser.parse_datasets_to_dfs, payload
+        )
+
+    async def decode_to_dfs(self, data: Buffer) -> tuple:
+        """
+        Decode raw payload bytes and extract their DataSets in a single executor
+        hop, as `parse_bytes_to_protobuf` followed by `parse_datasets_to_dfs`.
+        """
+        return await self._run(_nbytes(data), _decode_to_dfs, self.parser, data)
+
+    async def decode_stream_to_dfs(
+        self, source: AsyncIterable[bytes], concurrency: Optional[int] = None
+    ) -> AsyncIterator[tuple]:
+        """
+        Like `decode_stream`, but yields the `(dfs, properties)` result of
+        `decode_to_dfs` for each raw payload.
+        """
+        async for result in self._map_stream(self.decode_to_dfs, source, concurrency):
+            yield result
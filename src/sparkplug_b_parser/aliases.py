@@ -0,0 +1,261 @@
+"""
+Alias tables of Sparkplug edge nodes and devices, built from their birth
+certificates.
+
+NBIRTH and DBIRTH payloads declare every metric with its name, alias and
+datatype; later DATA payloads refer to metrics by alias only. `AliasRegistry`
+keeps one compact table per (group, edge node, device) so the names and
+datatypes of DATA metrics are resolved with one lookup per metric. Tables are
+replaced on rebirth and dropped on death.
+"""
+
+import logging
+import sys
+from typing import Iterator, NamedTuple, Optional
+
+from . import sparkplug_b_pb2
+from .sparkplugb_parser import MetricDataType
+
+logger = logging.getLogger(__name__)
+
+# Sparkplug B topic namespace, as in spBv1.0/<group>/<type>/<edge node>[/<device>]
+TOPIC_NAMESPACE = "spBv1.0"
+
+BIRTH_MESSAGE_TYPES = frozenset({"NBIRTH", "DBIRTH"})
+DEATH_MESSAGE_TYPES = frozenset({"NDEATH", "DDEATH"})
+DATA_MESSAGE_TYPES = frozenset({"NDATA", "DDATA"})
+
+
+class DeviceKey(NamedTuple):
+    """
+    Identifies an edge node (`device` None) or one of its devices.
+
+    Attributes:
+        group (str): Sparkplug group ID.
+        edge_node (str): Edge node ID.
+        device (str | None): Device ID, or None for the edge node itself.
+    """
+
+    group: str
+    edge_node: str
+    device: Optional[str] = None
+
+
+def parse_topic(topic: str) -> tuple[str, DeviceKey]:
+    """
+    Split a Sparkplug B topic into its message type and device key.
+
+    Args:
+        topic (str): e.g. "spBv1.0/plant/DDATA/edge1/axuv".
+
+    Returns:
+        tuple[str, DeviceKey]: The message type (e.g. "DDATA") and the key of
+            the edge node or device the message is about.
+    """
+    parts = topic.split("/")
+    if len(parts) not in (4, 5) or parts[0] != TOPIC_NAMESPACE:
+        msg = f"Not a Sparkplug B edge node or device topic: {topic!r}"
+        logger.error(msg)
+        raise ValueError(msg)
+    device = parts[4] if len(parts) == 5 else None
+    return parts[2], DeviceKey(parts[1], parts[3], device)
+
+
+class AliasTable:
+    """
+    The metrics declared by one birth certificate, by alias.
+
+    Names are interned, so devices with the same metrics share their strings,
+    and datatypes are stored one byte per metric. If the aliases form a
+    contiguous range, as is usual, positions are computed from the alias and no
+    mapping is stored.
+    """
+
+    __slots__ = ("names", "datatypes", "_base", "_positions")
+
+    def __init__(self, metrics: list[tuple[int, str, int]]):
+        """
+        Args:
+            metrics (list[tuple[int, str, int]]): `(alias, name, datatype)` of
+                every aliased metric.
+        """
+        metrics = sorted(metrics)
+        aliases = [alias for alias, _, _ in metrics]
+        if len(set(aliases)) != len(aliases):
+            msg = "Birth certificate declares an alias more than once."
+            logger.error(msg)
+            raise ValueError(msg)
+        self.names = tuple(sys.intern(name) for _, name, _ in metrics)
+        self.datatypes = bytes(datatype for _, _, datatype in metrics)
+        self._base = aliases[0] if aliases else 0
+        if not aliases or aliases[-1] - self._base == len(aliases) - 1:
+            self._positions = None
+        else:
+            self._positions = {alias: index for index, alias in enumerate(aliases)}
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def position(self, alias: int) -> Optional[int]:
+        """Index of `alias` in `names` and `datatypes`, or None if undeclared."""
+        if self._positions is not None:
+            return self._positions.get(alias)
+        index = alias - self._base
+        return index if 0 <= index < len(self.names) else None
+
+    def lookup(self, alias: int) -> Optional[tuple[str, int]]:
+        """The `(name, datatype)` declared for `alias`, or None."""
+        index = self.position(alias)
+        if index is None:
+            return None
+        return self.names[index], self.datatypes[index]
+
+
+class AliasRegistry:
+    """
+    Alias tables of edge nodes and devices, keyed by `DeviceKey`.
+
+    Feed every message to `handle`, or call `register_birth`, `unregister` and
+    `resolve` directly. An edge node's birth or death also drops the tables of
+    all its devices, as their births are void once the node's is.
+    """
+
+    def __init__(self):
+        self._tables: dict[DeviceKey, AliasTable] = {}
+        # Devices with a table, per edge node key, for NDEATH
+        self._devices: dict[DeviceKey, set[DeviceKey]] = {}
+
+    def __len__(self) -> int:
+        return len(self._tables)
+
+    def __contains__(self, key: DeviceKey) -> bool:
+        return key in self._tables
+
+    def __iter__(self) -> Iterator[DeviceKey]:
+        return iter(self._tables)
+
+    def table(self, key: DeviceKey) -> Optional[AliasTable]:
+        """The alias table registered for `key`, or None."""
+        return self._tables.get(key)
+
+    def register_birth(
+        self, key: DeviceKey, payload: sparkplug_b_pb2.Payload
+    ) -> AliasTable:
+        """
+        Build the alias table of an NBIRTH or DBIRTH payload, replacing any
+        table registered for `key` (a rebirth). An NBIRTH also drops the tables
+        of the edge node's devices, which must be born again after it. Metrics
+        without an alias are not recorded.
+
+        Args:
+            key (DeviceKey): The edge node or device the birth is about.
+            payload (sparkplug_b_pb2.Payload): The birth certificate.
+
+        Returns:
+            AliasTable: The new table.
+        """
+        table = AliasTable(
+            [
+                (metric.alias, metric.name, metric.datatype)
+                for metric in payload.metrics
+                if metric.HasField("alias")
+            ]
+        )
+        key = DeviceKey(*key)
+        if key.device is None:
+            self.unregister(key)
+        self._tables[key] = table
+        if key.device is not None:
+            node = key._replace(device=None)
+            self._devices.setdefault(node, set()).add(key)
+        logger.debug("Registered %d alias(es) for %s.", len(table), key)
+        return table
+
+    def unregister(self, key: DeviceKey) -> None:
+        """
+        Drop the table of `key` after its death. For an edge node, the tables
+        of its devices are dropped too.
+        """
+        key = DeviceKey(*key)
+        self._tables.pop(key, None)
+        if key.device is None:
+            for device in self._devices.pop(key, ()):
+                self._tables.pop(device, None)
+        else:
+            devices = self._devices.get(key._replace(device=None))
+            if devices is not None:
+                devices.discard(key)
+        logger.debug("Unregistered aliases of %s.", key)
+
+    def clear(self) -> None:
+        """Drop all tables."""
+        self._tables.clear()
+        self._devices.clear()
+
+    def resolve(
+        self, key: DeviceKey, payload: sparkplug_b_pb2.Payload
+    ) -> sparkplug_b_pb2.Payload:
+        """
+        Fill in, in place, the name and datatype of every aliased metric of a
+        DATA payload that has no name. Datatypes already set are kept.
+
+        Args:
+            key (DeviceKey): The edge node or device that sent the payload.
+            payload (sparkplug_b_pb2.Payload): The DATA payload.
+
+        Returns:
+            sparkplug_b_pb2.Payload: `payload`, resolved.
+        """
+        table = self._tables.get(key)
+        if table is None:
+            msg = f"No birth certificate registered for {key}."
+            logger.error(msg)
+            raise KeyError(msg)
+        names, datatypes, position = table.names, table.datatypes, table.position
+        unknown = 0
+        # Field access is the main cost here, so each field is read once and
+        # presence is only checked where the value is ambiguous.
+        for metric in payload.metrics:
+            if metric.name:
+                continue
+            alias = metric.alias
+            if not alias and not metric.HasField("alias"):
+                continue
+            index = position(alias)
+            if index is None:
+                unknown += 1
+                continue
+            metric.name = names[index]
+            if metric.datatype == MetricDataType.Unknown:
+                metric.datatype = datatypes[index]
+        if unknown:
+            logger.warning(
+                "%d metric alias(es) not declared in the birth of %s.", unknown, key
+            )
+        return payload
+
+    def handle(
+        self, topic: str, payload: sparkplug_b_pb2.Payload
+    ) -> Optional[sparkplug_b_pb2.Payload]:
+        """
+        Update the registry from, or resolve, a message received on `topic`:
+        births register a table, deaths drop it and DATA payloads are resolved.
+        Other messages (commands, STATE) are returned unchanged.
+
+        Args:
+            topic (str): The Sparkplug B topic the message was received on.
+            payload (sparkplug_b_pb2.Payload): The decoded message.
+
+        Returns:
+            sparkplug_b_pb2.Payload | None: The payload, resolved if it is a
+                DATA message, or None for a death.
+        """
+        message_type, key = parse_topic(topic)
+        if message_type in DATA_MESSAGE_TYPES:
+            return self.resolve(key, payload)
+        if message_type in BIRTH_MESSAGE_TYPES:
+            self.register_birth(key, payload)
+        elif message_type in DEATH_MESSAGE_TYPES:
+            self.unregister(key)
+            return None
+        return payload
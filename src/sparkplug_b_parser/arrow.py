@@ -0,0 +1,126 @@
+"""
+Conversion of SparkplugB DataSets to Apache Arrow tables.
+
+Requires the optional `pyarrow` dependency (the `arrow` extra).
+Columns are first read into typed NumPy arrays (see `columnar.dataset_to_arrays`),
+which Arrow then wraps without copying for every numeric column. The metric's
+name, alias, timestamp and properties are stored in the schema metadata, and
+each field's Sparkplug type code in the field metadata.
+"""
+
+import json
+import logging
+from typing import Optional
+
+try:
+    import pyarrow as pa
+except ImportError as e:  # pragma: no cover - depends on the environment
+    raise ImportError(
+        "Arrow output requires pyarrow. Install it with the `arrow` extra, "
+        "e.g. `pip install sparkplug-b-toolkit[arrow]`."
+    ) from e
+
+from . import sparkplug_b_pb2
+from .columnar import dataset_to_arrays
+from .sparkplugb_parser import DataSetDataType
+
+logger = logging.getLogger(__name__)
+
+# Maps from Sparkplug DataSet column type -> Arrow type
+dataset_arrow_type_map = {
+    DataSetDataType.Int8: pa.int8(),
+    DataSetDataType.Int16: pa.int16(),
+    DataSetDataType.Int32: pa.int32(),
+    DataSetDataType.Int64: pa.int64(),
+    DataSetDataType.UInt8: pa.uint8(),
+    DataSetDataType.UInt16: pa.uint16(),
+    DataSetDataType.UInt32: pa.uint32(),
+    DataSetDataType.UInt64: pa.uint64(),
+    DataSetDataType.Float: pa.float32(),
+    DataSetDataType.Double: pa.float64(),
+    DataSetDataType.Boolean: pa.bool_(),
+    DataSetDataType.String: pa.string(),
+    DataSetDataType.DateTime: pa.timestamp("ms"),
+    DataSetDataType.Text: pa.string(),
+}
+
+# Schema metadata keys
+METADATA_METRIC_NAME = b"sparkplug.metric.name"
+METADATA_METRIC_ALIAS = b"sparkplug.metric.alias"
+METADATA_METRIC_TIMESTAMP = b"sparkplug.metric.timestamp"
+METADATA_PROPERTIES = b"sparkplug.properties"
+# Field metadata key
+METADATA_TYPE = b"sparkplug.type"
+
+
+def metric_metadata(
+    metric: sparkplug_b_pb2.Payload.Metric, properties: Optional[dict]
+) -> dict[bytes, bytes]:
+    """
+    Build the schema metadata of a metric's table. Properties are stored as
+    JSON; values JSON cannot represent (e.g. bytes) are stored as strings.
+    """
+    metadata = {}
+    if metric.HasField("name"):
+        metadata[METADATA_METRIC_NAME] = metric.name.encode("utf-8")
+    if metric.HasField("alias"):
+        metadata[METADATA_METRIC_ALIAS] = str(metric.alias).encode()
+    if metric.HasField("timestamp"):
+        metadata[METADATA_METRIC_TIMESTAMP] = str(metric.timestamp).encode()
+    if properties:
+        metadata[METADATA_PROPERTIES] = json.dumps(properties, default=str).encode()
+    return metadata
+
+
+def dataset_to_table(
+    dataset: sparkplug_b_pb2.Payload.DataSet,
+    metadata: Optional[dict[bytes, bytes]] = None,
+) -> pa.Table:
+    """
+    Convert a DataSet to an Arrow table whose column types follow the Sparkplug
+    column types (see `dataset_arrow_type_map`).
+
+    Args:
+        dataset (sparkplug_b_pb2.Payload.DataSet): The DataSet to convert.
+        metadata (dict[bytes, bytes], optional): Schema metadata to attach.
+
+    Returns:
+        pa.Table: One column per DataSet column, in order.
+    """
+    if len(dataset.columns) != len(dataset.types):
+        msg = "Mismatch in number of columns vs. types in the DataSet."
+        logger.error(msg)
+        raise ValueError(msg)
+    columns = [str(col) for col in dataset.columns]
+    arrays = dataset_to_arrays(dataset)
+    return arrays_to_table(columns, list(dataset.types), arrays, metadata)
+
+
+def arrays_to_table(
+    columns: list[str],
+    types: list[int],
+    arrays: list,
+    metadata: Optional[dict[bytes, bytes]] = None,
+) -> pa.Table:
+    """
+    Build an Arrow table from typed column arrays (see
+    `columnar.dataset_to_arrays`) and their Sparkplug DataSet type codes.
+
+    Args:
+        columns (list[str]): Column names.
+        types (list[int]): Sparkplug DataSet type code of each column.
+        arrays (list[np.ndarray]): One array per column.
+        metadata (dict[bytes, bytes], optional): Schema metadata to attach.
+
+    Returns:
+        pa.Table: One column per array, in order.
+    """
+    fields, values = [], []
+    for name, type_code, array in zip(columns, types, arrays):
+        arrow_type = dataset_arrow_type_map[type_code]
+        fields.append(
+            pa.field(name, arrow_type, metadata={METADATA_TYPE: str(type_code)})
+        )
+        values.append(pa.array(array, type=arrow_type))
+    schema = pa.schema(fields, metadata=metadata)
+    return pa.Table.from_arrays(values, schema=schema)
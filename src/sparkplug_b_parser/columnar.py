@@ -0,0 +1,371 @@
+"""
+Column-wise conversion between SparkplugB DataSets and NumPy arrays.
+
+Each DataSet column is read into a preallocated array of the Protobuf field's
+wire type (e.g. uint32 for `int_value`) and then reinterpreted or narrowed to
+the NumPy dtype matching the column's Sparkplug type, so no per-cell Python
+type conversion takes place. `infer_dataset_types` maps the other way, from
+pandas dtypes to Sparkplug column types.
+
+`DataSetExtractor` resolves the field accessors, column positions and dtypes of
+one DataSet schema once, so DataSets sharing the schema skip that work.
+"""
+
+import logging
+from operator import attrgetter, itemgetter
+from typing import Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from . import sparkplug_b_pb2
+from .sparkplugb_parser import (
+    DataSetDataType,
+    metric_python_type_map,
+    metric_value_field_map,
+)
+
+logger = logging.getLogger(__name__)
+
+# Maps from Sparkplug DataSet column type -> (DataSetValue field, wire dtype, dtype)
+dataset_dtype_map = {
+    DataSetDataType.Int8: ("int_value", np.uint32, np.int8),
+    DataSetDataType.Int16: ("int_value", np.uint32, np.int16),
+    DataSetDataType.Int32: ("int_value", np.uint32, np.int32),
+    DataSetDataType.Int64: ("long_value", np.uint64, np.int64),
+    DataSetDataType.UInt8: ("int_value", np.uint32, np.uint8),
+    DataSetDataType.UInt16: ("int_value", np.uint32, np.uint16),
+    DataSetDataType.UInt32: ("int_value", np.uint32, np.uint32),
+    DataSetDataType.UInt64: ("long_value", np.uint64, np.uint64),
+    DataSetDataType.Float: ("float_value", np.float32, np.float32),
+    DataSetDataType.Double: ("double_value", np.float64, np.float64),
+    DataSetDataType.Boolean: ("boolean_value", np.bool_, np.bool_),
+    DataSetDataType.String: ("string_value", object, object),
+    DataSetDataType.DateTime: ("long_value", np.uint64, np.int64),  # ms since epoch
+    DataSetDataType.Text: ("string_value", object, object),
+}
+
+
+# Maps from NumPy dtype -> Sparkplug DataSet column type, for type inference
+dtype_dataset_map = {
+    np.dtype(np.int8): DataSetDataType.Int8,
+    np.dtype(np.int16): DataSetDataType.Int16,
+    np.dtype(np.int32): DataSetDataType.Int32,
+    np.dtype(np.int64): DataSetDataType.Int64,
+    np.dtype(np.uint8): DataSetDataType.UInt8,
+    np.dtype(np.uint16): DataSetDataType.UInt16,
+    np.dtype(np.uint32): DataSetDataType.UInt32,
+    np.dtype(np.uint64): DataSetDataType.UInt64,
+    np.dtype(np.float32): DataSetDataType.Float,
+    np.dtype(np.float64): DataSetDataType.Double,
+    np.dtype(np.bool_): DataSetDataType.Boolean,
+}
+
+
+def infer_dataset_types(df: pd.DataFrame) -> list[int]:
+    """
+    Infer the Sparkplug DataSet column type of every DataFrame column from its
+    dtype. Nullable pandas dtypes map like their NumPy counterparts, datetimes
+    to DateTime, and object and string columns to String.
+
+    Args:
+        df (pd.DataFrame): The DataFrame to inspect.
+
+    Returns:
+        list[int]: One `DataSetDataType` code per column.
+    """
+    types = []
+    for name, dtype in df.dtypes.items():
+        if dtype.kind == "M":
+            types.append(DataSetDataType.DateTime)
+            continue
+        if dtype == object or isinstance(dtype, pd.StringDtype):
+            types.append(DataSetDataType.String)
+            continue
+        numpy_dtype = np.dtype(getattr(dtype, "numpy_dtype", dtype))
+        type_code = dtype_dataset_map.get(numpy_dtype)
+        if type_code is None:
+            msg = f"Cannot infer a DataSet type for column {name!r} of dtype {dtype}."
+            logger.error(msg)
+            raise ValueError(msg)
+        types.append(type_code)
+    return types
+
+
+def column_indexes(columns: Sequence[str], selection: Sequence[str]) -> list[int]:
+    """
+    Return the positions of the `selection` column names among `columns`, in
+    the order of `selection`.
+
+    Args:
+        columns (Sequence[str]): All column names of a DataSet.
+        selection (Sequence[str]): The names of the columns to select.
+
+    Returns:
+        list[int]: One position per selected column.
+    """
+    positions = {str(name): index for index, name in enumerate(columns)}
+    missing = [name for name in selection if name not in positions]
+    if missing:
+        msg = f"DataSet has no column(s) named {missing}."
+        logger.error(msg)
+        raise ValueError(msg)
+    return [positions[name] for name in selection]
+
+
+def _to_dtype(raw: np.ndarray, dtype) -> np.ndarray:
+    """
+    Convert a column read with its wire dtype to `dtype`. Signed integers are
+    stored as two's complement in the unsigned wire fields, so they are viewed
+    as signed of the same width before being narrowed.
+    """
+    if raw.dtype == dtype:
+        return raw
+    if np.issubdtype(dtype, np.signedinteger):
+        raw = raw.view(np.int32 if raw.dtype == np.uint32 else np.int64)
+    return raw.astype(dtype, copy=False)
+
+
+def _row_elements(
+    dataset: sparkplug_b_pb2.Payload.DataSet, start: int, stop: Optional[int]
+) -> list:
+    """
+    The `elements` of rows `start` to `stop`, checked to hold one element per
+    column.
+    """
+    num_columns = len(dataset.types)
+    elements = [row.elements for row in dataset.rows[start:stop]]
+    for index, row in enumerate(elements, start):
+        if len(row) != num_columns:
+            msg = (
+                f"Row {index} has {len(row)} element(s), "
+                f"but the DataSet has {num_columns} column(s)."
+            )
+            logger.error(msg)
+            raise ValueError(msg)
+    return elements
+
+
+def dataset_to_arrays(
+    dataset: sparkplug_b_pb2.Payload.DataSet,
+    start: int = 0,
+    stop: Optional[int] = None,
+    columns: Optional[Sequence[int]] = None,
+) -> list[np.ndarray]:
+    """
+    Convert every column of a DataSet to a NumPy array whose dtype matches the
+    column's Sparkplug type (see `dataset_dtype_map`).
+
+    Args:
+        dataset (sparkplug_b_pb2.Payload.DataSet): The DataSet to convert.
+        start (int): Index of the first row to convert. Defaults to 0.
+        stop (int | None): Index just past the last row to convert. Defaults to
+            the end of the DataSet.
+        columns (Sequence[int], optional): Positions of the columns to convert.
+            Defaults to all columns.
+
+    Returns:
+        list[np.ndarray]: One array per converted column, in the order of
+            `columns`.
+    """
+    types = list(dataset.types)
+    elements = _row_elements(dataset, start, stop)
+    num_rows = len(elements)
+
+    if columns is None:
+        columns = range(len(types))
+    arrays = []
+    for column in columns:
+        type_code = types[column]
+        spec = dataset_dtype_map.get(type_code)
+        if spec is None:
+            msg = f"Unsupported DataSet column type: {type_code}"
+            logger.error(msg)
+            raise ValueError(msg)
+        field_name, wire_dtype, dtype = spec
+        values = map(attrgetter(field_name), map(itemgetter(column), elements))
+        raw = np.fromiter(values, dtype=wire_dtype, count=num_rows)
+        arrays.append(_to_dtype(raw, dtype))
+    return arrays
+
+
+def dataset_to_df(
+    dataset: sparkplug_b_pb2.Payload.DataSet, columns: Optional[Sequence[str]] = None
+) -> pd.DataFrame:
+    """
+    Convert a DataSet to a DataFrame built from typed column arrays (see
+    `dataset_to_arrays`), without copying them.
+
+    Args:
+        dataset (sparkplug_b_pb2.Payload.DataSet): The DataSet to convert.
+        columns (Sequence[str], optional): Names of the columns to convert, in
+            the order they should appear. Defaults to all columns.
+
+    Returns:
+        pd.DataFrame: One column per converted DataSet column.
+    """
+    extractor = DataSetExtractor(dataset.columns, dataset.types, columns)
+    return extractor.to_df(dataset, columnar=True)
+
+
+def _unsupported(type_code: int):
+    """
+    A value getter for a column type that cannot be converted. It raises once a
+    value is requested, so DataSets without rows still convert.
+    """
+
+    def value(element):
+        msg = f"Unsupported DataSet column type: {type_code}"
+        logger.error(msg)
+        raise ValueError(msg)
+
+    return value
+
+
+def _frame(columns: list[str], values: list) -> pd.DataFrame:
+    # Build from positions so duplicate column names are kept
+    df = pd.DataFrame(dict(enumerate(values)), copy=False)
+    df.columns = columns
+    return df
+
+
+class DataSetExtractor:
+    """
+    Converter for the DataSets of one schema: their column names and types,
+    and optionally a selection of columns. The positions, value accessors and
+    dtypes of the selected columns are resolved once, when the extractor is
+    built.
+
+    Attributes:
+        columns (list[str]): Names of the selected columns, in output order.
+        types (list[int]): Sparkplug DataSet type code of each selected column.
+    """
+
+    __slots__ = ("columns", "types", "_indexes", "_columnar", "_row_wise")
+
+    def __init__(
+        self,
+        columns: Sequence[str],
+        types: Sequence[int],
+        selection: Optional[Sequence[str]] = None,
+    ):
+        """
+        Args:
+            columns (Sequence[str]): All column names of the DataSet schema.
+            types (Sequence[int]): Sparkplug DataSet type code of each column.
+            selection (Sequence[str], optional): Names of the columns to
+                convert, in the order they should appear. Defaults to all
+                columns.
+        """
+        if len(columns) != len(types):
+            msg = "Mismatch in number of columns vs. types in the DataSet."
+            logger.error(msg)
+            raise ValueError(msg)
+        if selection is None:
+            indexes = range(len(columns))
+        else:
+            indexes = column_indexes(columns, selection)
+
+        self.columns = [str(columns[index]) for index in indexes]
+        self.types = [types[index] for index in indexes]
+        self._indexes = None if selection is None else list(indexes)
+        # Per column: (element getter, value getter, wire dtype, dtype), or None
+        # if the type has no typed array representation
+        self._columnar = []
+        # Per column: (element getter, value getter, dtype or None to infer)
+        self._row_wise = []
+        for index, type_code in zip(indexes, self.types):
+            element = itemgetter(index)
+            spec = dataset_dtype_map.get(type_code)
+            if spec is None:
+                self._columnar.append(None)
+            else:
+                field_name, wire_dtype, dtype = spec
+                self._columnar.append(
+                    (element, attrgetter(field_name), wire_dtype, dtype)
+                )
+            # Row-wise columns hold the Python values of the field given by
+            # `metric_value_field_map`. Their dtype is fixed unless it depends
+            # on the values: 64-bit integers may need uint64, and strings (and
+            # anything else) are left to pandas' inference.
+            field_name = metric_value_field_map.get(type_code)
+            value = attrgetter(field_name) if field_name else _unsupported(type_code)
+            py_type = metric_python_type_map.get(type_code)
+            if field_name == "int_value":
+                row_dtype = np.int64
+            else:
+                row_dtype = {float: np.float64, bool: np.bool_}.get(py_type)
+            self._row_wise.append((element, value, row_dtype))
+
+    def to_arrays(
+        self,
+        dataset: sparkplug_b_pb2.Payload.DataSet,
+        start: int = 0,
+        stop: Optional[int] = None,
+    ) -> list[np.ndarray]:
+        """
+        Convert the selected columns of a DataSet to typed NumPy arrays, as
+        `dataset_to_arrays` does.
+
+        Args:
+            dataset (sparkplug_b_pb2.Payload.DataSet): A DataSet of this schema.
+            start (int): Index of the first row to convert. Defaults to 0.
+            stop (int | None): Index just past the last row to convert.
+                Defaults to the end of the DataSet.
+
+        Returns:
+            list[np.ndarray]: One array per selected column.
+        """
+        elements = _row_elements(dataset, start, stop)
+        num_rows = len(elements)
+        arrays = []
+        for type_code, spec in zip(self.types, self._columnar):
+            if spec is None:
+                msg = f"Unsupported DataSet column type: {type_code}"
+                logger.error(msg)
+                raise ValueError(msg)
+            element, value, wire_dtype, dtype = spec
+            values = map(value, map(element, elements))
+            raw = np.fromiter(values, dtype=wire_dtype, count=num_rows)
+            arrays.append(_to_dtype(raw, dtype))
+        return arrays
+
+    def to_df(
+        self, dataset: sparkplug_b_pb2.Payload.DataSet, columnar: bool = False
+    ) -> pd.DataFrame:
+        """
+        Convert a DataSet of this schema to a DataFrame of the selected columns.
+
+        Args:
+            dataset (sparkplug_b_pb2.Payload.DataSet): A DataSet of this schema.
+            columnar (bool): If True, columns get the dtype of their Sparkplug
+                type (see `dataset_dtype_map`). Otherwise they hold the raw
+                field values as Python-typed columns (int64, float64, bool,
+                ...), as `SparkplugBParser.parse_datasets_to_dfs` returns by
+                default. Defaults to False.
+
+        Returns:
+            pd.DataFrame: One column per selected column.
+        """
+        if columnar:
+            return _frame(self.columns, self.to_arrays(dataset))
+        elements = [row.elements for row in dataset.rows]
+        num_rows = len(elements)
+        num_columns = len(dataset.types)
+        if not num_rows or any(len(row) != num_columns for row in elements):
+            # Empty DataSets and rows of other lengths are left to pandas: short
+            # rows are padded with NaN and all columns of an empty DataFrame
+            # are object columns.
+            if self._indexes is not None:
+                elements = [[row[i] for i in self._indexes] for row in elements]
+            getters = [value for _, value, _ in self._row_wise]
+            data = [[get(e) for e, get in zip(row, getters)] for row in elements]
+            return pd.DataFrame(data, columns=self.columns)
+        values = []
+        for element, value, dtype in self._row_wise:
+            column = map(value, map(element, elements))
+            if dtype is None:
+                values.append(list(column))
+            else:
+                values.append(np.fromiter(column, dtype=dtype, count=num_rows))
+        return _frame(self.columns, values)
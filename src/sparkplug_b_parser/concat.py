@@ -0,0 +1,247 @@
+"""
+Concatenation of one DataSet metric across many SparkplugB payloads.
+
+Payloads are read in two passes. The first finds the metric in every payload,
+checks that its columns and types match and counts its rows. The second decodes
+each DataSet's rows straight into slices of column arrays preallocated for the
+total row count, so every column is allocated once and no intermediate
+DataFrames are concatenated.
+
+Serialized payloads are decoded from their wire bytes (see `wire`) without
+building Payload messages. If all payloads are serialized, their DataSet bytes
+are joined into one buffer and the rows of all payloads are decoded together,
+so the per-column NumPy steps run once rather than once per payload.
+"""
+
+import logging
+from collections.abc import Buffer
+from typing import Callable, Iterable, NamedTuple, Optional, Union
+
+import numpy as np
+
+from . import sparkplug_b_pb2
+from .columnar import dataset_dtype_map, dataset_to_arrays
+from .sparkplugb_parser import DataSetDataType
+from .wire import (
+    _Irregular,
+    _decode_regular_rows,
+    _decode_rows,
+    _scan_dataset,
+    _to_df,
+    decode_payload_header,
+    iter_metrics,
+)
+
+logger = logging.getLogger(__name__)
+
+# Maps from optional extra column -> Sparkplug DataSet type of its values
+extra_column_type_map = {
+    "payload_timestamp": DataSetDataType.DateTime,
+    "metric_timestamp": DataSetDataType.DateTime,
+    "seq": DataSetDataType.UInt64,
+}
+
+
+class _Part(NamedTuple):
+    """
+    The DataSet of one payload: its schema and row count, a function decoding
+    its rows into column arrays, and the values of the extra columns. For
+    serialized payloads, `wire` holds the buffer, the DataSet's range and the
+    offsets of its rows.
+    """
+
+    columns: list[str]
+    types: list[int]
+    num_rows: int
+    decode: Callable[[], list[np.ndarray]]
+    extras: dict[str, int]
+    wire: Optional[tuple] = None
+
+
+def _matches(metric: sparkplug_b_pb2.Payload.Metric, key: Union[str, int]) -> bool:
+    if isinstance(key, str):
+        return metric.name == key
+    return metric.HasField("alias") and metric.alias == key
+
+
+def _message_part(
+    dataset: sparkplug_b_pb2.Payload.DataSet, extras: dict[str, int]
+) -> _Part:
+    return _Part(
+        [str(col) for col in dataset.columns],
+        list(dataset.types),
+        len(dataset.rows),
+        lambda: dataset_to_arrays(dataset),
+        extras,
+    )
+
+
+def _scan_payload(
+    data: Union[sparkplug_b_pb2.Payload, Buffer], key: Union[str, int]
+) -> Optional[_Part]:
+    """
+    Find the DataSet metric `key` in a payload. Metrics are matched on having
+    a DataSet value rather than on `datatype`, which DATA messages may omit.
+    """
+    if isinstance(data, sparkplug_b_pb2.Payload):
+        for metric in data.metrics:
+            if metric.HasField("dataset_value") and _matches(metric, key):
+                extras = {
+                    "payload_timestamp": data.timestamp,
+                    "metric_timestamp": metric.timestamp,
+                    "seq": data.seq,
+                }
+                return _message_part(metric.dataset_value, extras)
+        return None
+
+    view = memoryview(data).cast("B")
+    for _, metric_bytes, dataset_range in iter_metrics(view):
+        if dataset_range is None:
+            continue
+        metric = sparkplug_b_pb2.Payload.Metric.FromString(metric_bytes)
+        if not _matches(metric, key):
+            continue
+        timestamp, seq = decode_payload_header(view)
+        extras = {
+            "payload_timestamp": timestamp or 0,
+            "metric_timestamp": metric.timestamp,
+            "seq": seq or 0,
+        }
+        buf = np.frombuffer(view, dtype=np.uint8)
+        try:
+            columns, types, row_starts, row_stops = _scan_dataset(
+                view, buf, *dataset_range
+            )
+        except _Irregular as e:
+            logger.debug("Decoding DataSet with Protobuf: %s", e)
+            start, end = dataset_range
+            dataset = sparkplug_b_pb2.Payload.DataSet.FromString(view[start:end])
+            return _message_part(dataset, extras)
+        return _Part(
+            columns,
+            types,
+            len(row_starts),
+            lambda: _decode_rows(view, buf, types, row_starts, row_stops),
+            extras,
+            (view, dataset_range, row_starts, row_stops),
+        )
+    return None
+
+
+def _decode_parts(parts: list[_Part], types: list[int], total: int) -> list:
+    """
+    Decode every part into slices of column arrays preallocated for `total`
+    rows.
+    """
+    arrays = [np.empty(total, dtype=dataset_dtype_map[t][2]) for t in types]
+    offset = 0
+    for part in parts:
+        stop = offset + part.num_rows
+        for target, values in zip(arrays, part.decode()):
+            target[offset:stop] = values
+        offset = stop
+    return arrays
+
+
+def _decode_joined(parts: list[_Part], types: list[int]) -> Optional[list]:
+    """
+    Decode the rows of all parts at once from one buffer holding their DataSet
+    bytes. Returns None if a part is not serialized or has irregular rows.
+    """
+    if len(parts) < 2 or any(part.wire is None for part in parts):
+        return None
+    chunks, starts, stops = [], [], []
+    base = 0
+    for view, (start, end), row_starts, row_stops in (part.wire for part in parts):
+        chunks.append(view[start:end])
+        starts.append(row_starts + (base - start))
+        stops.append(row_stops + (base - start))
+        base += end - start
+    joined = memoryview(b"".join(chunks))
+    buf = np.frombuffer(joined, dtype=np.uint8)
+    try:
+        return _decode_regular_rows(
+            joined, buf, types, np.concatenate(starts), np.concatenate(stops)
+        )
+    except _Irregular as e:
+        logger.debug("Decoding DataSets one payload at a time: %s", e)
+        return None
+
+
+def concat_datasets(
+    data: Iterable[Union[sparkplug_b_pb2.Payload, Buffer]],
+    metric: Union[str, int],
+    payload_timestamp: bool = False,
+    metric_timestamp: bool = False,
+    seq: bool = False,
+    as_arrow: bool = False,
+):
+    """
+    Concatenate the rows of one DataSet metric across many payloads into a
+    single frame. See `SparkplugBParser.concat_datasets`.
+    """
+    parts = []
+    for index, item in enumerate(data):
+        part = _scan_payload(item, metric)
+        if part is None:
+            continue
+        if parts and (part.columns, part.types) != (parts[0].columns, parts[0].types):
+            msg = (
+                f"DataSet {metric!r} in payload {index} has columns {part.columns} "
+                f"and types {part.types}, expected {parts[0].columns} and "
+                f"{parts[0].types}."
+            )
+            logger.error(msg)
+            raise ValueError(msg)
+        parts.append(part)
+
+    if not parts:
+        logger.warning("No DataSet metric %r found in the payloads.", metric)
+        return None
+
+    columns, types = list(parts[0].columns), list(parts[0].types)
+    if len(columns) != len(types):
+        msg = "Mismatch in number of columns vs. types in the DataSet."
+        logger.error(msg)
+        raise ValueError(msg)
+    counts = np.fromiter((part.num_rows for part in parts), np.int64, len(parts))
+    total = int(counts.sum())
+    logger.debug(
+        "Concatenating %d row(s) of DataSet %r from %d payload(s).",
+        total,
+        metric,
+        len(parts),
+    )
+
+    for type_code in types:
+        if type_code not in dataset_dtype_map:
+            msg = f"Unsupported DataSet column type: {type_code}"
+            logger.error(msg)
+            raise ValueError(msg)
+    arrays = _decode_joined(parts, types)
+    if arrays is None:
+        arrays = _decode_parts(parts, types, total)
+
+    selected = {
+        "payload_timestamp": payload_timestamp,
+        "metric_timestamp": metric_timestamp,
+        "seq": seq,
+    }
+    for name, type_code in extra_column_type_map.items():
+        if not selected[name]:
+            continue
+        if name in columns:
+            msg = f"DataSet {metric!r} already has a column named {name!r}."
+            logger.error(msg)
+            raise ValueError(msg)
+        dtype = dataset_dtype_map[type_code][2]
+        values = np.fromiter((part.extras[name] for part in parts), np.uint64)
+        columns.append(name)
+        types.append(type_code)
+        arrays.append(np.repeat(values.view(dtype), counts))
+
+    if as_arrow:
+        from .arrow import arrays_to_table
+
+        return arrays_to_table(columns, types, arrays)
+    return _to_df(columns, arrays)
@@ -0,0 +1,110 @@
+"""
+Process-pool helpers for decoding SparkplugB DataSet payloads in parallel.
+
+Workers decode raw payloads and return DataFrames in a compact form (column
+names plus one NumPy array per column) that pickles cheaply. The parent process
+rebuilds the DataFrames without copying the column arrays.
+"""
+
+import collections
+import logging
+import os
+from collections.abc import Buffer
+from concurrent.futures import Executor, ProcessPoolExecutor
+from itertools import islice
+from typing import Iterable, Iterator, Optional
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+def _pack_frame(df: pd.DataFrame) -> tuple[list[str], list]:
+    return list(df.columns), [df[col].to_numpy() for col in df.columns]
+
+
+def _unpack_frame(packed: tuple[list[str], list]) -> pd.DataFrame:
+    columns, arrays = packed
+    return pd.DataFrame(dict(zip(columns, arrays)), columns=columns, copy=False)
+
+
+def _decode_chunk(parser, chunk: list[bytes]) -> list[tuple]:
+    """
+    Worker entry point: decode a chunk of raw payloads and extract their DataSets.
+    """
+    results = []
+    for data in chunk:
+        payload = parser.parse_bytes_to_protobuf(data)
+        dfs, properties = parser.parse_datasets_to_dfs(payload)
+        if dfs is None:
+            packed = None
+        elif isinstance(dfs, list):
+            packed = [_pack_frame(df) for df in dfs]
+        else:
+            packed = _pack_frame(dfs)
+        results.append((packed, properties))
+    return results
+
+
+def _unpack_result(result: tuple) -> tuple:
+    packed, properties = result
+    if packed is None:
+        return None, properties
+    if isinstance(packed, list):
+        return [_unpack_frame(p) for p in packed], properties
+    return _unpack_frame(packed), properties
+
+
+def _chunked(data: Iterable[Buffer], chunk_size: int) -> Iterator[list[bytes]]:
+    iterator = iter(data)
+    while chunk := [bytes(item) for item in islice(iterator, chunk_size)]:
+        yield chunk
+
+
+def iter_parse_datasets_parallel(
+    parser,
+    data: Iterable[Buffer],
+    chunk_size: int = 16,
+    max_workers: Optional[int] = None,
+    executor: Optional[Executor] = None,
+) -> Iterator[tuple]:
+    """
+    Decode raw SparkplugB payloads in a process pool and yield the result of
+    `parser.parse_datasets_to_dfs` for each one, in input order.
+
+    Args:
+        parser (SparkplugBParser): The parser used by the workers. It is pickled
+            once per chunk, so subclasses with custom behaviour are supported.
+        data (Iterable[Buffer]): Raw serialized payloads.
+        chunk_size (int): Number of payloads sent to a worker per task.
+            Defaults to 16.
+        max_workers (int, optional): Size of the process pool created when no
+            `executor` is given. With an `executor`, the number of its workers.
+            About two chunks per worker are in flight at a time, so `data` is
+            read only as results are consumed. Defaults to the number of CPUs.
+        executor (Executor, optional): An existing executor to submit work to.
+            It is not shut down afterwards. Defaults to None.
+
+    Yields:
+        tuple: `(dfs, properties)` for each payload, as returned by
+            `parse_datasets_to_dfs`.
+    """
+    if chunk_size < 1:
+        raise ValueError(f"chunk_size must be at least 1, got {chunk_size}.")
+    owns_executor = executor is None
+    if owns_executor:
+        executor = ProcessPoolExecutor(max_workers=max_workers)
+    try:
+        max_pending = 2 * (max_workers or os.cpu_count() or 1)
+        pending = collections.deque()
+        for chunk in _chunked(data, chunk_size):
+            pending.append(executor.submit(_decode_chunk, parser, chunk))
+            if len(pending) >= max_pending:
+                for result in pending.popleft().result():
+                    yield _unpack_result(result)
+        while pending:
+            for result in pending.popleft().result():
+                yield _unpack_result(result)
+    finally:
+        if owns_executor:
+            executor.shutdown(cancel_futures=True)
@@ -0,0 +1,345 @@
+"""
+Tracking of Sparkplug payload sequence numbers across many edge nodes.
+
+Every payload an edge node publishes after its NBIRTH carries a `seq` one
+greater than the previous one, wrapping from 255 to 0. `SequenceTracker`
+compares each received `seq` with the highest one seen from the node and
+classifies the message as in order, a gap (messages were lost), a duplicate
+or a late, reordered message. On a gap or reordering it can ask for a rebirth
+through a callback.
+
+Node state is held in NumPy arrays indexed by a dense node id rather than in
+per-node objects, and `update_batch` classifies a whole batch of messages with
+array operations.
+"""
+
+import logging
+from typing import Callable, Hashable, Iterable, NamedTuple, Optional, Sequence
+
+import numpy as np
+
+from .aliases import DeviceKey, parse_topic
+
+logger = logging.getLogger(__name__)
+
+SEQ_MODULUS = 256
+
+
+class SeqStatus:
+    """Classification of a received sequence number."""
+
+    OK = 0  # One greater than the previous one
+    BIRTH = 1  # NBIRTH, which restarts the sequence
+    FIRST = 2  # First message seen from the node, without a birth
+    GAP = 3  # Greater than expected: messages were lost
+    DUPLICATE = 4  # Equal to the previous one
+    REORDERED = 5  # Older than the previous one: arrived late
+
+
+class SeqStats(NamedTuple):
+    """
+    Counters of one edge node since it was first seen.
+
+    Attributes:
+        received (int): Messages received.
+        gaps (int): Messages that followed one or more lost messages.
+        missing (int): Messages lost, summed over all gaps.
+        duplicates (int): Messages repeating the previous sequence number.
+        reordered (int): Messages older than the previous one.
+        last_seq (int | None): Highest sequence number seen since the last
+            birth, or None before any message.
+        awaiting_rebirth (bool): Whether a rebirth was requested and the
+            node has not been born again since.
+    """
+
+    received: int
+    gaps: int
+    missing: int
+    duplicates: int
+    reordered: int
+    last_seq: Optional[int]
+    awaiting_rebirth: bool
+
+
+_COUNTERS = ("received", "gaps", "missing", "duplicates", "reordered")
+
+
+def _signed(delta):
+    """Map a difference of sequence numbers to the range [-128, 127]."""
+    return (delta + SEQ_MODULUS // 2) % SEQ_MODULUS - SEQ_MODULUS // 2
+
+
+class SequenceTracker:
+    """
+    Sequence state of many edge nodes. Nodes are identified by any hashable
+    key (usually a `DeviceKey` with no device) and assigned dense ids on first
+    use; the per-node state arrays are indexed by these ids.
+    """
+
+    def __init__(
+        self,
+        on_rebirth: Optional[Callable[[Hashable], None]] = None,
+        capacity: int = 1024,
+    ):
+        """
+        Args:
+            on_rebirth (Callable[[Hashable], None], optional): Called with the
+                node key on the first gap or reordering since the node's last
+                birth. Rebirths are not requested again until the node is born
+                again. Defaults to None.
+            capacity (int): Number of nodes to allocate state for up front;
+                arrays grow as needed. Defaults to 1024.
+        """
+        self.on_rebirth = on_rebirth
+        self._ids: dict[Hashable, int] = {}
+        self._keys: list[Hashable] = []
+        capacity = max(capacity, 1)
+        # Highest sequence number seen since the last birth, -1 before any
+        self._last = np.full(capacity, -1, dtype=np.int16)
+        self._awaiting = np.zeros(capacity, dtype=np.bool_)
+        self._counters = {name: np.zeros(capacity, np.uint64) for name in _COUNTERS}
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def _grow(self, size: int) -> None:
+        capacity = len(self._last)
+        if size <= capacity:
+            return
+        while capacity < size:
+            capacity *= 2
+        extra = capacity - len(self._last)
+        self._last = np.concatenate([self._last, np.full(extra, -1, np.int16)])
+        self._awaiting = np.concatenate([self._awaiting, np.zeros(extra, np.bool_)])
+        for name, values in self._counters.items():
+            self._counters[name] = np.concatenate([values, np.zeros(extra, np.uint64)])
+
+    def node_id(self, key: Hashable) -> int:
+        """
+        The id of node `key`, assigning the next free one on first use.
+        """
+        node = self._ids.get(key)
+        if node is None:
+            node = self._ids[key] = len(self._keys)
+            self._keys.append(key)
+            self._grow(node + 1)
+        return node
+
+    def node_ids(self, keys: Iterable[Hashable]) -> np.ndarray:
+        """The ids of many nodes, as an int64 array (see `node_id`)."""
+        node_id = self.node_id
+        return np.fromiter((node_id(key) for key in keys), dtype=np.int64)
+
+    def stats(self, key: Hashable) -> SeqStats:
+        """
+        The counters and state of node `key`.
+        """
+        node = self._ids.get(key)
+        if node is None:
+            return SeqStats(0, 0, 0, 0, 0, None, False)
+        last = int(self._last[node])
+        counters = [int(self._counters[name][node]) for name in _COUNTERS]
+        return SeqStats(
+            *counters, None if last < 0 else last, bool(self._awaiting[node])
+        )
+
+    def reset(self, key: Hashable) -> None:
+        """
+        Forget the sequence state of node `key` (e.g. after its NDEATH), so the
+        next message starts a new sequence. Counters are kept.
+        """
+        node = self._ids.get(key)
+        if node is not None:
+            self._last[node] = -1
+            self._awaiting[node] = False
+
+    def _request_rebirth(self, nodes: Iterable[int]) -> None:
+        for node in nodes:
+            key = self._keys[node]
+            logger.warning("Requesting rebirth of %s after a sequence error.", key)
+            if self.on_rebirth is not None:
+                self.on_rebirth(key)
+
+    def update(self, key: Hashable, seq: int, birth: bool = False) -> int:
+        """
+        Record one message of node `key`.
+
+        Args:
+            key (Hashable): The edge node that sent the message.
+            seq (int): The message's sequence number, 0 to 255.
+            birth (bool): Whether the message is the node's NBIRTH. Defaults
+                to False.
+
+        Returns:
+            int: The `SeqStatus` of the message.
+        """
+        node = self.node_id(key)
+        counters = self._counters
+        counters["received"][node] += 1
+        last = int(self._last[node])
+        if birth or last < 0:
+            self._last[node] = seq
+            if birth:
+                self._awaiting[node] = False
+                return SeqStatus.BIRTH
+            return SeqStatus.FIRST
+        delta = _signed(seq - last)
+        if delta == 1:
+            self._last[node] = seq
+            return SeqStatus.OK
+        if delta == 0:
+            counters["duplicates"][node] += 1
+            return SeqStatus.DUPLICATE
+        if delta > 1:
+            self._last[node] = seq
+            counters["gaps"][node] += 1
+            counters["missing"][node] += delta - 1
+            status = SeqStatus.GAP
+        else:
+            counters["reordered"][node] += 1
+            status = SeqStatus.REORDERED
+        if not self._awaiting[node]:
+            self._awaiting[node] = True
+            self._request_rebirth([node])
+        return status
+
+    def update_batch(
+        self,
+        nodes: Sequence,
+        seqs: Sequence[int],
+        births: Optional[Sequence[bool]] = None,
+    ) -> np.ndarray:
+        """
+        Record a batch of messages, in arrival order, as `update` would one by
+        one. The classification is vectorized: sequence numbers are unwrapped
+        per node and each compared with the highest one before it. Messages
+        128 or more behind or ahead of that are classified modulo 256, and may
+        differ from `update` in such extreme cases.
+
+        Args:
+            nodes (Sequence): The sending node of every message, as node keys
+                or as an integer array of ids from `node_ids`.
+            seqs (Sequence[int]): The sequence numbers, e.g. the `seq` of
+                `wire.decode_payload_header` for serialized payloads.
+            births (Sequence[bool], optional): Which messages are NBIRTHs.
+                Defaults to None (no births).
+
+        Returns:
+            np.ndarray: The `SeqStatus` of every message, in input order.
+        """
+        if isinstance(nodes, np.ndarray) and nodes.dtype.kind in "iu":
+            ids = nodes.astype(np.int64, copy=False)
+            if len(ids) and (ids.min() < 0 or ids.max() >= len(self._keys)):
+                msg = "Node ids must come from `node_id` or `node_ids`."
+                logger.error(msg)
+                raise ValueError(msg)
+        else:
+            ids = self.node_ids(nodes)
+        seqs = np.asarray(seqs, dtype=np.int64)
+        count = len(ids)
+        if len(seqs) != count or (births is not None and len(births) != count):
+            msg = "nodes, seqs and births must have the same length."
+            logger.error(msg)
+            raise ValueError(msg)
+        statuses = np.empty(count, dtype=np.uint8)
+        if not count:
+            return statuses
+
+        # Group messages by node, keeping arrival order within each node
+        order = np.argsort(ids, kind="stable")
+        node = ids[order]
+        seq = seqs[order]
+        birth = np.zeros(count, np.bool_) if births is None else np.asarray(births)
+        birth = birth[order]
+        first = np.ones(count, np.bool_)
+        first[1:] = node[1:] != node[:-1]
+        stored = self._last[node].astype(np.int64)
+        # Sequences restart at a node's first message in the batch and at births
+        start = first | birth
+        fresh = birth | (first & (stored < 0))
+
+        # Unwrap: each step is the signed difference from the previous message,
+        # the first message of a sequence continues from the stored state
+        step = np.empty(count, np.int64)
+        step[1:] = _signed(seq[1:] - seq[:-1])
+        continued = start & ~fresh
+        step[continued] = stored[continued] + _signed(seq - stored)[continued]
+        step[fresh] = seq[fresh]
+        total = np.cumsum(step)
+        start_index = np.maximum.accumulate(np.where(start, np.arange(count), 0))
+        unwrapped = total - total[start_index] + step[start_index]
+
+        # Highest unwrapped value up to each message, within its sequence and
+        # starting from the stored state; offsetting every sequence keeps one
+        # running maximum from crossing into the next
+        peak = unwrapped.copy()
+        peak[continued] = np.maximum(unwrapped, stored)[continued]
+        segment = np.cumsum(start)
+        offset = segment * (np.int64(1) << 40)
+        highest = np.maximum.accumulate(peak + offset) - offset
+        previous = np.empty(count, np.int64)
+        previous[1:] = highest[:-1]
+        previous[continued] = stored[continued]
+        delta = unwrapped - previous
+
+        status = np.full(count, SeqStatus.OK, np.uint8)
+        status[delta > 1] = SeqStatus.GAP
+        status[delta == 0] = SeqStatus.DUPLICATE
+        status[delta < 0] = SeqStatus.REORDERED
+        status[fresh] = SeqStatus.FIRST
+        status[birth] = SeqStatus.BIRTH
+        statuses[order] = status
+
+        # Counters and state
+        size = len(self._last)
+        counters = self._counters
+        gap = status == SeqStatus.GAP
+        counters["received"] += np.bincount(node, minlength=size).astype(np.uint64)
+        missing = np.bincount(node[gap], weights=delta[gap] - 1, minlength=size)
+        counters["missing"] += missing.astype(np.uint64)
+        for name, code in (
+            ("gaps", SeqStatus.GAP),
+            ("duplicates", SeqStatus.DUPLICATE),
+            ("reordered", SeqStatus.REORDERED),
+        ):
+            hits = node[status == code]
+            counters[name] += np.bincount(hits, minlength=size).astype(np.uint64)
+        last = np.ones(count, np.bool_)
+        last[:-1] = node[1:] != node[:-1]
+        self._last[node[last]] = highest[last] % SEQ_MODULUS
+
+        # Births clear pending rebirth requests. Errors after a node's last
+        # sequence start in the batch request one, unless one is pending.
+        self._awaiting[node[birth]] = False
+        group = np.cumsum(first) - 1
+        error = (status == SeqStatus.GAP) | (status == SeqStatus.REORDERED)
+        error &= segment == segment[last][group]
+        erring = np.unique(node[error])
+        request = erring[~self._awaiting[erring]]
+        self._awaiting[erring] = True
+        self._request_rebirth(request.tolist())
+        return statuses
+
+    def handle(self, topic: str, seq: Optional[int]) -> Optional[int]:
+        """
+        Record a message received on a Sparkplug B topic. Messages published
+        by an edge node or its devices update the node's sequence, NBIRTH
+        restarts it and NDEATH (which carries no `seq`) resets it. Commands
+        and host messages are ignored.
+
+        Args:
+            topic (str): The topic the message was received on.
+            seq (int | None): The payload's sequence number.
+
+        Returns:
+            int | None: The `SeqStatus` of the message, or None if it was not
+                tracked.
+        """
+        message_type, key = parse_topic(topic)
+        node = DeviceKey(key.group, key.edge_node)
+        if message_type == "NDEATH":
+            self.reset(node)
+            return None
+        if message_type in ("NCMD", "DCMD") or seq is None:
+            return None
+        return self.update(node, seq, birth=message_type == "NBIRTH")
@@ -1,11 +1,29 @@
 import logging
 import time
-from typing import Optional, Tuple, List, Union
+from collections.abc import Buffer
+from concurrent.futures import Executor
+from typing import (
+    Collection,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
 
+import numpy as np
 import pandas as pd
+from google.protobuf.descriptor_pool import DescriptorPool
 
 from . import sparkplug_b_pb2
+from .parallel import iter_parse_datasets_parallel
 from proto_parser import ProtobufParser
+from proto_parser.cache import LRUCache, freeze
+from proto_parser.profiling import instrumented
 
 logger = logging.getLogger(__name__)
 
@@ -162,6 +180,86 @@ property_value_field_map = {
 }
 
 
+def _metric_selected(
+    metric: sparkplug_b_pb2.Payload.Metric,
+    metrics: Optional[Collection[Union[str, int]]],
+) -> bool:
+    """
+    Whether the metric's name or alias is in `metrics`; always True if
+    `metrics` is None.
+    """
+    if metrics is None:
+        return True
+    return (metric.HasField("name") and metric.name in metrics) or (
+        metric.HasField("alias") and metric.alias in metrics
+    )
+
+
+def _column_selection(
+    metric: sparkplug_b_pb2.Payload.Metric,
+    columns: Optional[Mapping[Union[str, int], Sequence[str]]],
+) -> Optional[Sequence[str]]:
+    """
+    The columns selected for a DataSet metric by its name or alias, or None to
+    keep all columns.
+    """
+    if columns is None:
+        return None
+    if metric.HasField("name") and metric.name in columns:
+        return columns[metric.name]
+    if metric.HasField("alias") and metric.alias in columns:
+        return columns[metric.alias]
+    return None
+
+
+class DataSetChunk(NamedTuple):
+    """
+    A block of consecutive rows of a DataSet metric.
+
+    Attributes:
+        name (str | None): Name of the metric, if set.
+        alias (int | None): Alias of the metric, if set.
+        properties (dict): The metric's properties, shared by all its chunks.
+        start (int): Index of the chunk's first row within the DataSet.
+        columns (list[str]): The DataSet's column names.
+        data (pd.DataFrame | list[np.ndarray]): The rows, as a DataFrame or as
+            one typed array per column.
+    """
+
+    name: Optional[str]
+    alias: Optional[int]
+    properties: dict
+    start: int
+    columns: List[str]
+    data: Union[pd.DataFrame, list]
+
+
+class Waveform(NamedTuple):
+    """
+    The samples of a waveform Bytes metric, scaled and with their time axis.
+
+    Attributes:
+        name (str | None): Name of the metric, if set.
+        alias (int | None): Alias of the metric, if set.
+        timestamp (int | None): Acquisition timestamp of the metric, if set.
+        properties (dict): The metric's properties.
+        raw (np.ndarray): Read-only view of the samples in `bytes_value`, with
+            the byte order and width given by the properties.
+        values (np.ndarray): The samples scaled by `ch_gain` and `ch_offset`,
+            as float64.
+        time (np.ndarray): Time of every sample in seconds, from `time_zero`
+            at `acq_srate` samples per second.
+    """
+
+    name: Optional[str]
+    alias: Optional[int]
+    timestamp: Optional[int]
+    properties: dict
+    raw: np.ndarray
+    values: np.ndarray
+    time: np.ndarray
+
+
 # --------------------------------------------------------------------------
 # SparkplugB Parser Class
 # --------------------------------------------------------------------------
@@ -183,12 +281,160 @@ class SparkplugBParser(ProtobufParser[sparkplug_b_pb2.Payload]):
 
     message_type = sparkplug_b_pb2.Payload
 
+    # DataSet extractors keyed by schema (see `_dataset_extractor`). None
+    # disables caching; assign an LRUCache, per instance or class, to reuse
+    # extractors across DataSets of one schema.
+    dataset_schema_cache: Optional[LRUCache] = None
+
+    # Parsed metric properties keyed by their serialized PropertySet (see
+    # `_parse_metric_properties`). None disables caching; assign an LRUCache,
+    # per instance or class, to share immutable parsed properties.
+    property_cache: Optional[LRUCache] = None
+
+    def _count_metrics(self, message) -> Optional[int]:
+        if isinstance(message, sparkplug_b_pb2.Payload):
+            return len(message.metrics)
+        return None
+
+    # ----------------------------------------------------------------------
+    # Metric selection
+    # ----------------------------------------------------------------------
+
+    @instrumented(bytes_from="input")
+    def select_metrics(
+        self, data: Buffer, metrics: Collection[Union[str, int]]
+    ) -> bytes:
+        """
+        Copy a serialized Payload keeping only the metrics whose name or alias
+        is in `metrics`, working on the wire bytes: unselected metrics are
+        skipped over without being decoded (see `wire.select_metrics`).
+
+        Args:
+            data (Buffer): The serialized Payload.
+            metrics (Collection[str | int]): Names (str) and aliases (int) of the
+                metrics to keep.
+
+        Returns:
+            bytes: The serialized Payload with only the selected metrics.
+        """
+        from .wire import select_metrics
+
+        return select_metrics(data, metrics)
+
+    # The overrides below are not instrumented themselves: the base methods
+    # they call record the call.
+
+    def parse_bytes_to_dict(
+        self,
+        data: Buffer,
+        always_print_fields_with_no_presence: bool = False,
+        preserving_proto_field_name: bool = True,
+        use_integers_for_enums: bool = False,
+        descriptor_pool: Optional[DescriptorPool] = None,
+        float_precision: Optional[float] = None,
+        metrics: Optional[Collection[Union[str, int]]] = None,
+    ) -> dict | None:
+        """
+        See `ProtobufParser.parse_bytes_to_dict`. If `metrics` (names and
+        aliases) is given, only those metrics are decoded and converted; the
+        others are dropped from the wire bytes first (see `select_metrics`).
+        """
+        if metrics is not None:
+            data = self.select_metrics(data, metrics)
+        return super().parse_bytes_to_dict(
+            data,
+            always_print_fields_with_no_presence=always_print_fields_with_no_presence,
+            preserving_proto_field_name=preserving_proto_field_name,
+            use_integers_for_enums=use_integers_for_enums,
+            descriptor_pool=descriptor_pool,
+            float_precision=float_precision,
+        )
+
+    def parse_bytes_to_native_dict(
+        self,
+        data: Buffer,
+        always_print_fields_with_no_presence: bool = False,
+        preserving_proto_field_name: bool = True,
+        use_integers_for_enums: bool = False,
+        float_precision: Optional[int] = None,
+        metrics: Optional[Collection[Union[str, int]]] = None,
+    ) -> dict | None:
+        """
+        See `ProtobufParser.parse_bytes_to_native_dict`. If `metrics` (names
+        and aliases) is given, only those metrics are decoded and converted;
+        the others are dropped from the wire bytes first (see
+        `select_metrics`).
+        """
+        if metrics is not None:
+            data = self.select_metrics(data, metrics)
+        return super().parse_bytes_to_native_dict(
+            data,
+            always_print_fields_with_no_presence=always_print_fields_with_no_presence,
+            preserving_proto_field_name=preserving_proto_field_name,
+            use_integers_for_enums=use_integers_for_enums,
+            float_precision=float_precision,
+        )
+
+    # ----------------------------------------------------------------------
+    # Payload views
+    # ----------------------------------------------------------------------
+
+    def view(self, data: Union[sparkplug_b_pb2.Payload, Buffer]):
+        """
+        Wrap a Payload in a `view.PayloadView` for repeated metric lookups by
+        name or alias. Lookup indexes are built on first use, and properties
+        are parsed by this parser only for the metrics whose properties are
+        read.
+
+        Args:
+            data (sparkplug_b_pb2.Payload | Buffer): The Payload, as a message or
+                serialized.
+
+        Returns:
+            PayloadView: A view over the (decoded) Payload.
+        """
+        from .view import PayloadView
+
+        if not isinstance(data, sparkplug_b_pb2.Payload):
+            data = self.parse_bytes_to_protobuf(data)
+        return PayloadView(data, self)
+
+    # ----------------------------------------------------------------------
+    # Birth certificates and aliases
+    # ----------------------------------------------------------------------
+
+    @instrumented(bytes_from="input", payload_from="output")
+    def parse_message(
+        self, topic: str, data: Buffer, registry
+    ) -> Optional[sparkplug_b_pb2.Payload]:
+        """
+        Decode a message received on a Sparkplug B topic against an
+        `aliases.AliasRegistry`: births update the registry, deaths clear it,
+        and the aliased metrics of DATA payloads get their names and datatypes
+        from the sender's birth certificate.
+
+        Args:
+            topic (str): The topic, e.g. "spBv1.0/<group>/DDATA/<node>/<device>".
+            data (Buffer): The serialized Payload.
+            registry (AliasRegistry): The registry of birth certificates.
+
+        Returns:
+            sparkplug_b_pb2.Payload | None: The decoded Payload (resolved if it
+                is a DATA message), or None for a death.
+        """
+        return registry.handle(topic, self.parse_bytes_to_protobuf(data))
+
     # ----------------------------------------------------------------------
     # SparkplugB-specific DataSet handling
     # ----------------------------------------------------------------------
 
+    @instrumented(payload_from="input")
     def parse_datasets_to_dfs(
-        self, payload: sparkplug_b_pb2.Payload
+        self,
+        payload: sparkplug_b_pb2.Payload,
+        columnar: bool = False,
+        metrics: Optional[Collection[Union[str, int]]] = None,
+        columns: Optional[Mapping[Union[str, int], Sequence[str]]] = None,
     ) -> Union[Tuple[pd.DataFrame, dict], Tuple[List[pd.DataFrame], List[dict]]]:
         """
         Extract one or more DataSets from a SparkplugB Payload and convert them
@@ -197,6 +443,19 @@ class SparkplugBParser(ProtobufParser[sparkplug_b_pb2.Payload]):
         Args:
             payload (sparkplug_b_pb2.Payload): A SparkplugB Payload that may contain
                 one or more DataSet metrics.
+            columnar (bool): If True, fill each column straight into a NumPy array
+                whose dtype matches the column's Sparkplug type (Int8 -> int8,
+                Float -> float32, Boolean -> bool, ...; see
+                `columnar.dataset_dtype_map`) instead of converting cell by cell.
+                Signed integer columns are decoded from their two's complement
+                encoding. Defaults to False.
+            metrics (Collection[str | int], optional): Names (str) and aliases
+                (int) of the DataSet metrics to convert; other metrics are
+                skipped. Defaults to None, which converts all DataSets.
+            columns (Mapping[str | int, Sequence[str]], optional): Maps a DataSet
+                metric's name or alias to the names of the columns to convert,
+                in the order they should appear. DataSets not in the mapping
+                keep all their columns. Defaults to None.
 
         Returns:
             A tuple of either:
@@ -204,7 +463,12 @@ class SparkplugBParser(ProtobufParser[sparkplug_b_pb2.Payload]):
             or
               (list_of_dfs, list_of_properties_dicts)
 
-            If no DataSet metrics are found, returns (None, None).
+            If no (selected) DataSet metrics are found, returns (None, None).
+
+        If `dataset_schema_cache` is set, the column accessors and dtypes of
+        each DataSet schema (column names, types and selection) are resolved
+        once and cached there; `dataset_schema_cache.info()` reports its hits
+        and misses.
         """
         logger.debug("Converting Payload to DataFrames.")
         if not isinstance(payload, sparkplug_b_pb2.Payload):
@@ -212,7 +476,9 @@ class SparkplugBParser(ProtobufParser[sparkplug_b_pb2.Payload]):
 
         datasets, properties, metric_indexes = [], [], []
         for idx, metric in enumerate(payload.metrics):
-            if metric.datatype == MetricDataType.DataSet:
+            if metric.datatype == MetricDataType.DataSet and _metric_selected(
+                metric, metrics
+            ):
                 datasets.append(metric.dataset_value)
                 metric_indexes.append(idx)
                 properties.append(self._parse_metric_properties(metric))
@@ -223,38 +489,14 @@ class SparkplugBParser(ProtobufParser[sparkplug_b_pb2.Payload]):
 
         dfs = []
         for idx, dataset in zip(metric_indexes, datasets):
-            # Check columns and types
-            if len(dataset.columns) != len(dataset.types):
-                msg = "Mismatch in number of columns vs. types in the DataSet."
-                logger.error(msg)
-                raise ValueError(msg)
-
-            # Build Python lists for each row
-            field_names = [metric_value_field_map.get(t) for t in dataset.types]
-            py_types = [metric_python_type_map.get(t) for t in dataset.types]
-
-            data = [
-                [
-                    # Convert each element to the correct Python type (if not None)
-                    (
-                        py_type(getattr(element, field_name))
-                        if (py_type and field_name and hasattr(element, field_name))
-                        else getattr(element, field_name)
-                    )
-                    for element, field_name, py_type in zip(
-                        row.elements, field_names, py_types
-                    )
-                ]
-                for row in dataset.rows
-            ]
-
-            # Create the DataFrame
-            columns = [str(col) for col in dataset.columns]
-            df = pd.DataFrame(data, columns=columns)
-
             metric = payload.metrics[idx]
-            logger.info(
-                f"Extracted DataFrame from payload with shape {df.shape}",
+            selection = _column_selection(metric, columns)
+            extractor = self._dataset_extractor(dataset, selection)
+            df = extractor.to_df(dataset, columnar)
+
+            logger.debug(
+                "Extracted DataFrame from payload with shape %s",
+                df.shape,
                 extra={
                     "shape": df.shape,
                     "metric_name": getattr(metric, "name", None),
@@ -265,11 +507,445 @@ class SparkplugBParser(ProtobufParser[sparkplug_b_pb2.Payload]):
             dfs.append(df)
 
         # Return a single DataFrame if there's only one
-        logger.debug(f"Returning {len(dfs)} DataFrame(s) from the payload.")
+        logger.debug("Returning %d DataFrame(s) from the payload.", len(dfs))
         if len(dfs) == 1:
             return dfs[0], properties[0]
         return dfs, properties
 
+    def _dataset_extractor(
+        self,
+        dataset: sparkplug_b_pb2.Payload.DataSet,
+        selection: Optional[Sequence[str]] = None,
+    ):
+        """
+        Return the `columnar.DataSetExtractor` for the DataSet's schema and
+        column selection. With a `dataset_schema_cache`, it is built on the
+        first DataSet of that schema only.
+        """
+        from .columnar import DataSetExtractor
+
+        columns, types = tuple(dataset.columns), tuple(dataset.types)
+        cache = self.dataset_schema_cache
+        if cache is None:
+            return DataSetExtractor(columns, types, selection)
+        key = (columns, types, None if selection is None else tuple(selection))
+        return cache.get(key, lambda: DataSetExtractor(columns, types, selection))
+
+    @instrumented(payload_from="input")
+    def parse_datasets_to_arrow(self, payload: sparkplug_b_pb2.Payload):
+        """
+        Extract one or more DataSets from a SparkplugB Payload and convert them
+        to Apache Arrow tables. Requires the optional `pyarrow` dependency.
+
+        Column types follow the Sparkplug column types (Int8 -> int8, UInt64 ->
+        uint64, DateTime -> timestamp[ms], ...; see
+        `arrow.dataset_arrow_type_map`). Numeric columns are handed to Arrow
+        without copying. The metric's name, alias, timestamp and properties
+        (as JSON) are stored in the schema metadata, and each field's Sparkplug
+        type code in its field metadata.
+
+        Args:
+            payload (sparkplug_b_pb2.Payload): A SparkplugB Payload that may contain
+                one or more DataSet metrics.
+
+        Returns:
+            pyarrow.Table | list[pyarrow.Table] | None: A single table, a list of
+                tables if there are several DataSets, or None if there are none.
+        """
+        from .arrow import dataset_to_table, metric_metadata
+
+        logger.debug("Converting Payload to Arrow tables.")
+        if not isinstance(payload, sparkplug_b_pb2.Payload):
+            raise TypeError("Expected a sparkplug_b_pb2.Payload instance.")
+
+        tables = []
+        for metric in payload.metrics:
+            if metric.datatype != MetricDataType.DataSet:
+                continue
+            metadata = metric_metadata(metric, self._parse_metric_properties(metric))
+            table = dataset_to_table(metric.dataset_value, metadata)
+            logger.debug(
+                "Extracted Arrow table from payload with shape %s",
+                table.shape,
+                extra={
+                    "shape": table.shape,
+                    "metric_name": getattr(metric, "name", None),
+                    "alias": getattr(metric, "alias", None),
+                    "metric_ts": getattr(metric, "timestamp", None),
+                },
+            )
+            tables.append(table)
+
+        if not tables:
+            logger.warning("No DataSet metrics found in the Payload.")
+            return None
+        logger.debug("Returning %d Arrow table(s) from the payload.", len(tables))
+        if len(tables) == 1:
+            return tables[0]
+        return tables
+
+    def iter_dataset_chunks(
+        self,
+        data: Union[sparkplug_b_pb2.Payload, Buffer],
+        chunk_size: int = 10000,
+        as_arrays: bool = False,
+    ) -> Iterator[DataSetChunk]:
+        """
+        Lazily extract the DataSets of a Payload in chunks of at most
+        `chunk_size` rows, so very large DataSets can be streamed with bounded
+        memory. Columns have the same dtypes as in
+        `parse_datasets_to_dfs(columnar=True)`.
+
+        Given serialized bytes, the Payload message is not built at all: rows
+        are decoded straight from the wire bytes (see
+        `wire.iter_decode_dataset`), and only their offsets are held for the
+        whole DataSet.
+
+        Args:
+            data (sparkplug_b_pb2.Payload | Buffer): The Payload, as a message or
+                serialized.
+            chunk_size (int): Maximum number of rows per chunk. Defaults to 10000.
+            as_arrays (bool): If True, yield each chunk's rows as a list of NumPy
+                arrays (one per column) instead of a DataFrame. Defaults to False.
+
+        Yields:
+            DataSetChunk: The chunks of every DataSet metric, in order. DataSets
+                without rows yield nothing.
+        """
+        from .wire import _to_df
+
+        if chunk_size < 1:
+            raise ValueError(f"chunk_size must be at least 1, got {chunk_size}.")
+
+        for metric, chunks in self._iter_dataset_chunk_arrays(data, chunk_size):
+            name = metric.name if metric.HasField("name") else None
+            alias = metric.alias if metric.HasField("alias") else None
+            properties = self._parse_metric_properties(metric)
+            logger.debug(
+                "Streaming DataSet metric %s in chunks of %d.", name, chunk_size
+            )
+            for start, columns, arrays in chunks:
+                chunk = arrays if as_arrays else _to_df(columns, arrays)
+                yield DataSetChunk(name, alias, properties, start, columns, chunk)
+
+    def _iter_dataset_chunk_arrays(
+        self, data: Union[sparkplug_b_pb2.Payload, Buffer], chunk_size: int
+    ) -> Iterator[tuple]:
+        """
+        Yield `(metric, chunks)` for every DataSet metric, where `chunks` yields
+        `(start, columns, arrays)` per block of rows. For serialized input the
+        metric holds everything but the DataSet.
+        """
+        from .wire import iter_decode_dataset, iter_metrics
+
+        if isinstance(data, sparkplug_b_pb2.Payload):
+            for metric in data.metrics:
+                if metric.datatype != MetricDataType.DataSet:
+                    continue
+                dataset = metric.dataset_value
+                extractor = self._dataset_extractor(dataset)
+                columns, step = extractor.columns, chunk_size
+                yield metric, (
+                    (start, columns, extractor.to_arrays(dataset, start, start + step))
+                    for start in range(0, len(dataset.rows), step)
+                )
+            return
+
+        view = memoryview(data).cast("B")
+        for datatype, metric_bytes, dataset_range in iter_metrics(view):
+            if datatype != MetricDataType.DataSet:
+                continue
+            metric = sparkplug_b_pb2.Payload.Metric.FromString(metric_bytes)
+            start, end = dataset_range or (0, 0)
+            yield metric, iter_decode_dataset(view, start, end, chunk_size)
+
+    @instrumented()
+    def concat_datasets(
+        self,
+        data: Iterable[Union[sparkplug_b_pb2.Payload, Buffer]],
+        metric: Union[str, int],
+        payload_timestamp: bool = False,
+        metric_timestamp: bool = False,
+        seq: bool = False,
+        as_arrow: bool = False,
+    ):
+        """
+        Concatenate the rows of one DataSet metric, with the same columns and
+        types, across many payloads into a single DataFrame or Arrow table.
+
+        Unlike calling `parse_datasets_to_dfs` per payload and `pd.concat`, the
+        row counts are summed first and every column is allocated once and
+        filled in place (see `concat` module). Column dtypes are those of
+        `parse_datasets_to_dfs(columnar=True)`. Payloads without the metric
+        are skipped.
+
+        Args:
+            data (Iterable[sparkplug_b_pb2.Payload | Buffer]): The payloads, as
+                messages or serialized. Serialized payloads are decoded from
+                their wire bytes without building messages. All items are held
+                until the frame is built.
+            metric (str | int): Name (str) or alias (int) of the DataSet metric.
+            payload_timestamp (bool): If True, add a `payload_timestamp` column
+                with each row's Payload timestamp. Defaults to False.
+            metric_timestamp (bool): If True, add a `metric_timestamp` column
+                with each row's metric timestamp. Defaults to False.
+            seq (bool): If True, add a `seq` column with each row's Payload
+                sequence number. Defaults to False.
+            as_arrow (bool): If True, return a `pyarrow.Table` (requires the
+                optional `pyarrow` dependency). Defaults to False.
+
+        Returns:
+            pd.DataFrame | pyarrow.Table | None: The concatenated rows, or None
+                if no payload holds the metric. Timestamp columns hold
+                milliseconds (timestamp[ms] in Arrow).
+        """
+        from .concat import concat_datasets
+
+        return concat_datasets(
+            data,
+            metric,
+            payload_timestamp=payload_timestamp,
+            metric_timestamp=metric_timestamp,
+            seq=seq,
+            as_arrow=as_arrow,
+        )
+
+    @instrumented()
+    def concat_metrics(
+        self,
+        data: Iterable[Union[sparkplug_b_pb2.Payload, Buffer]],
+        metrics: Optional[Collection[Union[str, int]]] = None,
+        pivot: bool = False,
+    ) -> Optional[pd.DataFrame]:
+        """
+        Extract the scalar (numeric and Boolean) metrics of many payloads into
+        one long-format table with a row per metric value, or with `pivot`, a
+        wide table with a column per metric.
+
+        Metrics are read from the payloads' wire bytes into preallocated typed
+        arrays (see `timeseries` module), and values are converted to float64
+        in one step, so a day of telemetry converts without per-metric Python
+        objects. Values are read from whichever value field is set; signed
+        integers are decoded from their two's complement wire encoding, and
+        Int64 and UInt64 values beyond 2**53 lose precision. Null metrics of
+        scalar types are kept as NaN. String, Bytes, DataSet and Template
+        metrics are skipped (see `parse_datasets_to_dfs` for DataSets).
+
+        Metrics are identified by name, or by alias if they have no name;
+        resolve the names of DATA messages with an `AliasRegistry` first to
+        combine them with their births.
+
+        Args:
+            data (Iterable[sparkplug_b_pb2.Payload | Buffer]): The payloads, as
+                messages or serialized. All items are held until the table is
+                built.
+            metrics (Collection[str | int], optional): Names and aliases of the
+                metrics to extract. Defaults to None, which extracts all scalar
+                metrics.
+            pivot (bool): If True, return one row per distinct timestamp and one
+                column per metric, with NaN where a metric has no value at a
+                timestamp; if a metric has several values at one timestamp, the
+                last is kept. Defaults to False.
+
+        Returns:
+            pd.DataFrame | None: The long table, with columns `timestamp`
+                (int64 milliseconds: the metric timestamp, or the Payload
+                timestamp for metrics without one), `metric` (categorical name
+                or alias), `datatype` (the metric's `MetricDataType`, 0 if not
+                set) and `value` (float64), in payload and metric order; or the
+                wide table indexed by `timestamp`. None if no payload holds a
+                selected scalar metric.
+        """
+        from .timeseries import concat_metrics
+
+        return concat_metrics(data, metrics=metrics, pivot=pivot)
+
+    @instrumented()
+    def parse_bytes_to_dfs(
+        self,
+        data: Buffer,
+        metrics: Optional[Collection[Union[str, int]]] = None,
+        columns: Optional[Mapping[Union[str, int], Sequence[str]]] = None,
+    ) -> Union[Tuple[pd.DataFrame, dict], Tuple[List[pd.DataFrame], List[dict]]]:
+        """
+        Decode the DataSets of a serialized SparkplugB Payload straight from its
+        bytes into DataFrames, without building the Payload message. Equivalent
+        to `parse_datasets_to_dfs(parse_bytes_to_protobuf(data), columnar=True)`,
+        but each column is decoded for all rows at once from the wire bytes
+        (see `wire.decode_dataset`).
+
+        Args:
+            data (Buffer): The serialized Payload, as bytes or any buffer.
+            metrics (Collection[str | int], optional): Names and aliases of the
+                DataSet metrics to decode (see `parse_datasets_to_dfs`). The
+                DataSets of other metrics are skipped over without being read.
+            columns (Mapping[str | int, Sequence[str]], optional): Columns to
+                decode per DataSet metric (see `parse_datasets_to_dfs`). The
+                elements of other columns are skipped without decoding their
+                values.
+
+        Returns:
+            A tuple of either:
+              (single_df, single_properties_dict)
+            or
+              (list_of_dfs, list_of_properties_dicts)
+
+            If no (selected) DataSet metrics are found, returns (None, None).
+        """
+        from .wire import decode_dataset, iter_metrics
+
+        logger.debug("Decoding DataFrames from Payload bytes.")
+        view = memoryview(data).cast("B")
+        dfs, properties = [], []
+        for datatype, metric_bytes, dataset_range in iter_metrics(view):
+            if datatype != MetricDataType.DataSet:
+                continue
+            # The Metric without its DataSet is small; decode it with Protobuf so
+            # properties are parsed exactly as in `parse_datasets_to_dfs`.
+            metric = sparkplug_b_pb2.Payload.Metric.FromString(metric_bytes)
+            if not _metric_selected(metric, metrics):
+                continue
+            properties.append(self._parse_metric_properties(metric))
+            start, end = dataset_range or (0, 0)
+            df = decode_dataset(view, start, end, _column_selection(metric, columns))
+            logger.debug(
+                "Extracted DataFrame from payload with shape %s",
+                df.shape,
+                extra={
+                    "shape": df.shape,
+                    "metric_name": getattr(metric, "name", None),
+                    "alias": getattr(metric, "alias", None),
+                    "metric_ts": getattr(metric, "timestamp", None),
+                },
+            )
+            dfs.append(df)
+
+        if not dfs:
+            logger.warning("No DataSet metrics found in the Payload.")
+            return None, None
+
+        logger.debug("Returning %d DataFrame(s) from the payload.", len(dfs))
+        if len(dfs) == 1:
+            return dfs[0], properties[0]
+        return dfs, properties
+
+    @instrumented()
+    def parse_datasets_parallel(
+        self,
+        data: Iterable[Buffer],
+        chunk_size: int = 16,
+        max_workers: Optional[int] = None,
+        executor: Optional[Executor] = None,
+    ) -> list[tuple]:
+        """
+        Decode many raw SparkplugB payloads in a process pool and extract their
+        DataSets, as `parse_bytes_to_protobuf` followed by `parse_datasets_to_dfs`
+        would for each payload.
+
+        Args:
+            data (Iterable[Buffer]): Raw serialized payloads. Buffers other than
+                `bytes` are copied once to be sent to the workers.
+            chunk_size (int): Number of payloads sent to a worker per task.
+                Defaults to 16.
+            max_workers (int, optional): Size of the process pool created when no
+                `executor` is given, or the number of workers of `executor`, which
+                bounds the chunks in flight. Defaults to the number of CPUs.
+            executor (Executor, optional): An existing executor to reuse. It is
+                not shut down afterwards. Defaults to None.
+
+        Returns:
+            list[tuple]: One `(dfs, properties)` tuple per payload, in input order.
+        """
+        logger.debug("Decoding payloads in parallel.")
+        return list(
+            iter_parse_datasets_parallel(
+                self,
+                data,
+                chunk_size=chunk_size,
+                max_workers=max_workers,
+                executor=executor,
+            )
+        )
+
+    # ----------------------------------------------------------------------
+    # SparkplugB-specific waveform handling
+    # ----------------------------------------------------------------------
+
+    @instrumented()
+    def parse_waveforms(
+        self,
+        data: Union[sparkplug_b_pb2.Payload, Buffer],
+        metrics: Optional[Collection[Union[str, int]]] = None,
+        signed: bool = True,
+    ) -> List[Waveform]:
+        """
+        Decode every waveform Bytes metric of a Payload. A Bytes metric is a
+        waveform if its properties give the byte order, bit resolution and
+        sampling rate of its samples (see `waveform.REQUIRED_PROPERTIES`);
+        other Bytes metrics are skipped.
+
+        The samples are read with `np.frombuffer`, so given serialized bytes
+        they are viewed in place in `data` rather than copied out of a Payload
+        message first. Gain, offset and time axis are applied to whole arrays,
+        and channels with the same sample count, sampling rate and `time_zero`
+        share one read-only time array.
+
+        Args:
+            data (sparkplug_b_pb2.Payload | Buffer): The Payload, as a message or
+                serialized.
+            metrics (Collection[str | int], optional): Names and aliases of the
+                metrics to decode. Defaults to None, which decodes all
+                waveforms.
+            signed (bool): If True, samples are two's complement integers.
+                Defaults to True.
+
+        Returns:
+            List[Waveform]: One waveform per channel metric, in Payload order.
+        """
+        from .waveform import decode_waveform, is_waveform
+        from .wire import iter_metrics
+
+        if isinstance(data, sparkplug_b_pb2.Payload):
+            channels = [
+                (metric, metric.bytes_value)
+                for metric in data.metrics
+                if metric.HasField("bytes_value")
+            ]
+        else:
+            view = memoryview(data).cast("B")
+            channels = []
+            # Metrics are decoded without their bytes_value, which stays in `view`
+            for _, metric_bytes, value_range in iter_metrics(view, value_field=16):
+                if value_range is not None:
+                    metric = sparkplug_b_pb2.Payload.Metric.FromString(metric_bytes)
+                    channels.append((metric, view[slice(*value_range)]))
+
+        waveforms, time_axes = [], {}
+        for metric, samples in channels:
+            if not _metric_selected(metric, metrics):
+                continue
+            properties = self._parse_metric_properties(metric)
+            if not is_waveform(properties):
+                logger.debug("Skipping Bytes metric %s: not a waveform.", metric.name)
+                continue
+            raw, values, time = decode_waveform(
+                samples, properties, signed, time_axes
+            )
+            waveforms.append(
+                Waveform(
+                    metric.name if metric.HasField("name") else None,
+                    metric.alias if metric.HasField("alias") else None,
+                    metric.timestamp if metric.HasField("timestamp") else None,
+                    properties,
+                    raw,
+                    values,
+                    time,
+                )
+            )
+        logger.debug("Decoded %d waveform(s) from the payload.", len(waveforms))
+        return waveforms
+
+    @instrumented()
     def init_dataset_metric(
         self,
         payload: sparkplug_b_pb2.Payload,
@@ -307,11 +983,154 @@ class SparkplugBParser(ProtobufParser[sparkplug_b_pb2.Payload]):
         dataset.columns.extend(columns)
         dataset.types.extend(types)
         logger.debug(
-            f"Initialized DataSet metric: name={name}, alias={alias}, "
-            f"timestamp={metric.timestamp}, #columns={len(columns)}, #types={types}."
+            "Initialized DataSet metric: name=%s, alias=%s, timestamp=%s, "
+            "#columns=%d, #types=%s.",
+            name,
+            alias,
+            metric.timestamp,
+            len(columns),
+            types,
         )
         return dataset
 
+    @instrumented()
+    def dataframe_to_dataset_metric(
+        self,
+        payload: sparkplug_b_pb2.Payload,
+        df: pd.DataFrame,
+        name: Optional[str] = None,
+        types: Optional[list[int]] = None,
+        timestamp: Optional[int] = None,
+        alias: Optional[int] = None,
+    ) -> sparkplug_b_pb2.Payload.DataSet:
+        """
+        Add a DataSet metric holding the contents of a DataFrame to the Payload.
+
+        Args:
+            payload (sparkplug_b_pb2.Payload): The Payload to which the DataSet metric will be added.
+            df (pd.DataFrame): The data. Column names become the DataSet columns.
+            name (str | None): Metric name (optional).
+            types (list[int] | None): Sparkplug DataSet type code of each column.
+                Defaults to types inferred from the DataFrame dtypes (see
+                `columnar.infer_dataset_types`).
+            timestamp (int | None): Timestamp in milliseconds. Defaults to now.
+            alias (int | None): Alias for the metric. Defaults to None.
+
+        Returns:
+            sparkplug_b_pb2.Payload.DataSet: The newly created and filled DataSet.
+        """
+        if types is None:
+            from .columnar import infer_dataset_types
+
+            types = infer_dataset_types(df)
+        dataset = self.init_dataset_metric(
+            payload,
+            name,
+            types,
+            [str(col) for col in df.columns],
+            timestamp=timestamp,
+            alias=alias,
+        )
+        return self.add_dataframe_to_dataset(dataset, df)
+
+    @instrumented()
+    def dataframe_to_dataset_bytes(
+        self,
+        payload: Union[sparkplug_b_pb2.Payload, Buffer],
+        df: Union[pd.DataFrame, Mapping[str, object]],
+        name: Optional[str] = None,
+        types: Optional[list[int]] = None,
+        timestamp: Optional[int] = None,
+        alias: Optional[int] = None,
+    ) -> bytes:
+        """
+        Serialize the Payload with a DataSet metric holding the given columns
+        appended to it. Unlike `dataframe_to_dataset_metric`, the DataSet is
+        written straight to the wire bytes (see `wire.append_dataset_metric`),
+        so no DataSet or Row messages are built. Use it for large frames that
+        are published right away.
+
+        Args:
+            payload (sparkplug_b_pb2.Payload | Buffer): The Payload holding the
+                other metrics, as a message or already serialized. It is not
+                modified.
+            df (pd.DataFrame | Mapping[str, ArrayLike]): The data, as a
+                DataFrame or a mapping of column name to NumPy array, pandas
+                Series or list.
+            name (str | None): Metric name (optional).
+            types (list[int] | None): Sparkplug DataSet type code of each column.
+                Defaults to types inferred from the dtypes (see
+                `columnar.infer_dataset_types`).
+            timestamp (int | None): Timestamp in milliseconds. Defaults to now.
+            alias (int | None): Alias for the metric. Defaults to None.
+
+        Returns:
+            bytes: The serialized Payload including the new DataSet metric.
+        """
+        from .wire import append_dataset_metric
+
+        if not isinstance(df, pd.DataFrame):
+            df = pd.DataFrame(dict(df), copy=False)
+        if types is None:
+            from .columnar import infer_dataset_types
+
+            types = infer_dataset_types(df)
+        if len(df.columns) != len(types):
+            msg = f"DataFrame has {len(df.columns)} column(s) but {len(types)} type(s)."
+            logger.error(msg)
+            raise ValueError(msg)
+
+        metric = sparkplug_b_pb2.Payload.Metric()
+        if name is not None:
+            metric.name = name
+        if alias is not None:
+            metric.alias = alias
+        metric.timestamp = timestamp or int(round(time.time() * 1000))
+        metric.datatype = MetricDataType.DataSet
+        logger.debug(
+            "Encoding a DataFrame of shape %s as DataSet metric: name=%s, alias=%s.",
+            df.shape,
+            name,
+            alias,
+        )
+        columns = [df.iloc[:, i] for i in range(len(df.columns))]
+        names = [str(col) for col in df.columns]
+        return append_dataset_metric(payload, metric, names, types, columns)
+
+    @instrumented()
+    def add_dataframe_to_dataset(
+        self, dataset: sparkplug_b_pb2.Payload.DataSet, df: pd.DataFrame
+    ) -> sparkplug_b_pb2.Payload.DataSet:
+        """
+        Append the rows of a DataFrame to an existing DataSet. Unlike
+        `add_rows_to_dataset`, the rows are encoded column by column with NumPy
+        and merged into the DataSet in one step. Missing values (None, pd.NA)
+        are sent as empty DataSet values.
+
+        Args:
+            dataset (sparkplug_b_pb2.Payload.DataSet): The DataSet to which rows are appended.
+            df (pd.DataFrame): The rows to append. Its columns are matched to
+                the DataSet columns by position.
+
+        Returns:
+            sparkplug_b_pb2.Payload.DataSet: The same DataSet, now updated with new rows.
+        """
+        from .wire import encode_dataset_rows
+
+        logger.debug("Adding a DataFrame of shape %s to a DataSet.", df.shape)
+        if len(df.columns) != len(dataset.types):
+            msg = (
+                f"DataFrame has {len(df.columns)} column(s) but the DataSet "
+                f"has {len(dataset.types)}."
+            )
+            logger.error(msg)
+            raise ValueError(msg)
+        columns = [df.iloc[:, i] for i in range(len(df.columns))]
+        dataset.MergeFromString(encode_dataset_rows(columns, list(dataset.types)))
+        logger.debug("DataSet now has %d total row(s).", len(dataset.rows))
+        return dataset
+
+    @instrumented()
     def add_rows_to_dataset(
         self,
         dataset: sparkplug_b_pb2.Payload.DataSet,
@@ -340,9 +1159,9 @@ class SparkplugBParser(ProtobufParser[sparkplug_b_pb2.Payload]):
                     logger.error(msg)
                     raise ValueError(msg)
                 setattr(element_pb, field_name, value)
-            logger.debug(f"Added row {row_index} with {len(row)} element(s).")
+            logger.debug("Added row %d with %d element(s).", row_index, len(row))
 
-        logger.debug(f"DataSet now has {len(dataset.rows)} total row(s).")
+        logger.debug("DataSet now has %d total row(s).", len(dataset.rows))
         return dataset
     
     def parse_metric_properties_to_dict(self, metric: sparkplug_b_pb2.Payload.Metric) -> dict:
@@ -360,10 +1179,23 @@ class SparkplugBParser(ProtobufParser[sparkplug_b_pb2.Payload]):
         """
         Extract a Python dictionary of key-value pairs from a metric's 'properties' field.
         Returns an empty dict if the metric has no properties.
+
+        If `property_cache` is set, properties are looked up by their serialized
+        bytes, which is much cheaper than walking the PropertySet, and metrics
+        with identical properties share one parsed result. Shared results are
+        frozen (see `proto_parser.cache.freeze`): read-only dicts and lists that
+        compare equal to the uncached results.
         """
         if not metric.HasField("properties"):
             return {}
-        return self._parse_propertyset(metric.properties)
+        property_set = metric.properties
+        cache = self.property_cache
+        if cache is None:
+            return self._parse_propertyset(property_set)
+        return cache.get(
+            property_set.SerializeToString(),
+            lambda: freeze(self._parse_propertyset(property_set)),
+        )
 
     def _parse_propertyset(
         self, property_set: sparkplug_b_pb2.Payload.PropertySet
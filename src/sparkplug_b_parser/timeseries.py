@@ -0,0 +1,526 @@
+"""
+Extraction of the scalar metrics of many SparkplugB payloads into one
+long-format table.
+
+Every numeric or Boolean metric of every payload becomes one row of
+`(timestamp, metric, datatype, value)`. The metrics' fields are read into
+arrays preallocated for the total metric count, and the values of all rows are
+converted to float64 at once from the raw field values, so no Python object is
+kept per metric.
+
+Payloads are serialized and joined into one buffer, and decoded from their wire
+bytes without building Payload messages: the fields of all payloads, and then
+of all their metrics, are walked in lockstep, one field of every message per
+NumPy step. Payloads with a layout this does not handle are read from Payload
+messages instead, with the same result.
+"""
+
+import logging
+from collections.abc import Buffer
+from typing import Collection, Iterable, NamedTuple, Optional, Union
+
+import numpy as np
+import pandas as pd
+from google.protobuf.message import DecodeError
+
+from proto_parser.varint import decode_varint
+
+from . import sparkplug_b_pb2
+from .sparkplugb_parser import metric_value_field_map
+from .view import signed_type_bits_map
+from .wire import (
+    _WIRE_I32,
+    _WIRE_I64,
+    _WIRE_LEN,
+    _WIRE_VARINT,
+    _Irregular,
+    _decode_varints,
+    _gather,
+    iter_fields,
+)
+
+logger = logging.getLogger(__name__)
+
+# Maps from Metric value field -> field number, for every field of the oneof
+value_field_number_map = {
+    field.name: field.number
+    for field in sparkplug_b_pb2.Payload.Metric.DESCRIPTOR.oneofs_by_name[
+        "value"
+    ].fields
+}
+
+# Value fields read as scalars
+_INT, _LONG, _FLOAT, _DOUBLE, _BOOLEAN = (
+    value_field_number_map[name]
+    for name in (
+        "int_value",
+        "long_value",
+        "float_value",
+        "double_value",
+        "boolean_value",
+    )
+)
+_SCALAR_FIELDS = (_INT, _LONG, _FLOAT, _DOUBLE, _BOOLEAN)
+
+# Metric data types whose value field is a scalar; such metrics without a value
+# are kept as missing values
+SCALAR_TYPES = sorted(
+    datatype
+    for datatype, field in metric_value_field_map.items()
+    if value_field_number_map.get(field) in _SCALAR_FIELDS
+)
+
+
+def _wire_type_table(wire_types: dict[int, int]) -> np.ndarray:
+    """
+    Expected wire type by field number, -1 for fields that are skipped.
+    """
+    table = np.full(max(wire_types) + 2, -1, dtype=np.int64)
+    for number, wire_type in wire_types.items():
+        table[number] = wire_type
+    return table
+
+
+_PAYLOAD_WIRE_TYPES = _wire_type_table(
+    {1: _WIRE_VARINT, 2: _WIRE_LEN, 3: _WIRE_VARINT, 4: _WIRE_LEN, 5: _WIRE_LEN}
+)
+_METRIC_WIRE_TYPES = _wire_type_table(
+    {
+        1: _WIRE_LEN,  # name
+        2: _WIRE_VARINT,  # alias
+        3: _WIRE_VARINT,  # timestamp
+        4: _WIRE_VARINT,  # datatype
+        5: _WIRE_VARINT,  # is_historical
+        6: _WIRE_VARINT,  # is_transient
+        7: _WIRE_VARINT,  # is_null
+        8: _WIRE_LEN,  # metadata
+        9: _WIRE_LEN,  # properties
+        _INT: _WIRE_VARINT,
+        _LONG: _WIRE_VARINT,
+        _FLOAT: _WIRE_I32,
+        _DOUBLE: _WIRE_I64,
+        _BOOLEAN: _WIRE_VARINT,
+        **{number: _WIRE_LEN for number in range(_BOOLEAN + 1, 20)},
+    }
+)
+
+# Payloads walked together with NumPy; fewer remaining payloads (those with
+# many more metrics than the rest) are walked field by field in Python
+_MIN_LOCKSTEP_PAYLOADS = 32
+
+
+class _Fields(NamedTuple):
+    """
+    The raw fields of every metric. `keys` holds the `(name, alias)` of every
+    distinct metric and `codes` the index of each metric's key. `fields` is the
+    number of the value field set, 0 for none or a null metric; varint values
+    are in `ints` and floating-point values in `floats`.
+    """
+
+    keys: list[tuple[str, Optional[int]]]
+    codes: np.ndarray
+    timestamps: np.ndarray
+    payload_timestamps: np.ndarray
+    datatypes: np.ndarray
+    fields: np.ndarray
+    ints: np.ndarray
+    floats: np.ndarray
+
+
+def _field_values(buf: np.ndarray, pos: np.ndarray, wire_type: int) -> tuple:
+    """
+    Decode field values of one wire type at offsets `pos`, returning their
+    varint values (or lengths) and value offsets.
+    """
+    if wire_type == _WIRE_VARINT:
+        value, size = _decode_varints(buf, pos)
+        return value, pos, pos + size
+    if wire_type == _WIRE_LEN:
+        length, size = _decode_varints(buf, pos)
+        start = pos + size
+        return length, start, start + length.astype(np.int64)
+    if wire_type in (_WIRE_I64, _WIRE_I32):
+        width = 8 if wire_type == _WIRE_I64 else 4
+        return np.zeros(len(pos), dtype=np.uint64), pos, pos + width
+    raise _Irregular(f"Unsupported wire type {wire_type}.")
+
+
+def _next_fields(buf: np.ndarray, pos: np.ndarray, end: np.ndarray) -> tuple:
+    """
+    Decode the field at offset `pos` of every message, returning its number,
+    wire type, varint value (or length) and value offsets, as in `iter_fields`.
+    """
+    tag = buf[pos]
+    if tag.max() < 0x80:
+        # One-byte tags, i.e. fields 1 to 15
+        start = pos + 1
+    else:
+        tag, size = _decode_varints(buf, pos)
+        start = pos + size
+    number = (tag >> 3).astype(np.int64)
+    wire_type = (tag & 7).astype(np.int64)
+    if not number.all():
+        raise _Irregular("Invalid field number 0.")
+    first = int(wire_type[0])
+    if (wire_type == first).all():
+        value, start, stop = _field_values(buf, start, first)
+    else:
+        value = np.zeros(len(pos), dtype=np.uint64)
+        stop = np.empty(len(pos), dtype=np.int64)
+        for kind in np.flatnonzero(np.bincount(wire_type)).tolist():
+            match = wire_type == kind
+            value[match], start[match], stop[match] = _field_values(
+                buf, start[match], kind
+            )
+    if ((stop > end) | (stop < start)).any():
+        raise _Irregular("Truncated field.")
+    return number, wire_type, value, start, stop
+
+
+def _check_wire_types(table: np.ndarray, number, wire_type) -> None:
+    expected = table[np.minimum(number, len(table) - 1)]
+    if ((expected >= 0) & (expected != wire_type)).any():
+        raise _Irregular("Field of unexpected wire type.")
+
+
+def _factorize_bytes(
+    buf: np.ndarray, starts: np.ndarray, stops: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Factorize the byte strings at the given offsets without copying them out:
+    strings are grouped by length and then by each 8-byte word in turn. Returns
+    the code of every string, in order of first appearance, and the index of
+    the first string with each code. `buf` must extend 8 bytes past the last
+    string.
+    """
+    lengths = stops - starts
+    codes, _ = pd.factorize(lengths)
+    for offset in range(0, int(lengths.max(initial=0)), 8):
+        rows = np.flatnonzero(lengths > offset)
+        remaining = (lengths[rows] - offset).astype(np.uint64)
+        word = _gather(buf, starts[rows] + offset, 8, "<u8")
+        short = remaining < 8
+        mask = (np.uint64(1) << (remaining[short] * np.uint64(8))) - np.uint64(1)
+        word[short] &= mask
+        word_codes, words = pd.factorize(word)
+        refined, _ = pd.factorize(codes[rows] * len(words) + word_codes)
+        codes[rows] = refined + codes.max() + 1
+    codes, _ = pd.factorize(codes)
+    first = np.empty(codes.max(initial=-1) + 1, dtype=np.int64)
+    # Of repeated indexes, the last assignment is kept
+    first[codes[::-1]] = np.arange(len(codes) - 1, -1, -1)
+    return codes, first
+
+
+def _scan_payloads(
+    view: memoryview, buf: np.ndarray, starts: np.ndarray, ends: np.ndarray
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Locate the metrics of the payloads at the given offsets, returning the
+    offsets of their content, the index of their payload, in order, and the
+    timestamp of every payload.
+    """
+    timestamps = np.zeros(len(starts), dtype=np.uint64)
+    found = []
+    pos = starts.copy()
+    active = np.flatnonzero(pos < ends)
+    while len(active) >= _MIN_LOCKSTEP_PAYLOADS:
+        end = ends[active]
+        number, wire_type, value, start, stop = _next_fields(buf, pos[active], end)
+        _check_wire_types(_PAYLOAD_WIRE_TYPES, number, wire_type)
+        metric = number == 2
+        found.append((start[metric], stop[metric], active[metric]))
+        timestamp = number == 1
+        timestamps[active[timestamp]] = value[timestamp]
+        pos[active] = stop
+        active = active[stop < end]
+
+    try:
+        for index in active.tolist():
+            for number, wire_type, _, start, stop in iter_fields(
+                view, int(pos[index]), int(ends[index])
+            ):
+                _check_wire_types(_PAYLOAD_WIRE_TYPES, number, wire_type)
+                if number == 2:
+                    found.append(([start], [stop], [index]))
+                elif number == 1:
+                    timestamps[index] = decode_varint(view, start)[0]
+    except DecodeError as e:
+        raise _Irregular(str(e)) from e
+
+    if not found:
+        empty = np.zeros(0, dtype=np.int64)
+        return empty, empty, empty, timestamps
+    metric_starts, metric_stops, payloads = (
+        np.concatenate(parts).astype(np.int64) for parts in zip(*found)
+    )
+    order = np.argsort(metric_starts, kind="stable")
+    return metric_starts[order], metric_stops[order], payloads[order], timestamps
+
+
+def _wire_fields(items: list[Buffer]) -> _Fields:
+    """
+    Read the fields of every metric of serialized payloads from their joined
+    wire bytes, raising `_Irregular` for layouts this does not handle.
+    """
+    sizes = np.fromiter((memoryview(item).nbytes for item in items), np.int64)
+    payload_ends = np.cumsum(sizes)
+    # Padding lets 8-byte words be read up to the end of the last payload
+    raw = b"".join([*items, bytes(8)])
+    view = memoryview(raw)
+    buf = np.frombuffer(raw, dtype=np.uint8)
+    starts, ends, payloads, payload_timestamps = _scan_payloads(
+        view, buf, payload_ends - sizes, payload_ends
+    )
+
+    count = len(starts)
+    name_starts = np.zeros(count, dtype=np.int64)
+    name_stops = np.zeros(count, dtype=np.int64)
+    aliases = np.zeros(count, dtype=np.uint64)
+    has_alias = np.zeros(count, dtype=np.bool_)
+    timestamps = np.zeros(count, dtype=np.uint64)
+    datatypes = np.zeros(count, dtype=np.uint32)
+    is_null = np.zeros(count, dtype=np.bool_)
+    fields = np.zeros(count, dtype=np.uint8)
+    ints = np.zeros(count, dtype=np.uint64)
+    floats = np.zeros(count, dtype=np.float64)
+
+    varint_targets = {2: aliases, 3: timestamps, 4: datatypes, 7: is_null}
+    float_widths = {_FLOAT: (4, "<f4"), _DOUBLE: (8, "<f8")}
+    # Later occurrences of a field overwrite earlier ones, as in Protobuf
+    pos = starts.copy()
+    active = np.flatnonzero(pos < ends)
+    while len(active):
+        end = ends[active]
+        number, wire_type, value, start, stop = _next_fields(buf, pos[active], end)
+        _check_wire_types(_METRIC_WIRE_TYPES, number, wire_type)
+        # Metrics written by one encoder usually have the same field at each
+        # step, which is then assigned without selecting it first
+        if number[0] == number[-1] and (number == number[0]).all():
+            steps = [(int(number[0]), slice(None))]
+        else:
+            present = np.flatnonzero(np.bincount(np.minimum(number, 20)))
+            steps = [(field, number == field) for field in present.tolist()]
+        for field, match in steps:
+            index = active[match]
+            if field == 1:
+                name_starts[index] = start[match]
+                name_stops[index] = stop[match]
+            elif field in varint_targets:
+                varint_targets[field][index] = value[match]
+                if field == 2:
+                    has_alias[index] = True
+            elif _INT <= field < 20:
+                fields[index] = field
+                if field in float_widths:
+                    floats[index] = _gather(buf, start[match], *float_widths[field])
+                elif field in _SCALAR_FIELDS:
+                    ints[index] = value[match]
+        pos[active] = stop
+        active = active[stop < end]
+    fields[is_null] = 0
+
+    # Metrics are identified by their (name, alias) pair, factorized from the
+    # name bytes and the alias
+    name_codes, first = _factorize_bytes(buf, name_starts, name_stops)
+    try:
+        name_values = [
+            str(view[start:stop], "utf-8")
+            for start, stop in zip(
+                name_starts[first].tolist(), name_stops[first].tolist()
+            )
+        ]
+    except UnicodeDecodeError as e:
+        raise _Irregular(str(e)) from e
+    alias_codes, alias_values = pd.factorize(aliases)
+    alias_codes = np.where(has_alias, alias_codes + 1, 0)
+    pairs = name_codes.astype(np.int64) * (len(alias_values) + 1) + alias_codes
+    codes, unique_pairs = pd.factorize(pairs)
+    name_index, alias_index = np.divmod(unique_pairs, len(alias_values) + 1)
+    keys = [
+        (
+            name_values[n],
+            int(alias_values[a - 1]) if a else None,
+        )
+        for n, a in zip(name_index.tolist(), alias_index.tolist())
+    ]
+    return _Fields(
+        keys,
+        codes,
+        timestamps,
+        payload_timestamps[payloads],
+        datatypes,
+        fields,
+        ints,
+        floats,
+    )
+
+
+def _message_fields(payloads: list[sparkplug_b_pb2.Payload]) -> _Fields:
+    """
+    Read the fields of every metric from Payload messages.
+    """
+    count = sum(len(payload.metrics) for payload in payloads)
+    codes = np.zeros(count, dtype=np.int64)
+    timestamps = np.zeros(count, dtype=np.uint64)
+    payload_timestamps = np.zeros(count, dtype=np.uint64)
+    datatypes = np.zeros(count, dtype=np.uint32)
+    fields = np.zeros(count, dtype=np.uint8)
+    ints = np.zeros(count, dtype=np.uint64)
+    floats = np.zeros(count, dtype=np.float64)
+    key_codes: dict[tuple[str, Optional[int]], int] = {}
+    index = 0
+    for payload in payloads:
+        payload_timestamps[index : index + len(payload.metrics)] = payload.timestamp
+        for metric in payload.metrics:
+            alias = metric.alias if metric.HasField("alias") else None
+            codes[index] = key_codes.setdefault((metric.name, alias), len(key_codes))
+            timestamps[index] = metric.timestamp
+            datatypes[index] = metric.datatype
+            field = metric.WhichOneof("value")
+            if field is not None and not metric.is_null:
+                number = value_field_number_map[field]
+                fields[index] = number
+                if number in (_FLOAT, _DOUBLE):
+                    floats[index] = getattr(metric, field)
+                elif number in _SCALAR_FIELDS:
+                    ints[index] = getattr(metric, field)
+            index += 1
+    return _Fields(
+        list(key_codes),
+        codes,
+        timestamps,
+        payload_timestamps,
+        datatypes,
+        fields,
+        ints,
+        floats,
+    )
+
+
+def _values(
+    datatypes: np.ndarray, fields: np.ndarray, ints: np.ndarray, floats: np.ndarray
+) -> np.ndarray:
+    """
+    Convert the raw value fields to float64, decoding signed integers from the
+    two's complement in the low bits of their wire field (see
+    `view.signed_type_bits_map`). Metrics without a value are NaN.
+    """
+    values = np.full(len(fields), np.nan)
+    for field in (_FLOAT, _DOUBLE):
+        match = fields == field
+        values[match] = floats[match]
+    match = fields == _BOOLEAN
+    values[match] = ints[match] != 0
+    for field, wire_dtype in ((_INT, np.uint32), (_LONG, np.uint64)):
+        index = np.flatnonzero(fields == field)
+        raw = ints[index].astype(wire_dtype)
+        values[index] = raw
+        types = datatypes[index]
+        for datatype, bits in signed_type_bits_map.items():
+            # Casting to the narrower signed dtype keeps the low bits
+            signed = types == datatype
+            values[index[signed]] = raw[signed].astype(f"int{bits}")
+    return values
+
+
+def _pivot(
+    timestamps: np.ndarray, codes: np.ndarray, labels: list, values: np.ndarray
+) -> pd.DataFrame:
+    """
+    One row per distinct timestamp and one column per metric. Cells without a
+    value are NaN; of repeated values of a metric at one timestamp, the last
+    is kept.
+    """
+    times, rows = np.unique(timestamps, return_inverse=True)
+    cells = rows * len(labels) + codes
+    # The first of each cell in reverse order is the last one
+    unique_cells, first = np.unique(cells[::-1], return_index=True)
+    wide = np.full(len(times) * len(labels), np.nan)
+    wide[unique_cells] = values[len(cells) - 1 - first]
+    return pd.DataFrame(
+        wide.reshape(len(times), len(labels)),
+        index=pd.Index(times, name="timestamp"),
+        columns=pd.Index(labels, dtype=object, name="metric"),
+    )
+
+
+def concat_metrics(
+    data: Iterable[Union[sparkplug_b_pb2.Payload, Buffer]],
+    metrics: Optional[Collection[Union[str, int]]] = None,
+    pivot: bool = False,
+) -> Optional[pd.DataFrame]:
+    """
+    Extract the scalar metrics of many payloads into one table. See
+    `SparkplugBParser.concat_metrics`.
+    """
+    items = [
+        item.SerializeToString() if isinstance(item, sparkplug_b_pb2.Payload) else item
+        for item in data
+    ]
+    try:
+        fields = _wire_fields(items)
+    except _Irregular as e:
+        logger.debug("Reading metrics from Payload messages: %s", e)
+        fields = _message_fields(
+            [sparkplug_b_pb2.Payload.FromString(item) for item in items]
+        )
+
+    # Keep scalar metrics, and null metrics of scalar types, that are selected
+    # and have a name or an alias
+    labels = np.array(
+        [name or alias for name, alias in fields.keys], dtype=object
+    )
+    selected = np.array(
+        [
+            (name or alias) is not None
+            and (
+                metrics is None
+                or (name and name in metrics)
+                or (alias is not None and alias in metrics)
+            )
+            for name, alias in fields.keys
+        ],
+        dtype=np.bool_,
+    )
+    keep = np.isin(fields.fields, _SCALAR_FIELDS) | (
+        (fields.fields == 0) & np.isin(fields.datatypes, SCALAR_TYPES)
+    )
+    keep &= selected[fields.codes]
+    logger.debug(
+        "Extracted %d of %d metric(s) from %d payload(s).",
+        np.count_nonzero(keep),
+        len(keep),
+        len(items),
+    )
+    if not keep.any():
+        logger.warning("No scalar metrics found in the payloads.")
+        return None
+
+    # Metrics with the same label (e.g. a name declared with a new alias) share
+    # one code; codes are in order of first appearance
+    label_codes, label_values = pd.factorize(labels)
+    codes, used = pd.factorize(label_codes[fields.codes[keep]])
+    labels = label_values[used].tolist()
+    timestamps = fields.timestamps[keep]
+    timestamps = np.where(
+        timestamps != 0, timestamps, fields.payload_timestamps[keep]
+    ).astype(np.int64)
+    datatypes = fields.datatypes[keep]
+    values = _values(
+        datatypes, fields.fields[keep], fields.ints[keep], fields.floats[keep]
+    )
+
+    if pivot:
+        return _pivot(timestamps, codes, labels, values)
+    return pd.DataFrame(
+        {
+            "timestamp": timestamps,
+            "metric": pd.Categorical.from_codes(
+                codes, pd.Index(labels, dtype=object)
+            ),
+            "datatype": datatypes,
+            "value": values,
+        },
+        copy=False,
+    )
@@ -0,0 +1,204 @@
+"""
+Read-only views over decoded SparkplugB Payloads with lazy metric lookup.
+
+`PayloadView` finds metrics by name or alias through indexes that are built on
+the first lookup of each kind, so later lookups cost one dict access instead of
+a scan of `payload.metrics`. `MetricView` reads a metric's value from the field
+its datatype maps to and parses its properties only when they are first
+accessed; metrics that are never looked at are never touched.
+"""
+
+import logging
+from typing import Iterator, Optional, Union
+
+from . import sparkplug_b_pb2
+from .sparkplugb_parser import MetricDataType, SparkplugBParser, metric_value_field_map
+
+logger = logging.getLogger(__name__)
+
+# Maps from signed integer metric type -> bit width of the type. Values are read
+# from the low bits of their unsigned wire field, so Int8 0xFF and 0xFFFFFFFF
+# are both -1.
+signed_type_bits_map = {
+    MetricDataType.Int8: 8,
+    MetricDataType.Int16: 16,
+    MetricDataType.Int32: 32,
+    MetricDataType.Int64: 64,
+}
+
+_default_parser: Optional[SparkplugBParser] = None
+
+
+def _get_default_parser() -> SparkplugBParser:
+    global _default_parser
+    if _default_parser is None:
+        _default_parser = SparkplugBParser()
+    return _default_parser
+
+
+class MetricView:
+    """
+    A metric of a `PayloadView`, with typed value access and lazily parsed
+    properties.
+
+    Attributes:
+        metric (sparkplug_b_pb2.Payload.Metric): The underlying metric.
+    """
+
+    __slots__ = ("metric", "_parser", "_properties")
+
+    def __init__(
+        self,
+        metric: sparkplug_b_pb2.Payload.Metric,
+        parser: Optional[SparkplugBParser] = None,
+    ):
+        self.metric = metric
+        self._parser = parser
+        self._properties = None
+
+    def __repr__(self) -> str:
+        return f"MetricView(name={self.name!r}, alias={self.alias!r})"
+
+    @property
+    def name(self) -> Optional[str]:
+        return self.metric.name if self.metric.HasField("name") else None
+
+    @property
+    def alias(self) -> Optional[int]:
+        return self.metric.alias if self.metric.HasField("alias") else None
+
+    @property
+    def datatype(self) -> int:
+        return self.metric.datatype
+
+    @property
+    def timestamp(self) -> Optional[int]:
+        return self.metric.timestamp if self.metric.HasField("timestamp") else None
+
+    @property
+    def value(self):
+        """
+        The metric's value, read from the field its datatype maps to (see
+        `metric_value_field_map`), or from whichever value field is set if that
+        one is not. Signed integers are decoded from the two's complement in
+        the low bits of their wire field, as in columnar DataSet output. None
+        if the metric is null or has no value.
+        """
+        metric = self.metric
+        if metric.is_null:
+            return None
+        datatype = metric.datatype
+        field = metric_value_field_map.get(datatype)
+        if field is None or not metric.HasField(field):
+            field = metric.WhichOneof("value")
+            if field is None:
+                return None
+        value = getattr(metric, field)
+        bits = signed_type_bits_map.get(datatype)
+        if bits is not None and field in ("int_value", "long_value"):
+            value &= (1 << bits) - 1
+            if value >> (bits - 1):
+                value -= 1 << bits
+        return value
+
+    @property
+    def properties(self) -> dict:
+        """
+        The metric's properties as a dict, parsed on first access and kept.
+        """
+        if self._properties is None:
+            parser = self._parser or _get_default_parser()
+            self._properties = parser._parse_metric_properties(self.metric)
+        return self._properties
+
+
+class PayloadView:
+    """
+    A read-only view over a Payload for repeated metric lookups. Metrics are
+    looked up by name (str) or alias (int); the name and alias indexes are
+    each built on the first lookup of their kind. If a name or alias occurs
+    more than once, the first metric with it is found, as a scan would.
+
+    The view does not track changes to the Payload; create a new view after
+    modifying its metrics.
+    """
+
+    __slots__ = ("payload", "_parser", "_names", "_aliases", "_views")
+
+    def __init__(
+        self,
+        payload: sparkplug_b_pb2.Payload,
+        parser: Optional[SparkplugBParser] = None,
+    ):
+        """
+        Args:
+            payload (sparkplug_b_pb2.Payload): The Payload to view.
+            parser (SparkplugBParser, optional): Parser used to parse metric
+                properties. Defaults to a shared parser.
+        """
+        self.payload = payload
+        self._parser = parser
+        self._names: Optional[dict[str, int]] = None
+        self._aliases: Optional[dict[int, int]] = None
+        self._views: dict[int, MetricView] = {}
+
+    @property
+    def timestamp(self) -> Optional[int]:
+        payload = self.payload
+        return payload.timestamp if payload.HasField("timestamp") else None
+
+    @property
+    def seq(self) -> Optional[int]:
+        return self.payload.seq if self.payload.HasField("seq") else None
+
+    def __len__(self) -> int:
+        return len(self.payload.metrics)
+
+    def __iter__(self) -> Iterator[MetricView]:
+        return (self._view(index) for index in range(len(self.payload.metrics)))
+
+    def __contains__(self, key: Union[str, int]) -> bool:
+        return self._index(key) is not None
+
+    def __getitem__(self, key: Union[str, int]) -> MetricView:
+        index = self._index(key)
+        if index is None:
+            raise KeyError(key)
+        return self._view(index)
+
+    def get(self, key: Union[str, int], default=None) -> Optional[MetricView]:
+        """The metric with name or alias `key`, or `default`."""
+        index = self._index(key)
+        return default if index is None else self._view(index)
+
+    def value(self, key: Union[str, int], default=None):
+        """
+        The typed value of the metric with name or alias `key` (see
+        `MetricView.value`), or `default` if there is no such metric.
+        """
+        index = self._index(key)
+        return default if index is None else self._view(index).value
+
+    def _index(self, key: Union[str, int]) -> Optional[int]:
+        if isinstance(key, str):
+            if self._names is None:
+                self._names = self._build_index("name")
+            return self._names.get(key)
+        if self._aliases is None:
+            self._aliases = self._build_index("alias")
+        return self._aliases.get(key)
+
+    def _build_index(self, field: str) -> dict:
+        index = {}
+        for position, metric in enumerate(self.payload.metrics):
+            if metric.HasField(field):
+                index.setdefault(getattr(metric, field), position)
+        logger.debug("Indexed %d metric(s) by %s.", len(index), field)
+        return index
+
+    def _view(self, index: int) -> MetricView:
+        view = self._views.get(index)
+        if view is None:
+            view = MetricView(self.payload.metrics[index], self._parser)
+            self._views[index] = view
+        return view
@@ -0,0 +1,139 @@
+"""
+Decoding of digitizer waveforms published as Bytes metrics.
+
+A waveform metric carries its samples in `bytes_value` and describes them in
+its properties (see `example_payloads/byte.py`): the byte order and bit
+resolution of the samples, the channel gain and offset, the number of samples,
+and the sampling rate and start time of the acquisition. The samples are viewed
+in place with `np.frombuffer`, then scaled and given a time axis with whole-array
+NumPy operations. Channels acquired with the same settings share one read-only
+time axis.
+"""
+
+import logging
+from typing import Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Metric property keys describing a waveform
+PROPERTY_BYTE_ORDER = "wave_byte_order"  # 0: big-endian, 1: little-endian
+PROPERTY_BIT_RES = "acq_bit_res"
+PROPERTY_GAIN = "ch_gain"
+PROPERTY_OFFSET = "ch_offset"
+PROPERTY_TOTAL_SAMPLES = "acq_total_samples"
+PROPERTY_TIME_ZERO = "time_zero"  # seconds
+PROPERTY_SAMPLE_RATE = "acq_srate"  # samples per second
+
+# Properties without which the samples cannot be interpreted
+REQUIRED_PROPERTIES = (PROPERTY_BYTE_ORDER, PROPERTY_BIT_RES, PROPERTY_SAMPLE_RATE)
+
+# Maps from wave_byte_order property -> NumPy byte order character
+byte_order_map = {0: ">", 1: "<"}
+
+
+def is_waveform(properties: dict) -> bool:
+    """
+    Whether metric properties describe a waveform, i.e. hold every key of
+    `REQUIRED_PROPERTIES`.
+    """
+    return all(properties.get(key) is not None for key in REQUIRED_PROPERTIES)
+
+
+def sample_dtype(byte_order: int, bit_res: int, signed: bool = True) -> np.dtype:
+    """
+    The NumPy dtype of a waveform's samples. Resolutions that are not a whole
+    number of bytes (e.g. 12 bits) are stored in the next larger integer.
+
+    Args:
+        byte_order (int): The `wave_byte_order` property (0: big-endian,
+            1: little-endian).
+        bit_res (int): The `acq_bit_res` property, from 1 to 64.
+        signed (bool): If True, samples are two's complement integers.
+            Defaults to True.
+
+    Returns:
+        np.dtype: e.g. `>i2` for signed 16-bit big-endian samples.
+    """
+    order = byte_order_map.get(byte_order)
+    if order is None:
+        msg = f"Unsupported {PROPERTY_BYTE_ORDER}: {byte_order}"
+        logger.error(msg)
+        raise ValueError(msg)
+    if not 1 <= bit_res <= 64:
+        msg = f"Unsupported {PROPERTY_BIT_RES}: {bit_res}"
+        logger.error(msg)
+        raise ValueError(msg)
+    size = 1 << max(0, (bit_res - 1).bit_length() - 3)
+    return np.dtype(f"{order}{'i' if signed else 'u'}{size}")
+
+
+def time_axis(count: int, sample_rate: float, time_zero: float = 0.0) -> np.ndarray:
+    """
+    Time in seconds of `count` samples taken at `sample_rate` samples per
+    second from `time_zero`.
+    """
+    time = np.arange(count, dtype=np.float64)
+    time /= sample_rate
+    if time_zero:
+        time += time_zero
+    return time
+
+
+def decode_waveform(
+    data, properties: dict, signed: bool = True, time_axes: Optional[dict] = None
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Decode the samples of a waveform and build its time axis.
+
+    Args:
+        data (Buffer): The metric's `bytes_value`, or a view of it.
+        properties (dict): The metric's properties (see `REQUIRED_PROPERTIES`).
+            `ch_gain` and `ch_offset` default to 1 and 0, `time_zero` to 0,
+            and `acq_total_samples` to as many samples as `data` holds.
+        signed (bool): If True, samples are two's complement integers.
+            Defaults to True.
+        time_axes (dict, optional): Time axes already built, by sample count,
+            sampling rate and `time_zero`. The time axis is looked up and added
+            here, read-only, so waveforms decoded with the same dict share it.
+
+    Returns:
+        tuple: `(raw, values, time)`, where `raw` is a read-only view of the
+            samples in `data`, `values` is `raw * ch_gain + ch_offset` as
+            float64, and `time` is `time_zero + i / acq_srate` in seconds.
+    """
+    dtype = sample_dtype(
+        properties[PROPERTY_BYTE_ORDER], properties[PROPERTY_BIT_RES], signed
+    )
+    size = memoryview(data).nbytes
+    count = properties.get(PROPERTY_TOTAL_SAMPLES)
+    if count is None:
+        count = size // dtype.itemsize
+    if count * dtype.itemsize > size:
+        msg = (
+            f"Waveform has {size} byte(s), too few for {count} sample(s) "
+            f"of {dtype.itemsize} byte(s)."
+        )
+        logger.error(msg)
+        raise ValueError(msg)
+    raw = np.frombuffer(data, dtype=dtype, count=count)
+
+    # Scale while converting, in one pass over the samples
+    gain = properties.get(PROPERTY_GAIN)
+    if gain is None or gain == 1:
+        values = raw.astype(np.float64)
+    else:
+        values = np.multiply(raw, gain, dtype=np.float64)
+    offset = properties.get(PROPERTY_OFFSET)
+    if offset:
+        values += offset
+
+    key = (count, properties[PROPERTY_SAMPLE_RATE], properties.get(PROPERTY_TIME_ZERO))
+    time = None if time_axes is None else time_axes.get(key)
+    if time is None:
+        time = time_axis(*key[:2], key[2] or 0.0)
+        if time_axes is not None:
+            time.flags.writeable = False
+            time_axes[key] = time
+    return raw, values, time
@@ -0,0 +1,941 @@
+"""
+Vectorized Protobuf wire encoding and decoding of SparkplugB DataSet rows.
+
+A DataSet's rows are encoded column by column with NumPy: every column is
+turned into a padded byte matrix holding each row's `DataSetValue` element,
+plus the number of valid bytes per row. The matrices of all columns are stacked
+together with the row headers, and a single boolean-mask selection flattens
+them into the row-major wire bytes, so no Python code runs per row or per cell
+(except to UTF-8 encode string cells). String columns whose lengths vary too much
+to pad are not: their bytes are concatenated and scattered between the flattened
+fixed-width parts at computed row offsets. `encode_dataset`, `encode_dataset_metric`
+and `append_dataset_metric` add the DataSet header and the enclosing Metric and
+Payload fields around the rows, joining all parts with a single copy.
+
+Decoding works the other way round on serialized Payload bytes, without
+building a `DataSet` message: the row offsets are located (in one NumPy step if
+all rows have the same size), then each column is decoded for all rows at once
+by gathering the bytes at every row's current element offset. DataSets with a
+layout the vectorized path does not handle (missing or out-of-order elements,
+unknown fields) are decoded with Protobuf instead, so the result is always the
+same as `columnar.dataset_to_df`.
+
+Wire layout of the encoded rows:
+
+    rows (field 4, LEN) -> Row
+        elements (field 1, LEN) -> DataSetValue
+            int_value (1, varint) | long_value (2, varint) | float_value (3, I32)
+            | double_value (4, I64) | boolean_value (5, varint) | string_value (6, LEN)
+"""
+
+import logging
+from typing import Collection, Iterator, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+from google.protobuf.message import DecodeError
+
+from proto_parser.varint import decode_varint, encode_varint
+
+from . import sparkplug_b_pb2
+from .columnar import (
+    _to_dtype,
+    column_indexes,
+    dataset_dtype_map,
+    dataset_to_arrays,
+    dataset_to_df,
+)
+from .sparkplugb_parser import DataSetDataType
+
+logger = logging.getLogger(__name__)
+
+# Tag bytes: (field_number << 3) | wire_type
+_TAG_ROWS = 0x22  # DataSet.rows, field 4, LEN
+_TAG_ELEMENTS = 0x0A  # Row.elements, field 1, LEN
+_TAG_METRICS = b"\x12"  # Payload.metrics, field 2, LEN
+_TAG_DATASET_VALUE = b"\x8a\x01"  # Metric.dataset_value, field 17, LEN
+
+# Number of rows encoded at once when writing a complete DataSet. Bounds the
+# memory used by the encoder only together with the string padding limit below.
+_ROWS_PER_BLOCK = 1 << 15
+
+# Largest ratio of padded to actual size of a string column's byte matrix
+_MAX_STRING_PADDING = 4
+
+# Maps from Sparkplug DataSet column type -> DataSetValue field tag byte
+dataset_value_tag_map = {
+    DataSetDataType.Int8: 0x08,  # int_value, varint
+    DataSetDataType.Int16: 0x08,
+    DataSetDataType.Int32: 0x08,
+    DataSetDataType.UInt8: 0x08,
+    DataSetDataType.UInt16: 0x08,
+    DataSetDataType.UInt32: 0x08,
+    DataSetDataType.Int64: 0x10,  # long_value, varint
+    DataSetDataType.UInt64: 0x10,
+    DataSetDataType.DateTime: 0x10,
+    DataSetDataType.Float: 0x1D,  # float_value, fixed32
+    DataSetDataType.Double: 0x21,  # double_value, fixed64
+    DataSetDataType.Boolean: 0x28,  # boolean_value, varint
+    DataSetDataType.String: 0x32,  # string_value, LEN
+    DataSetDataType.Text: 0x32,
+}
+
+_INT32_TYPES = {
+    DataSetDataType.Int8,
+    DataSetDataType.Int16,
+    DataSetDataType.Int32,
+    DataSetDataType.UInt8,
+    DataSetDataType.UInt16,
+    DataSetDataType.UInt32,
+}
+_INT64_TYPES = {DataSetDataType.Int64, DataSetDataType.UInt64, DataSetDataType.DateTime}
+_STRING_TYPES = {DataSetDataType.String, DataSetDataType.Text}
+
+# A segment of every row's encoding: a byte matrix of shape (width, rows) and
+# the number of valid bytes per row, or None if all `width` bytes are valid.
+# Variable-length data (string cells) is instead held as a flat array of every
+# row's bytes, concatenated, with the number of bytes per row.
+_Segment = tuple[np.ndarray, Optional[np.ndarray]]
+
+
+def _constant(num_rows: int, byte: int) -> _Segment:
+    return np.full((1, num_rows), byte, dtype=np.uint8), None
+
+
+def _lengths(segment: _Segment, num_rows: int) -> np.ndarray:
+    matrix, lengths = segment
+    if lengths is None:
+        return np.full(num_rows, matrix.shape[0], dtype=np.int64)
+    return lengths
+
+
+def _total_length(segments: list[_Segment], num_rows: int) -> np.ndarray:
+    total = np.zeros(num_rows, dtype=np.int64)
+    for segment in segments:
+        total += _lengths(segment, num_rows)
+    return total
+
+
+def _varint(values: np.ndarray) -> _Segment:
+    """
+    Varint-encode an array of uint64 values.
+    """
+    values = np.asarray(values, dtype=np.uint64)
+    num_rows = len(values)
+    top = int(values.max()) if num_rows else 0
+    width = max(1, (top.bit_length() + 6) // 7)
+    if width == 1:
+        return values.astype(np.uint8)[None, :], None
+    matrix = np.empty((width, num_rows), dtype=np.uint8)
+    lengths = np.ones(num_rows, dtype=np.int64)
+    remaining = values.copy()
+    for i in range(width):
+        low = (remaining & np.uint64(0x7F)).astype(np.uint8)
+        remaining >>= np.uint64(7)
+        more = remaining != 0
+        matrix[i] = low | (more.astype(np.uint8) << 7)
+        lengths += more
+    return matrix, lengths
+
+
+def _fixed(values: np.ndarray, dtype: str) -> _Segment:
+    raw = np.ascontiguousarray(values, dtype=dtype)
+    return raw.view(np.uint8).reshape(len(raw), raw.itemsize).T, None
+
+
+def _strings(values: np.ndarray) -> list[_Segment]:
+    """
+    Encode string cells as their length prefixes and their bytes. The bytes are
+    padded to the longest cell only if that at most quadruples their size;
+    otherwise they are kept flat, so a single long string does not inflate
+    every row.
+    """
+    encoded = [str(value).encode("utf-8") for value in values]
+    num_rows = len(encoded)
+    lengths = np.fromiter(map(len, encoded), dtype=np.int64, count=num_rows)
+    prefix = _varint(lengths.astype(np.uint64))
+    width = max(1, int(lengths.max()) if num_rows else 1)
+    if width * num_rows > _MAX_STRING_PADDING * (int(lengths.sum()) + num_rows):
+        return [prefix, (np.frombuffer(b"".join(encoded), dtype=np.uint8), lengths)]
+    matrix = np.array(encoded, dtype=f"S{width}").view(np.uint8)
+    return [prefix, (matrix.reshape(num_rows, width).T, lengths)]
+
+
+def _column_values(values, type_code: int) -> tuple[np.ndarray, Optional[np.ndarray]]:
+    """
+    Return the column as a NumPy array ready for encoding, and a mask of
+    missing (NA) cells, or None if there are none. NaN in float columns is a
+    value, not a missing cell.
+    """
+    series = values if isinstance(values, pd.Series) else pd.Series(values)
+    dtype = series.dtype
+    missing = None
+    if isinstance(dtype, pd.api.extensions.ExtensionDtype) or dtype == object:
+        mask = series.isna().to_numpy(dtype=bool)
+        if mask.any():
+            missing = mask
+    if type_code in _STRING_TYPES:
+        array = series.to_numpy(dtype=object)
+        if missing is not None:
+            array = np.where(missing, "", array)
+        return array, missing
+    if type_code == DataSetDataType.DateTime and dtype.kind == "M":
+        series = series.astype("datetime64[ms]").astype(np.int64)
+    elif missing is not None:
+        series = series.fillna(0)
+    if type_code == DataSetDataType.Boolean:
+        return series.to_numpy(dtype=bool), missing
+    if type_code in (DataSetDataType.Float, DataSetDataType.Double):
+        return series.to_numpy(dtype=np.float64), missing
+    if type_code == DataSetDataType.UInt64:
+        return series.to_numpy(dtype=np.uint64), missing
+    return series.to_numpy(dtype=np.int64), missing
+
+
+def _encode_column(values, type_code: int) -> list[_Segment]:
+    """
+    Encode one column as the `elements` field of every row.
+    """
+    tag = dataset_value_tag_map.get(type_code)
+    if tag is None:
+        raise ValueError(f"Unsupported DataSet column type: {type_code}")
+    array, missing = _column_values(values, type_code)
+    num_rows = len(array)
+
+    if type_code in _INT32_TYPES:
+        # Signed values are sent as their 32-bit two's complement.
+        payload = [_varint(array.astype(np.int64) & 0xFFFFFFFF)]
+    elif type_code in _INT64_TYPES:
+        payload = [_varint(array.view(np.uint64))]
+    elif type_code == DataSetDataType.Float:
+        payload = [_fixed(array, "<f4")]
+    elif type_code == DataSetDataType.Double:
+        payload = [_fixed(array, "<f8")]
+    elif type_code == DataSetDataType.Boolean:
+        payload = [_fixed(array, "u1")]
+    else:
+        payload = _strings(array)
+
+    segments = [_constant(num_rows, tag)] + payload
+    if missing is not None:
+        # Missing cells are sent as empty DataSetValue messages.
+        segments = [
+            (segment[0], np.where(missing, 0, _lengths(segment, num_rows)))
+            for segment in segments
+        ]
+    element_length = _total_length(segments, num_rows)
+    return [_constant(num_rows, _TAG_ELEMENTS), _varint(element_length)] + segments
+
+
+def encode_dataset_rows(columns: Sequence, types: Sequence[int]) -> bytes:
+    """
+    Encode column data as the repeated `rows` field of a `Payload.DataSet`.
+
+    The result can be appended to an existing DataSet with
+    `dataset.MergeFromString(...)`, or concatenated to the serialized header
+    fields of a DataSet.
+
+    Args:
+        columns (Sequence): One array-like (NumPy array, pandas Series, list) per
+            column, all of the same length.
+        types (Sequence[int]): Sparkplug DataSet type code of each column.
+
+    Returns:
+        bytes: The wire bytes of the rows.
+    """
+    if len(columns) != len(types):
+        raise ValueError(
+            f"Got {len(columns)} column(s) but {len(types)} type(s)."
+        )
+    if not columns:
+        return b""
+    num_rows = len(columns[0])
+    if any(len(column) != num_rows for column in columns):
+        raise ValueError("All columns must have the same length.")
+    if not num_rows:
+        return b""
+
+    body = []
+    for values, type_code in zip(columns, types):
+        body.extend(_encode_column(values, type_code))
+    row_length = _total_length(body, num_rows)
+    segments = [_constant(num_rows, _TAG_ROWS), _varint(row_length)] + body
+
+    # Runs of fixed-width segments are flattened row by row; flat string data
+    # is then interleaved with them.
+    pieces = []
+    run = []
+    for segment in segments:
+        if segment[0].ndim == 2:
+            run.append(segment)
+            continue
+        if run:
+            pieces.append(_flatten(run, num_rows))
+            run = []
+        pieces.append(segment)
+    if run:
+        pieces.append(_flatten(run, num_rows))
+    if len(pieces) == 1:
+        return pieces[0][0].tobytes()
+    return _interleave(pieces, num_rows).tobytes()
+
+
+def _flatten(segments: list[_Segment], num_rows: int) -> _Segment:
+    """
+    Join fixed-width segments into a flat segment holding, row after row, the
+    valid bytes of every segment.
+    """
+    # Segments are stacked as (width, rows) so that each one is written with
+    # contiguous copies; the transposed views are then read row by row.
+    matrix = np.concatenate([matrix for matrix, _ in segments])
+    if all(lengths is None for _, lengths in segments):
+        return matrix.T.reshape(-1), np.full(num_rows, matrix.shape[0])
+    mask = np.concatenate(
+        [
+            np.ones(m.shape, dtype=bool)
+            if lengths is None
+            else np.arange(m.shape[0])[:, None] < lengths[None, :]
+            for m, lengths in segments
+        ]
+    )
+    return matrix.T[mask.T], _total_length(segments, num_rows)
+
+
+def _interleave(pieces: list[_Segment], num_rows: int) -> np.ndarray:
+    """
+    Join flat segments row by row: every row holds its bytes of each piece in
+    order. Bytes are scattered to their computed output offsets, so the memory
+    used is proportional to the encoded size.
+    """
+    row_length = _total_length(pieces, num_rows)
+    out = np.empty(int(row_length.sum()), dtype=np.uint8)
+    # Output offset of every row's next piece
+    cursor = np.cumsum(row_length) - row_length
+    for data, lengths in pieces:
+        source = np.cumsum(lengths) - lengths
+        index = np.repeat(cursor - source, lengths)
+        index += np.arange(len(data))
+        out[index] = data
+        cursor += lengths
+    return out
+
+
+def _dataset_chunks(
+    names: Sequence[str], types: Sequence[int], columns: Sequence
+) -> list[bytes]:
+    """
+    Encode a complete DataSet as a list of byte chunks, so callers can wrap it
+    in further messages and join everything with a single copy.
+    """
+    header = bytearray(b"\x08")  # num_of_columns, field 1, varint
+    header += encode_varint(len(types))
+    for name in names:
+        encoded = str(name).encode("utf-8")
+        header += b"\x12"  # columns, field 2, LEN
+        header += encode_varint(len(encoded))
+        header += encoded
+    for type_code in types:
+        header += b"\x18"  # types, field 3, varint (unpacked, as in proto2)
+        header += encode_varint(type_code)
+    chunks = [bytes(header)]
+    num_rows = len(columns[0]) if len(columns) else 0
+    # Rows are encoded in blocks so the intermediate arrays scale with the encoded
+    # size of a block, a few times over, rather than of the whole DataSet.
+    for start in range(0, num_rows, _ROWS_PER_BLOCK):
+        block = [values[start : start + _ROWS_PER_BLOCK] for values in columns]
+        chunks.append(encode_dataset_rows(block, types))
+    return chunks
+
+
+def _wrap(tag: bytes, chunks: list[bytes]) -> list[bytes]:
+    """
+    Prefix `chunks` with a LEN field tag and their total length.
+    """
+    return [tag, encode_varint(sum(map(len, chunks)))] + chunks
+
+
+def encode_dataset(
+    names: Sequence[str], types: Sequence[int], columns: Sequence
+) -> bytes:
+    """
+    Encode a complete `Payload.DataSet` (header and rows) from column data,
+    without building the message. The result is byte-identical to serializing
+    a DataSet filled with `add_rows_to_dataset`.
+
+    Args:
+        names (Sequence[str]): Column names.
+        types (Sequence[int]): Sparkplug DataSet type code of each column.
+        columns (Sequence): One array-like (NumPy array, pandas Series, list) per
+            column, all of the same length.
+
+    Returns:
+        bytes: The wire bytes of the DataSet.
+    """
+    if len(names) != len(types):
+        raise ValueError(f"Got {len(names)} column name(s) but {len(types)} type(s).")
+    return b"".join(_dataset_chunks(names, types, columns))
+
+
+def _metric_chunks(
+    metric: sparkplug_b_pb2.Payload.Metric,
+    names: Sequence[str],
+    types: Sequence[int],
+    columns: Sequence,
+) -> list[bytes]:
+    if metric.WhichOneof("value") is not None:
+        raise ValueError("The metric header must not hold a value.")
+    if len(names) != len(types):
+        raise ValueError(f"Got {len(names)} column name(s) but {len(types)} type(s).")
+    # dataset_value (17) is the highest field number a DataSet metric sets, so
+    # appending it keeps the fields in the order SerializeToString uses.
+    dataset = _wrap(_TAG_DATASET_VALUE, _dataset_chunks(names, types, columns))
+    return [metric.SerializeToString()] + dataset
+
+
+def encode_dataset_metric(
+    metric: sparkplug_b_pb2.Payload.Metric,
+    names: Sequence[str],
+    types: Sequence[int],
+    columns: Sequence,
+) -> bytes:
+    """
+    Encode a Metric whose `dataset_value` is built from column data. The other
+    fields (name, alias, timestamp, properties, ...) are taken from `metric`,
+    which must not hold a value itself.
+
+    Args:
+        metric (sparkplug_b_pb2.Payload.Metric): The metric's header fields.
+        names (Sequence[str]): Column names.
+        types (Sequence[int]): Sparkplug DataSet type code of each column.
+        columns (Sequence): One array-like per column, all of the same length.
+
+    Returns:
+        bytes: The wire bytes of the Metric.
+    """
+    return b"".join(_metric_chunks(metric, names, types, columns))
+
+
+def append_dataset_metric(
+    payload,
+    metric: sparkplug_b_pb2.Payload.Metric,
+    names: Sequence[str],
+    types: Sequence[int],
+    columns: Sequence,
+) -> bytes:
+    """
+    Serialize a Payload with a DataSet metric built from column data appended
+    after its existing metrics. The DataSet is written straight to the output
+    bytes, so no `DataSet.Row` messages are built and the rows are copied only
+    once.
+
+    Args:
+        payload (sparkplug_b_pb2.Payload | Buffer): The Payload, as a message or
+            already serialized.
+        metric (sparkplug_b_pb2.Payload.Metric): The new metric's header fields.
+        names (Sequence[str]): Column names.
+        types (Sequence[int]): Sparkplug DataSet type code of each column.
+        columns (Sequence): One array-like per column, all of the same length.
+
+    Returns:
+        bytes: The serialized Payload. It parses to the same message as adding
+            the metric to the Payload and serializing it, although fields
+            following `metrics` (e.g. `seq`) may come earlier on the wire.
+    """
+    if isinstance(payload, sparkplug_b_pb2.Payload):
+        payload = payload.SerializeToString()
+    chunks = _wrap(_TAG_METRICS, _metric_chunks(metric, names, types, columns))
+    return b"".join([payload] + chunks)
+
+
+# --------------------------------------------------------------------------
+# Decoding
+# --------------------------------------------------------------------------
+
+_WIRE_VARINT, _WIRE_I64, _WIRE_LEN, _WIRE_I32 = 0, 1, 2, 5
+
+# Maps from DataSetValue field tag byte -> wire type of the value
+_VALUE_WIRE_TYPES = {
+    0x08: _WIRE_VARINT,
+    0x10: _WIRE_VARINT,
+    0x1D: _WIRE_I32,
+    0x21: _WIRE_I64,
+    0x28: _WIRE_VARINT,
+    0x32: _WIRE_LEN,
+}
+
+# Minimum number of equally sized rows worth checking with NumPy at once
+_MIN_UNIFORM_ROWS = 64
+
+
+class _Irregular(Exception):
+    """
+    The DataSet does not have the layout the vectorized decoder handles, e.g. a
+    missing element, an element of an unexpected type or an unknown field.
+    """
+
+
+def iter_fields(view: memoryview, start: int, end: int) -> Iterator[tuple]:
+    """
+    Iterate over the fields of a serialized message.
+
+    Args:
+        view (memoryview): Buffer holding the message.
+        start (int): Offset of the message's first field.
+        end (int): Offset just past the message.
+
+    Yields:
+        tuple: `(field_number, wire_type, tag_start, value_start, value_end)`.
+            For LEN fields the value range excludes the length prefix.
+
+    Raises:
+        DecodeError: If the message is truncated or uses groups.
+    """
+    pos = start
+    while pos < end:
+        tag_start = pos
+        tag, pos = decode_varint(view, pos)
+        number, wire_type = tag >> 3, tag & 7
+        if wire_type == _WIRE_VARINT:
+            value_start = pos
+            _, pos = decode_varint(view, pos)
+        elif wire_type == _WIRE_LEN:
+            length, value_start = decode_varint(view, pos)
+            pos = value_start + length
+        elif wire_type == _WIRE_I64:
+            value_start, pos = pos, pos + 8
+        elif wire_type == _WIRE_I32:
+            value_start, pos = pos, pos + 4
+        else:
+            raise DecodeError(
+                f"Unsupported wire type {wire_type} at offset {tag_start}."
+            )
+        if pos > end:
+            raise DecodeError(f"Truncated field at offset {tag_start}.")
+        yield number, wire_type, tag_start, value_start, pos
+
+
+def iter_metrics(
+    view: memoryview, value_field: int = 17
+) -> Iterator[tuple[int, bytes, Optional[tuple]]]:
+    """
+    Iterate over the metrics of a serialized Payload without decoding their
+    DataSets.
+
+    Args:
+        view (memoryview): The serialized Payload.
+        value_field (int): Number of the Metric value field to leave undecoded.
+            Defaults to 17 (`dataset_value`); 16 is `bytes_value`.
+
+    Yields:
+        tuple: `(datatype, metric_bytes, dataset_range)`, where `metric_bytes`
+            is the serialized Metric without its `value_field`, and
+            `dataset_range` is the `(start, end)` offsets of that field's value
+            in `view`, or None if the metric has none.
+    """
+    for number, wire_type, _, start, end in iter_fields(view, 0, len(view)):
+        if number != 2 or wire_type != _WIRE_LEN:
+            continue
+        datatype = 0
+        dataset_range = None
+        other = bytearray()
+        for field, field_wire_type, tag_start, value_start, value_end in iter_fields(
+            view, start, end
+        ):
+            if field == value_field and field_wire_type == _WIRE_LEN:
+                dataset_range = (value_start, value_end)
+                continue
+            if field == 4 and field_wire_type == _WIRE_VARINT:
+                datatype = decode_varint(view, value_start)[0]
+            other += view[tag_start:value_end]
+        yield datatype, bytes(other), dataset_range
+
+
+def metric_key(view: memoryview, start: int, end: int) -> tuple:
+    """
+    Read the `name` and `alias` fields of a serialized Metric.
+
+    Args:
+        view (memoryview): Buffer holding the Metric.
+        start (int): Offset of the Metric's first field.
+        end (int): Offset just past the Metric.
+
+    Returns:
+        tuple[str | None, int | None]: The name and alias, or None for fields
+            that are not set.
+    """
+    name = alias = None
+    for number, wire_type, _, value_start, value_end in iter_fields(view, start, end):
+        if number == 1 and wire_type == _WIRE_LEN:
+            name = str(view[value_start:value_end], "utf-8")
+        elif number == 2 and wire_type == _WIRE_VARINT:
+            alias = decode_varint(view, value_start)[0]
+    return name, alias
+
+
+def select_metrics(data, metrics: Collection) -> bytes:
+    """
+    Copy a serialized Payload keeping only the metrics whose name or alias is
+    in `metrics`. Other metrics are skipped over without being decoded; the
+    Payload's other fields are kept as they are.
+
+    Args:
+        data (Buffer): The serialized Payload.
+        metrics (Collection[str | int]): Names (str) and aliases (int) of the
+            metrics to keep.
+
+    Returns:
+        bytes: The serialized Payload with only the selected metrics.
+    """
+    view = memoryview(data).cast("B")
+    chunks = []
+    for number, wire_type, tag_start, start, end in iter_fields(view, 0, len(view)):
+        if number == 2 and wire_type == _WIRE_LEN:
+            name, alias = metric_key(view, start, end)
+            if not (
+                (name is not None and name in metrics)
+                or (alias is not None and alias in metrics)
+            ):
+                continue
+        chunks.append(view[tag_start:end])
+    return b"".join(chunks)
+
+
+def decode_payload_header(view: memoryview) -> tuple[Optional[int], Optional[int]]:
+    """
+    Read the `timestamp` and `seq` fields of a serialized Payload, skipping
+    over its metrics.
+
+    Args:
+        view (memoryview): The serialized Payload.
+
+    Returns:
+        tuple[int | None, int | None]: The timestamp and sequence number, or
+            None for fields that are not set.
+    """
+    timestamp = seq = None
+    for number, wire_type, _, start, _ in iter_fields(view, 0, len(view)):
+        if wire_type != _WIRE_VARINT:
+            continue
+        if number == 1:
+            timestamp = decode_varint(view, start)[0]
+        elif number == 3:
+            seq = decode_varint(view, start)[0]
+    return timestamp, seq
+
+
+def _decode_varints(buf: np.ndarray, pos: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Decode one varint at each offset in `pos`, returning the values and their
+    sizes in bytes.
+    """
+    limit = len(buf)
+    if len(pos) and pos.max() >= limit:
+        raise _Irregular("Truncated varint.")
+    byte = buf[pos]
+    values = (byte & 0x7F).astype(np.uint64)
+    sizes = np.ones(len(pos), dtype=np.int64)
+    # Later bytes are only read for the varints that continue
+    index = np.flatnonzero(byte >= 0x80)
+    for i in range(1, 10):
+        if not len(index):
+            return values, sizes
+        at = pos[index] + i
+        if at.max() >= limit:
+            raise _Irregular("Truncated varint.")
+        byte = buf[at]
+        values[index] |= (byte & 0x7F).astype(np.uint64) << np.uint64(7 * i)
+        sizes[index] += 1
+        index = index[byte >= 0x80]
+    if len(index):
+        raise _Irregular("Varint is too long.")
+    return values, sizes
+
+
+def _gather(buf: np.ndarray, pos: np.ndarray, width: int, dtype: str) -> np.ndarray:
+    if len(pos) and pos.max() + width > len(buf):
+        raise _Irregular("Truncated value.")
+    index = pos[:, None] + np.arange(width)
+    return buf[index].view(dtype).ravel()
+
+
+def _scan_rows(
+    view: memoryview, buf: np.ndarray, pos: int, end: int, starts: list, stops: list
+) -> int:
+    """
+    Locate consecutive `rows` fields from `pos`, appending arrays of their
+    content offsets to `starts` and `stops`. Returns the offset after the last
+    row found.
+    """
+    # Rows of equal size are checked with NumPy: if each candidate position
+    # holds the same row header as the first row, the chain of rows is exact.
+    length, content = decode_varint(view, pos + 1)
+    stride = content - pos + length
+    count = (end - pos) // stride
+    if count >= _MIN_UNIFORM_ROWS:
+        header = buf[pos:content]
+        offsets = pos + stride * np.arange(count)
+        same = (buf[offsets[:, None] + np.arange(len(header))] == header).all(axis=1)
+        uniform = count if same.all() else int(np.argmin(same))
+        if uniform >= _MIN_UNIFORM_ROWS:
+            starts.append(offsets[:uniform] + (content - pos))
+            stops.append(starts[-1] + length)
+            return pos + uniform * stride
+
+    row_starts, row_stops = [], []
+    while pos < end and view[pos] == _TAG_ROWS:
+        length, content = decode_varint(view, pos + 1)
+        row_starts.append(content)
+        pos = content + length
+        row_stops.append(pos)
+    if pos > end:
+        raise DecodeError("Truncated DataSet row.")
+    starts.append(np.array(row_starts, dtype=np.int64))
+    stops.append(np.array(row_stops, dtype=np.int64))
+    return pos
+
+
+def _decode_column(
+    view: memoryview,
+    buf: np.ndarray,
+    pos: np.ndarray,
+    stops: np.ndarray,
+    type_code: int,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Decode the element at offset `pos` of every row as a value of `type_code`,
+    returning the values and the offsets of the next elements.
+    """
+    spec = dataset_dtype_map.get(type_code)
+    tag = dataset_value_tag_map.get(type_code)
+    if spec is None or tag is None:
+        raise _Irregular(f"Unsupported DataSet column type: {type_code}")
+    _, wire_dtype, dtype = spec
+    if len(pos) and (pos.max() >= len(buf) or (pos >= stops).any()):
+        raise _Irregular("Row has fewer elements than columns.")
+    if (buf[pos] != _TAG_ELEMENTS).any():
+        raise _Irregular("Unexpected field in row.")
+    element_length, size = _decode_varints(buf, pos + 1)
+    value_pos = pos + 1 + size
+    next_pos = value_pos + element_length.astype(np.int64)
+    if (buf[np.minimum(value_pos, len(buf) - 1)] != tag).any():
+        raise _Irregular("Element of unexpected type or empty element.")
+    value_pos += 1
+
+    wire_type = _VALUE_WIRE_TYPES[tag]
+    if wire_type == _WIRE_VARINT:
+        raw, size = _decode_varints(buf, value_pos)
+        value_end = value_pos + size
+        if wire_dtype == np.bool_:
+            raw = raw != 0
+        else:
+            raw = raw.astype(wire_dtype)
+    elif wire_type == _WIRE_I32:
+        raw = _gather(buf, value_pos, 4, "<f4")
+        value_end = value_pos + 4
+    elif wire_type == _WIRE_I64:
+        raw = _gather(buf, value_pos, 8, "<f8")
+        value_end = value_pos + 8
+    else:
+        string_length, size = _decode_varints(buf, value_pos)
+        value_pos += size
+        value_end = value_pos + string_length.astype(np.int64)
+        raw = np.empty(len(pos), dtype=object)
+        raw[:] = [
+            str(view[start:stop], "utf-8")
+            for start, stop in zip(value_pos.tolist(), value_end.tolist())
+        ]
+    if (value_end != next_pos).any():
+        raise _Irregular("Element with unexpected fields.")
+    return _to_dtype(raw, dtype), next_pos
+
+
+def _scan_dataset(view: memoryview, buf: np.ndarray, start: int, end: int) -> tuple:
+    """
+    Read the column names and types of a serialized DataSet and locate its
+    rows, returning `(columns, types, row_starts, row_stops)`.
+    """
+    columns, types, starts, stops = [], [], [], []
+    pos = start
+    while pos < end:
+        if view[pos] == _TAG_ROWS:
+            pos = _scan_rows(view, buf, pos, end, starts, stops)
+            continue
+        number, wire_type, _, value_start, value_end = next(iter_fields(view, pos, end))
+        if number == 2 and wire_type == _WIRE_LEN:
+            columns.append(str(view[value_start:value_end], "utf-8"))
+        elif number == 3 and wire_type == _WIRE_VARINT:
+            types.append(decode_varint(view, value_start)[0])
+        elif number == 3 and wire_type == _WIRE_LEN:
+            packed = value_start
+            while packed < value_end:
+                type_code, packed = decode_varint(view, packed)
+                types.append(type_code)
+        elif number not in (1, 3):
+            raise _Irregular(f"Unknown DataSet field {number}.")
+        pos = value_end
+
+    _check_columns(columns, types)
+    row_starts = np.concatenate(starts) if starts else np.zeros(0, dtype=np.int64)
+    row_stops = np.concatenate(stops) if stops else np.zeros(0, dtype=np.int64)
+    return columns, types, row_starts, row_stops
+
+
+def _check_columns(columns: Sequence, types: Sequence) -> None:
+    if len(columns) != len(types):
+        msg = "Mismatch in number of columns vs. types in the DataSet."
+        logger.error(msg)
+        raise ValueError(msg)
+
+
+def _skip_column(buf: np.ndarray, pos: np.ndarray, stops: np.ndarray) -> np.ndarray:
+    """
+    Return the offsets of the elements following the element at offset `pos`
+    of every row.
+    """
+    if len(pos) and (pos.max() >= len(buf) or (pos >= stops).any()):
+        raise _Irregular("Row has fewer elements than columns.")
+    if (buf[pos] != _TAG_ELEMENTS).any():
+        raise _Irregular("Unexpected field in row.")
+    element_length, size = _decode_varints(buf, pos + 1)
+    return pos + 1 + size + element_length.astype(np.int64)
+
+
+def _decode_regular_rows(
+    view: memoryview,
+    buf: np.ndarray,
+    types: list[int],
+    row_starts: np.ndarray,
+    row_stops: np.ndarray,
+    indexes: Optional[Sequence[int]] = None,
+) -> list[np.ndarray]:
+    """
+    Decode the rows at the given offsets into one array per column (or per
+    column in `indexes`), raising `_Irregular` for rows the vectorized path
+    does not handle. Elements of columns not in `indexes` are skipped without
+    decoding their values.
+    """
+    selected = None if indexes is None else set(indexes)
+    arrays = {}
+    pos = row_starts
+    for column, type_code in enumerate(types):
+        if selected is None or column in selected:
+            arrays[column], pos = _decode_column(view, buf, pos, row_stops, type_code)
+        else:
+            pos = _skip_column(buf, pos, row_stops)
+    if (pos != row_stops).any():
+        raise _Irregular("Row has more elements than columns.")
+    if indexes is None:
+        indexes = range(len(types))
+    return [arrays[column] for column in indexes]
+
+
+def _decode_rows(
+    view: memoryview,
+    buf: np.ndarray,
+    types: list[int],
+    row_starts: np.ndarray,
+    row_stops: np.ndarray,
+    indexes: Optional[Sequence[int]] = None,
+) -> list[np.ndarray]:
+    """
+    Decode the rows at the given offsets into one array per column (or per
+    column in `indexes`). Rows the vectorized path does not handle are decoded
+    with Protobuf instead.
+    """
+    try:
+        return _decode_regular_rows(view, buf, types, row_starts, row_stops, indexes)
+    except _Irregular as e:
+        logger.debug("Decoding DataSet rows with Protobuf: %s", e)
+    dataset = sparkplug_b_pb2.Payload.DataSet(types=types)
+    for start, stop in zip(row_starts.tolist(), row_stops.tolist()):
+        dataset.rows.add().MergeFromString(view[start:stop])
+    return dataset_to_arrays(dataset, columns=indexes)
+
+
+def _to_df(columns: list[str], arrays: list[np.ndarray]) -> pd.DataFrame:
+    df = pd.DataFrame(dict(enumerate(arrays)), copy=False)
+    df.columns = columns
+    return df
+
+
+def decode_dataset(
+    data,
+    start: int = 0,
+    end: Optional[int] = None,
+    columns: Optional[Sequence[str]] = None,
+) -> pd.DataFrame:
+    """
+    Decode a serialized DataSet into a DataFrame, with the same columns and
+    dtypes as `columnar.dataset_to_df`, without building a `DataSet` message.
+
+    Args:
+        data (Buffer): Buffer holding the serialized DataSet.
+        start (int): Offset of the DataSet in `data`. Defaults to 0.
+        end (int, optional): Offset just past the DataSet. Defaults to the end
+            of `data`.
+        columns (Sequence[str], optional): Names of the columns to decode, in
+            the order they should appear. The values of other columns are
+            skipped over without being decoded. Defaults to all columns.
+
+    Returns:
+        pd.DataFrame: One column per decoded DataSet column.
+    """
+    view = memoryview(data).cast("B")
+    end = len(view) if end is None else end
+    buf = np.frombuffer(view, dtype=np.uint8)
+    try:
+        names, types, row_starts, row_stops = _scan_dataset(view, buf, start, end)
+    except _Irregular as e:
+        logger.debug("Decoding DataSet with Protobuf: %s", e)
+        dataset = sparkplug_b_pb2.Payload.DataSet.FromString(view[start:end])
+        return dataset_to_df(dataset, columns)
+    indexes = None
+    if columns is not None:
+        indexes = column_indexes(names, columns)
+        names = list(columns)
+    arrays = _decode_rows(view, buf, types, row_starts, row_stops, indexes)
+    return _to_df(names, arrays)
+
+
+def iter_decode_dataset(
+    data, start: int = 0, end: Optional[int] = None, chunk_size: int = 10000
+) -> Iterator[tuple[int, list[str], list[np.ndarray]]]:
+    """
+    Decode a serialized DataSet in blocks of `chunk_size` rows. Only the
+    offsets of the rows are held for the whole DataSet, so memory use is
+    bounded by the chunk size rather than the size of the DataSet.
+
+    Args:
+        data (Buffer): Buffer holding the serialized DataSet.
+        start (int): Offset of the DataSet in `data`. Defaults to 0.
+        end (int, optional): Offset just past the DataSet. Defaults to the end
+            of `data`.
+        chunk_size (int): Maximum number of rows per chunk. Defaults to 10000.
+
+    Yields:
+        tuple[int, list[str], list[np.ndarray]]: The index of the chunk's first
+            row, the column names and one array per column (see
+            `columnar.dataset_dtype_map`). Nothing is yielded for a DataSet
+            without rows.
+    """
+    if chunk_size < 1:
+        raise ValueError(f"chunk_size must be at least 1, got {chunk_size}.")
+    view = memoryview(data).cast("B")
+    end = len(view) if end is None else end
+    buf = np.frombuffer(view, dtype=np.uint8)
+    try:
+        columns, types, row_starts, row_stops = _scan_dataset(view, buf, start, end)
+    except _Irregular as e:
+        logger.debug("Decoding DataSet with Protobuf: %s", e)
+        dataset = sparkplug_b_pb2.Payload.DataSet.FromString(view[start:end])
+        _check_columns(dataset.columns, dataset.types)
+        columns = [str(col) for col in dataset.columns]
+        for first in range(0, len(dataset.rows), chunk_size):
+            yield first, columns, dataset_to_arrays(dataset, first, first + chunk_size)
+        return
+    for first in range(0, len(row_starts), chunk_size):
+        last = first + chunk_size
+        arrays = _decode_rows(
+            view, buf, types, row_starts[first:last], row_stops[first:last]
+        )
+        yield first, columns, arrays
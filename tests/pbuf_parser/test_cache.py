@@ -0,0 +1,87 @@
+import pytest
+
+import copy
+import json
+import pickle
+
+from proto_parser import FrozenDict, FrozenList, LRUCache, freeze
+
+
+def test_lru_cache_hits_misses_and_evictions():
+    """
+    Values should be built once per key, and the least recently used key
+    dropped once the cache is full.
+    """
+    cache = LRUCache(maxsize=2)
+    built = []
+
+    def factory(key):
+        return lambda: built.append(key) or key.upper()
+
+    assert cache.get("a", factory("a")) == "A"
+    assert cache.get("b", factory("b")) == "B"
+    assert cache.get("a", factory("a")) == "A"  # "b" is now least recent
+    assert cache.get("c", factory("c")) == "C"
+    assert cache.get("b", factory("b")) == "B"
+    assert built == ["a", "b", "c", "b"]
+    info = cache.info()
+    assert (info.hits, info.misses, info.evictions) == (1, 4, 2)
+    assert (info.maxsize, info.currsize) == (2, len(cache)) == (2, 2)
+    assert info.hit_rate == 0.2
+
+    cache.clear()
+    assert cache.info() == (0, 0, 0, 2, 0)
+
+
+def test_lru_cache_factory_error_is_not_cached():
+    """
+    A failing factory should propagate its error and leave nothing cached.
+    """
+    cache = LRUCache()
+    with pytest.raises(ValueError):
+        cache.get("key", lambda: int("x"))
+    assert len(cache) == 0
+    assert cache.get("key", lambda: 1) == 1
+
+
+def test_lru_cache_pickles_empty():
+    """
+    A pickled cache should unpickle as an empty cache of the same size.
+    """
+    cache = LRUCache(maxsize=3)
+    cache.get("a", lambda: 1)
+    restored = pickle.loads(pickle.dumps(cache))
+    assert restored.info() == (0, 0, 0, 3, 0)
+    assert restored.get("a", lambda: 2) == 2
+    assert cache.get("a", lambda: 3) == 1
+
+
+def test_lru_cache_rejects_empty_size():
+    with pytest.raises(ValueError):
+        LRUCache(maxsize=0)
+
+
+def test_freeze_nested_values():
+    """
+    Frozen values should equal the originals, reject changes at every level
+    and still serialize and copy like plain containers.
+    """
+    value = {"units": "V", "gain": {"ch1": 1000}, "ranges": [{"max": 5}, 3]}
+    frozen = freeze(value)
+    assert frozen == value
+    assert isinstance(frozen["gain"], FrozenDict)
+    assert isinstance(frozen["ranges"], FrozenList)
+    for change in (
+        lambda: frozen.update(units="A"),
+        lambda: frozen["gain"].pop("ch1"),
+        lambda: frozen["ranges"].append(4),
+        lambda: frozen["ranges"][0].__setitem__("max", 1),
+    ):
+        with pytest.raises(TypeError):
+            change()
+    assert json.loads(json.dumps(frozen)) == value
+    assert pickle.loads(pickle.dumps(frozen)) == frozen
+    assert copy.deepcopy(frozen) == frozen
+    mutable = copy.copy(frozen)
+    mutable["units"] = "A"
+    assert frozen["units"] == "V"
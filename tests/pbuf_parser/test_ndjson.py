@@ -0,0 +1,83 @@
+import io
+import json
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+from google.protobuf.struct_pb2 import Struct
+
+from proto_parser import (
+    DelimitedReader,
+    ProtobufParser,
+    convert_ndjson_to_delimited,
+    iter_parse_ndjson,
+)
+
+
+class StructParser(ProtobufParser[Struct]):
+    message_type = Struct
+
+
+@pytest.fixture
+def parser():
+    return StructParser()
+
+
+@pytest.fixture
+def records():
+    return [
+        {"name": f"item{i}", "count": i, "nested": {"ok": i % 2 == 0}}
+        for i in range(25)
+    ]
+
+
+@pytest.fixture
+def ndjson_bytes(records):
+    lines = [json.dumps(record) for record in records]
+    lines.insert(3, "")  # blank lines are skipped but still counted
+    return ("\n".join(lines) + "\n").encode()
+
+
+def test_iter_parse_ndjson(parser, records, ndjson_bytes):
+    """
+    Every non-blank line is converted, regardless of read and batch boundaries.
+    """
+    results = list(
+        iter_parse_ndjson(parser, io.BytesIO(ndjson_bytes), batch_size=4, read_size=7)
+    )
+    assert len(results) == len(records)
+    assert all(result.ok for result in results)
+    assert [result.index for result in results[2:5]] == [2, 4, 5]
+    expected = [parser.parse_dict_to_protobuf(record) for record in records]
+    assert [result.message for result in results] == expected
+
+
+def test_iter_parse_ndjson_errors(parser):
+    """
+    Invalid lines are reported through ParseResult.error.
+    """
+    source = io.BytesIO(b'{"a": 1}\nnot json\n[1, 2]\n{"b": 2}')
+    results = list(iter_parse_ndjson(parser, source))
+    assert [result.ok for result in results] == [True, False, False, True]
+    assert results[3].message.fields["b"].number_value == 2
+
+
+def test_convert_ndjson_to_delimited(parser, records, ndjson_bytes, tmp_path):
+    """
+    Converting with workers writes the same records, in order, as in-process.
+    """
+    source = tmp_path / "export.ndjson"
+    source.write_bytes(ndjson_bytes + b"oops\n")
+    destination = tmp_path / "export.pbd"
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        written, failed = convert_ndjson_to_delimited(
+            parser,
+            source,
+            destination,
+            batch_size=3,
+            max_workers=2,
+            executor=executor,
+        )
+    assert (written, failed) == (len(records), 1)
+    with DelimitedReader(destination, parser) as reader:
+        messages = list(reader)
+    assert messages == [parser.parse_dict_to_protobuf(record) for record in records]
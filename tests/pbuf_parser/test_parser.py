@@ -128,3 +128,97 @@ def test_parse_protobuf_to_bytes_invalid_type(parser):
 
     result = parser.parse_protobuf_to_bytes(FakeMessage())  # Not a Struct
     assert result is None
+
+
+def test_parse_many(parser, serialized_bytes):
+    """
+    parse_many should decode every item in order and report failures per item.
+    """
+    results = parser.parse_many([serialized_bytes, b"\xff\xff", serialized_bytes])
+    assert [r.index for r in results] == [0, 1, 2]
+    assert [r.ok for r in results] == [True, False, True]
+    assert results[1].message is None
+    assert results[1].error is not None
+    assert results[0].message.fields["name"].string_value == "test"
+    assert results[0].message is not results[2].message
+
+
+def test_parse_many_recycle(parser, serialized_bytes):
+    """
+    Messages passed through `recycle` should be cleared and reused.
+    """
+    first = parser.parse_many([serialized_bytes])
+    recycled = first[0].message
+    second = parser.parse_many([serialized_bytes], recycle=[recycled])
+    assert second[0].message is recycled
+    assert second[0].message.fields["count"].number_value == 42
+
+
+def test_iter_parse_many_reuse(parser, serialized_bytes):
+    """
+    iter_parse_many with reuse_message=True should yield the same instance.
+    """
+    messages = []
+    for result in parser.iter_parse_many(
+        [serialized_bytes, serialized_bytes], reuse_message=True
+    ):
+        assert result.ok
+        assert "nested" in result.message.fields
+        messages.append(result.message)
+    assert messages[0] is messages[1]
+
+
+def test_parse_bytes_to_native_dict(parser, serialized_bytes, example_dict):
+    """
+    Well-known types such as Struct should convert like parse_bytes_to_dict.
+    """
+    native = parser.parse_bytes_to_native_dict(serialized_bytes)
+    assert native == parser.parse_bytes_to_dict(serialized_bytes)
+    assert native["nested"]["values"] == [1, 2, 3]
+
+
+def test_parse_dict_to_bytes_compiled(parser, example_dict):
+    """
+    The compiled builder should produce the same bytes as ParseDict.
+    """
+    expected = parser.parse_dict_to_bytes(example_dict)
+    assert parser.parse_dict_to_bytes(example_dict, compiled=True) == expected
+
+
+@pytest.mark.parametrize(
+    "wrap",
+    [bytearray, memoryview, lambda b: memoryview(b"\x00" + b)[1:]],
+    ids=["bytearray", "memoryview", "memoryview_slice"],
+)
+def test_parse_buffer_inputs(parser, serialized_bytes, wrap):
+    """
+    Any buffer-protocol object should decode like the equivalent bytes.
+    """
+    expected = parser.parse_bytes_to_protobuf(serialized_bytes)
+    assert parser.parse_bytes_to_protobuf(wrap(serialized_bytes)) == expected
+    results = parser.parse_many([wrap(serialized_bytes)])
+    assert results[0].message == expected
+
+
+def test_parse_mmap_input(parser, serialized_bytes, tmp_path):
+    """
+    Memory-mapped files, which ParseFromString rejects directly, are accepted.
+    """
+    import mmap
+
+    path = tmp_path / "message.bin"
+    path.write_bytes(serialized_bytes)
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+        struct_obj = parser.parse_bytes_to_protobuf(m)
+    assert struct_obj == parser.parse_bytes_to_protobuf(serialized_bytes)
+
+
+def test_parse_json_buffer(parser, example_dict):
+    """
+    parse_json_to_protobuf should accept UTF-8 encoded buffers.
+    """
+    import json
+
+    encoded = json.dumps(example_dict).encode()
+    expected = parser.parse_json_to_protobuf(encoded.decode())
+    assert parser.parse_json_to_protobuf(memoryview(encoded)) == expected
@@ -0,0 +1,83 @@
+import pytest
+from google.protobuf.struct_pb2 import Struct
+
+from proto_parser import DelimitedReader, DelimitedWriter, ProtobufParser
+
+
+class StructParser(ProtobufParser[Struct]):
+    message_type = Struct
+
+
+@pytest.fixture
+def parser():
+    return StructParser()
+
+
+@pytest.fixture
+def messages(parser):
+    return [parser.parse_dict_to_protobuf({"idx": i, "name": f"m{i}"}) for i in range(5)]
+
+
+@pytest.mark.parametrize("write_index", [True, False])
+def test_round_trip(tmp_path, parser, messages, write_index):
+    """
+    Records written by DelimitedWriter should read back in order, with or
+    without the footer index.
+    """
+    path = tmp_path / "records.pbd"
+    with DelimitedWriter(path, buffer_size=16, write_index=write_index) as writer:
+        writer.extend(messages)
+        writer.append(messages[0].SerializeToString())
+    with DelimitedReader(path, parser) as reader:
+        assert reader.has_index is write_index
+        assert len(reader) == 6
+        decoded = list(reader)
+        assert [m.fields["idx"].number_value for m in decoded] == [0, 1, 2, 3, 4, 0]
+        assert bytes(reader[3]) == messages[3].SerializeToString()
+
+
+def test_records_are_memoryviews(tmp_path, messages):
+    """
+    Raw records should be exposed without copying.
+    """
+    path = tmp_path / "records.pbd"
+    with DelimitedWriter(path) as writer:
+        writer.extend(messages)
+    with DelimitedReader(path) as reader:
+        records = list(reader.iter_records())
+        assert all(isinstance(r, memoryview) for r in records)
+        assert [bytes(r) for r in records] == [m.SerializeToString() for m in messages]
+        del records
+
+
+def test_empty_file(tmp_path, parser):
+    """
+    An empty stream (with or without an index) should contain no records.
+    """
+    path = tmp_path / "empty.pbd"
+    with DelimitedWriter(path, write_index=False):
+        pass
+    with DelimitedReader(path, parser) as reader:
+        assert len(reader) == 0
+        assert list(reader) == []
+
+
+@pytest.mark.parametrize("write_index", [True, False])
+def test_stream_after_header(tmp_path, parser, messages, write_index):
+    """
+    Records written to a file after a header should be indexed by their absolute
+    offsets, and read back with the start position if there is no index.
+    """
+    path = tmp_path / "records.pbd"
+    with open(path, "wb") as file:
+        file.write(b"HEADER01")
+        with DelimitedWriter(file, write_index=write_index) as writer:
+            writer.extend(messages)
+    start = 0 if write_index else 8
+    with DelimitedReader(path, parser, start=start) as reader:
+        assert reader.has_index is write_index
+        assert reader.offsets[0] == 8
+        assert [bytes(reader[i]) for i in range(5)] == [
+            m.SerializeToString() for m in messages
+        ]
+        assert [m.fields["idx"].number_value for m in reader] == [0, 1, 2, 3, 4]
@@ -0,0 +1,91 @@
+import pytest
+import sparkplug_b_parser as spt
+from sparkplug_b_parser.aliases import AliasTable, parse_topic
+
+
+def birth_payload(parser, aliases):
+    return parser.parse_dict_to_protobuf(
+        {
+            "timestamp": 1,
+            "metrics": [
+                {
+                    "name": f"metric_{alias}",
+                    "alias": alias,
+                    "datatype": spt.MetricDataType.Double,
+                    "double_value": 0.0,
+                }
+                for alias in aliases
+            ],
+        }
+    )
+
+
+def data_bytes(parser, aliases):
+    return parser.parse_dict_to_bytes(
+        {
+            "timestamp": 2,
+            "metrics": [{"alias": alias, "double_value": 1.5} for alias in aliases],
+        }
+    )
+
+
+def test_parse_message_resolves_aliases(parser):
+    # Ensure that DATA metrics get the names and datatypes of the birth
+    registry = spt.AliasRegistry()
+    birth = parser.parse_protobuf_to_bytes(birth_payload(parser, range(4)))
+    parser.parse_message("spBv1.0/plant/DBIRTH/edge1/axuv", birth, registry)
+    assert spt.DeviceKey("plant", "edge1", "axuv") in registry
+
+    payload = parser.parse_message(
+        "spBv1.0/plant/DDATA/edge1/axuv", data_bytes(parser, [3, 0]), registry
+    )
+    assert [m.name for m in payload.metrics] == ["metric_3", "metric_0"]
+    assert all(m.datatype == spt.MetricDataType.Double for m in payload.metrics)
+    assert payload.metrics[0].double_value == 1.5
+
+    with pytest.raises(KeyError):
+        parser.parse_message(
+            "spBv1.0/plant/DDATA/edge1/other", data_bytes(parser, [0]), registry
+        )
+
+
+def test_rebirth_and_death_invalidate(parser):
+    # Ensure that births replace tables and node births and deaths drop devices
+    registry = spt.AliasRegistry()
+    node = spt.DeviceKey("plant", "edge1")
+    device = spt.DeviceKey("plant", "edge1", "axuv")
+    registry.register_birth(node, birth_payload(parser, [0, 1]))
+    registry.register_birth(device, birth_payload(parser, [10, 11]))
+    registry.register_birth(("plant", "edge2", "axuv"), birth_payload(parser, [0]))
+
+    registry.register_birth(device, birth_payload(parser, [20]))
+    assert registry.table(device).lookup(20) == ("metric_20", 10)
+    assert registry.table(device).lookup(10) is None
+
+    registry.register_birth(node, birth_payload(parser, [0]))
+    assert device not in registry and node in registry
+    registry.register_birth(device, birth_payload(parser, [20]))
+    parser.parse_message("spBv1.0/plant/NDEATH/edge1", b"", registry)
+    assert list(registry) == [("plant", "edge2", "axuv")]
+    registry.handle("spBv1.0/plant/DDEATH/edge2/axuv", spt.Payload())
+    assert len(registry) == 0
+
+
+@pytest.mark.parametrize("aliases", [[5, 6, 7], [9, 2, 1000]])
+def test_alias_table_lookup(aliases):
+    # Ensure that dense and sparse alias ranges resolve alike
+    table = AliasTable([(alias, f"m{alias}", 3) for alias in aliases])
+    assert len(table) == 3
+    for alias in aliases:
+        assert table.lookup(alias) == (f"m{alias}", 3)
+    for alias in (0, 4, 8, 1001):
+        assert table.lookup(alias) is None
+    with pytest.raises(ValueError):
+        AliasTable([(1, "a", 3), (1, "b", 3)])
+
+
+def test_parse_topic():
+    assert parse_topic("spBv1.0/g/NDATA/n") == ("NDATA", ("g", "n", None))
+    assert parse_topic("spBv1.0/g/DBIRTH/n/d") == ("DBIRTH", ("g", "n", "d"))
+    with pytest.raises(ValueError):
+        parse_topic("spBv1.0/STATE/host")
@@ -0,0 +1,55 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+import sparkplug_b_parser as spt
+
+pa = pytest.importorskip("pyarrow")
+
+
+def test_parse_datasets_to_arrow(example_message_dataset, parser):
+    # Ensure that the table matches the columnar DataFrame and keeps properties
+    payload = parser.parse_bytes_to_protobuf(example_message_dataset)
+    expected, properties = parser.parse_datasets_to_dfs(payload, columnar=True)
+    table = parser.parse_datasets_to_arrow(payload)
+    assert table.column_names == expected.columns.tolist()
+    assert table.schema.field("ch1").type == pa.int16()
+    assert table.schema.field("ch1").metadata[b"sparkplug.type"] == b"2"
+    pd.testing.assert_frame_equal(table.to_pandas(), expected)
+    metadata = table.schema.metadata
+    assert metadata[b"sparkplug.metric.name"] == b"AXUV_example"
+    assert json.loads(metadata[b"sparkplug.properties"]) == properties
+
+
+def test_parse_datasets_to_arrow_types(parser):
+    # Ensure that UInt64 and DateTime map to their Arrow types
+    payload = spt.Payload()
+    df = pd.DataFrame(
+        {
+            "count": np.array([2**64 - 1, 3], dtype=np.uint64),
+            "time": np.array([1737090405000, 0], dtype=np.int64),
+            "label": ["a", "b"],
+        }
+    )
+    types = [
+        spt.DataSetDataType.UInt64,
+        spt.DataSetDataType.DateTime,
+        spt.DataSetDataType.Text,
+    ]
+    parser.dataframe_to_dataset_metric(payload, df, "frame", types=types, alias=3)
+    parser.dataframe_to_dataset_metric(payload, df.iloc[:1], "other", types=types)
+    tables = parser.parse_datasets_to_arrow(payload)
+    assert len(tables) == 2
+    table = tables[0]
+    assert table.schema.types == [pa.uint64(), pa.timestamp("ms"), pa.string()]
+    assert table.column("count").to_pylist() == [2**64 - 1, 3]
+    assert table.column("time").cast(pa.int64()).to_pylist() == [1737090405000, 0]
+    assert table.schema.metadata[b"sparkplug.metric.alias"] == b"3"
+    assert tables[1].num_rows == 1
+
+
+def test_parse_datasets_to_arrow_no_dataset(example_message_timeseries, parser):
+    # Ensure that a payload without DataSets gives None
+    payload = parser.parse_bytes_to_protobuf(example_message_timeseries)
+    assert parser.parse_datasets_to_arrow(payload) is None
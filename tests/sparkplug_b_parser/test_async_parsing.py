@@ -0,0 +1,91 @@
+import asyncio
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import pytest
+
+import sparkplug_b_parser as spt
+
+
+async def _source(items, delay=0.0):
+    for item in items:
+        await asyncio.sleep(delay)
+        yield item
+
+
+@pytest.mark.parametrize("offload_threshold", [0, 1 << 30])
+def test_decode_encode(example_message_timeseries, offload_threshold):
+    aparser = spt.AsyncSparkplugBParser(offload_threshold=offload_threshold)
+
+    async def main():
+        payload = await aparser.decode(example_message_timeseries)
+        assert payload.metrics[0].name == "temperature"
+        assert await aparser.encode(payload) == example_message_timeseries
+
+    asyncio.run(main())
+
+
+def test_to_dfs(example_message_dataset):
+    aparser = spt.AsyncSparkplugBParser(offload_threshold=0)
+
+    async def main():
+        payload = await aparser.decode(example_message_dataset)
+        df, properties = await aparser.to_dfs(payload)
+        assert df.shape == (3, 5)
+        assert properties["range"] == 5
+
+    asyncio.run(main())
+
+
+def test_decode_stream_keeps_order(
+    example_message_dataset, example_message_timeseries
+):
+    aparser = spt.AsyncSparkplugBParser(offload_threshold=0)
+    items = [example_message_dataset, example_message_timeseries] * 5
+
+    async def main():
+        return [
+            payload.metrics[0].name
+            async for payload in aparser.decode_stream(_source(items), concurrency=3)
+        ]
+
+    names = asyncio.run(main())
+    assert names == ["AXUV_example", "temperature"] * 5
+
+
+def test_decode_stream_to_dfs_process_pool(example_message_dataset):
+    async def main():
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            aparser = spt.AsyncSparkplugBParser(executor=executor, offload_threshold=0)
+            source = _source([memoryview(example_message_dataset)] * 3)
+            return [
+                df.shape async for df, _ in aparser.decode_stream_to_dfs(source)
+            ]
+
+    assert asyncio.run(main()) == [(3, 5)] * 3
+
+
+def test_offload_threshold_counts_bytes(example_message_dataset):
+    # Multi-dimensional buffers should be offloaded by their size in bytes, not
+    # by their length
+    class CountingExecutor(ThreadPoolExecutor):
+        submitted = 0
+
+        def submit(self, *args, **kwargs):
+            self.submitted += 1
+            return super().submit(*args, **kwargs)
+
+    size = len(example_message_dataset)
+    data = memoryview(example_message_dataset).cast("B", shape=[1, size])
+    assert len(data) == 1
+    with CountingExecutor(max_workers=1) as executor:
+        aparser = spt.AsyncSparkplugBParser(executor=executor, offload_threshold=size)
+
+        async def main():
+            payload = await aparser.decode(data)
+            dfs, _ = await aparser.decode_to_dfs(data)
+            return payload, dfs
+
+        payload, dfs = asyncio.run(main())
+        assert executor.submitted == 2
+    assert payload.metrics[0].name == "AXUV_example"
+    assert dfs.shape == (3, 5)
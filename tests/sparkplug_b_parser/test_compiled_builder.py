@@ -0,0 +1,71 @@
+import pytest
+from google.protobuf.json_format import ParseDict, ParseError
+
+import sparkplug_b_parser as spt
+from proto_parser.compiled import compile_dict_to_message
+from sparkplug_b_parser.example_payloads import example_payloads
+from sparkplug_b_parser.example_payloads.byte import EXAMPLE_PAYLOAD_SPARKPLUGB_BYTES
+
+TEMPLATE_PAYLOAD = {
+    "timestamp": "1737090405",
+    "seq": 3,
+    "metrics": [
+        {
+            "name": "udt",
+            "datatype": 19,
+            "template_value": {
+                "version": "1",
+                "templateRef": "Motor",
+                "metrics": [
+                    {"name": "rpm", "datatype": 10, "doubleValue": "NaN"},
+                    {"name": "on", "datatype": 11, "boolean_value": False},
+                    {"name": "missing", "datatype": 3, "int_value": None},
+                ],
+                "parameters": [{"name": "p", "type": 9, "float_value": 1.5}],
+            },
+        }
+    ],
+}
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        example_payloads["dataset"],
+        example_payloads["json"],
+        example_payloads["timeseries"],
+        EXAMPLE_PAYLOAD_SPARKPLUGB_BYTES,
+        TEMPLATE_PAYLOAD,
+    ],
+)
+def test_compiled_matches_parse_dict(parser, data):
+    expected = parser.parse_dict_to_bytes(data)
+    assert parser.parse_dict_to_bytes(data, compiled=True) == expected
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        {"no_such_field": 1},
+        {"timestamp": 1.5},
+        {"metrics": {"name": "not a list"}},
+        {"metrics": [{"boolean_value": "true"}]},
+        {"metrics": [{"float_value": float("nan")}]},
+        {"metrics": [{"int_value": 1, "long_value": 2}]},
+        {"metrics": [{"int_value": 1, "intValue": 1}]},
+    ],
+)
+def test_compiled_rejects_invalid_input(data):
+    build = compile_dict_to_message(spt.Payload.DESCRIPTOR)
+    with pytest.raises(ParseError):
+        ParseDict(data, spt.Payload())
+    with pytest.raises(ParseError):
+        build(data, spt.Payload())
+
+
+def test_compiled_ignore_unknown_fields():
+    build = compile_dict_to_message(
+        spt.Payload.DESCRIPTOR, ignore_unknown_fields=True
+    )
+    payload = build({"timestamp": 5, "no_such_field": 1}, spt.Payload())
+    assert payload.timestamp == 5
@@ -0,0 +1,79 @@
+import numpy as np
+import pandas as pd
+import pytest
+import sparkplug_b_parser as spt
+
+
+def make_payloads(parser, count=5, rows=3):
+    payloads = []
+    for k in range(count):
+        payload = spt.Payload(timestamp=1000 + k, seq=k)
+        payload.metrics.add(name="scalar", datatype=spt.MetricDataType.Double)
+        df = pd.DataFrame(
+            {
+                "v": np.arange(rows) + k * 0.5,
+                "i": np.arange(rows, dtype=np.int32) - k,
+                "s": [f"{k}-{r}" for r in range(rows)],
+            }
+        )
+        parser.dataframe_to_dataset_metric(
+            payload, df, "frame", timestamp=5000 + k, alias=9
+        )
+        payloads.append(payload)
+    return payloads
+
+
+@pytest.mark.parametrize("serialized", [True, False])
+def test_concat_datasets(parser, serialized):
+    # Ensure that the rows of all payloads are concatenated with extra columns
+    payloads = make_payloads(parser)
+    expected = pd.concat(
+        [parser.parse_datasets_to_dfs(p, columnar=True)[0] for p in payloads],
+        ignore_index=True,
+    )
+    data = [p.SerializeToString() for p in payloads] if serialized else payloads
+    df = parser.concat_datasets(
+        data, "frame", payload_timestamp=True, metric_timestamp=True, seq=True
+    )
+    pd.testing.assert_frame_equal(df[["v", "i", "s"]], expected)
+    timestamps = [t for t in range(1000, 1005) for _ in range(3)]
+    assert df["payload_timestamp"].tolist() == timestamps
+    assert df["metric_timestamp"].iloc[[0, 14]].tolist() == [5000, 5004]
+    assert df["seq"].dtype == np.uint64
+    assert df["seq"].tolist()[-3:] == [4, 4, 4]
+
+
+def test_concat_datasets_by_alias_and_irregular(parser):
+    # Ensure that metrics are found by alias, payloads without them are skipped,
+    # and irregular rows in one payload are decoded correctly
+    payloads = make_payloads(parser)
+    payloads[2].metrics[1].dataset_value.rows[1].elements[0].Clear()
+    expected = pd.concat(
+        [parser.parse_datasets_to_dfs(p, columnar=True)[0] for p in payloads],
+        ignore_index=True,
+    )
+    data = [p.SerializeToString() for p in payloads]
+    data.insert(1, spt.Payload(timestamp=1).SerializeToString())
+    df = parser.concat_datasets(data, 9)
+    pd.testing.assert_frame_equal(df, expected)
+    assert parser.concat_datasets(data, "missing") is None
+
+
+def test_concat_datasets_schema_mismatch(parser):
+    # Ensure that DataSets with different columns are rejected
+    payloads = make_payloads(parser, count=2)
+    payloads[1].metrics[1].dataset_value.columns[0] = "other"
+    with pytest.raises(ValueError):
+        parser.concat_datasets(payloads, "frame")
+
+
+def test_concat_datasets_as_arrow(parser):
+    # Ensure that the result can be returned as an Arrow table
+    pa = pytest.importorskip("pyarrow")
+    payloads = make_payloads(parser)
+    table = parser.concat_datasets(
+        payloads, "frame", payload_timestamp=True, as_arrow=True
+    )
+    assert table.num_rows == 15
+    assert table.schema.field("payload_timestamp").type == pa.timestamp("ms")
+    assert table.column("i").type == pa.int32()
@@ -0,0 +1,172 @@
+import numpy as np
+import pandas as pd
+import pytest
+import sparkplug_b_parser as spt
+from sparkplug_b_parser import DataSetDataType
+
+
+@pytest.fixture
+def example_df():
+    return pd.DataFrame(
+        {
+            "i8": np.array([-1, 0, 127], dtype=np.int8),
+            "i32": np.array([-70000, 1, 2**31 - 1], dtype=np.int32),
+            "i64": np.array([-(2**40), 0, 2**62], dtype=np.int64),
+            "u16": np.array([0, 300, 65535], dtype=np.uint16),
+            "f32": np.array([0.5, -1.25, 3.0], dtype=np.float32),
+            "f64": np.array([0.1, np.nan, -2.5]),
+            "flag": [True, False, True],
+            "label": ["a", "ünïcode", "x" * 200],
+        }
+    )
+
+
+def test_dataframe_to_dataset_metric_matches_rows(example_df, parser):
+    # Ensure that the column-wise encoder produces the same bytes as add_rows
+    payload = spt.Payload()
+    parser.dataframe_to_dataset_metric(payload, example_df, "frame", timestamp=1)
+
+    expected = spt.Payload()
+    types = list(payload.metrics[0].dataset_value.types)
+    dataset = parser.init_dataset_metric(
+        expected, "frame", types, list(example_df.columns), timestamp=1
+    )
+    # Signed integers are given as their two's complement
+    i32_neg, i64_neg = -70000 & 0xFFFFFFFF, -(2**40) & (2**64 - 1)
+    rows = [
+        [0xFFFFFFFF, i32_neg, i64_neg, 0, 0.5, 0.1, True, "a"],
+        [0, 1, 0, 300, -1.25, float("nan"), False, "ünïcode"],
+        [127, 2**31 - 1, 2**62, 65535, 3.0, -2.5, True, "x" * 200],
+    ]
+    parser.add_rows_to_dataset(dataset, rows)
+    assert payload.SerializeToString() == expected.SerializeToString()
+
+
+def test_dataframe_to_dataset_metric_inferred_types(example_df, parser):
+    # Ensure that Sparkplug types are inferred from the dtypes
+    payload = spt.Payload()
+    dataset = parser.dataframe_to_dataset_metric(payload, example_df, "frame")
+    assert list(dataset.types) == [
+        DataSetDataType.Int8,
+        DataSetDataType.Int32,
+        DataSetDataType.Int64,
+        DataSetDataType.UInt16,
+        DataSetDataType.Float,
+        DataSetDataType.Double,
+        DataSetDataType.Boolean,
+        DataSetDataType.String,
+    ]
+    df, _ = parser.parse_datasets_to_dfs(payload, columnar=True)
+    for column in example_df.columns:
+        np.testing.assert_array_equal(df[column].to_numpy(), example_df[column])
+
+
+def test_add_dataframe_to_dataset_explicit_types_and_missing(parser):
+    # Ensure that explicit types are honoured and missing values are empty
+    payload = spt.Payload()
+    dataset = parser.init_dataset_metric(
+        payload, "frame", [DataSetDataType.Int64, DataSetDataType.String], ["a", "b"]
+    )
+    df = pd.DataFrame(
+        {"a": pd.array([1, None, 3], dtype="Int32"), "b": ["x", None, "z"]}
+    )
+    parser.add_dataframe_to_dataset(dataset, df)
+    parser.add_dataframe_to_dataset(dataset, df.iloc[:1])
+    assert len(dataset.rows) == 4
+    assert dataset.rows[0].elements[0].long_value == 1
+    assert dataset.rows[1].elements[0].WhichOneof("value") is None
+    assert dataset.rows[1].elements[1].WhichOneof("value") is None
+    assert dataset.rows[2].elements[1].string_value == "z"
+
+
+def test_add_dataframe_to_dataset_column_mismatch(parser):
+    # Ensure that a DataFrame with the wrong number of columns is rejected
+    payload = spt.Payload()
+    dataset = parser.init_dataset_metric(
+        payload, "frame", [DataSetDataType.Int32], ["a"]
+    )
+    with pytest.raises(ValueError):
+        parser.add_dataframe_to_dataset(dataset, pd.DataFrame({"a": [1], "b": [2]}))
+
+
+def test_dataframe_to_dataset_bytes_matches_metric(example_df, parser):
+    # Ensure that the wire encoder gives the same bytes as the message path
+    payload = spt.Payload(timestamp=5)
+    payload.metrics.add(name="scalar", datatype=spt.MetricDataType.Double)
+    raw = parser.dataframe_to_dataset_bytes(
+        payload, example_df, "frame", timestamp=1, alias=7
+    )
+    expected = spt.Payload()
+    expected.CopyFrom(payload)
+    parser.dataframe_to_dataset_metric(
+        expected, example_df, "frame", timestamp=1, alias=7
+    )
+    assert raw == expected.SerializeToString()
+    assert len(payload.metrics) == 1
+
+
+def test_dataframe_to_dataset_bytes_from_arrays(parser, monkeypatch):
+    # Ensure that a mapping of arrays spliced into serialized bytes round-trips
+    monkeypatch.setattr("sparkplug_b_parser.wire._ROWS_PER_BLOCK", 64)
+    payload = spt.Payload(timestamp=5, seq=3)
+    payload.metrics.add(name="scalar", datatype=spt.MetricDataType.Int32)
+    columns = {"t": np.arange(1000, dtype=np.int64), "v": np.linspace(0, 1, 1000)}
+    raw = parser.dataframe_to_dataset_bytes(
+        payload.SerializeToString(), columns, "frame", timestamp=1
+    )
+    decoded = parser.parse_bytes_to_protobuf(raw)
+    assert decoded.seq == 3
+    assert [metric.name for metric in decoded.metrics] == ["scalar", "frame"]
+    df, _ = parser.parse_datasets_to_dfs(decoded, columnar=True)
+    np.testing.assert_array_equal(df["t"], columns["t"])
+    np.testing.assert_array_equal(df["v"], columns["v"])
+
+
+def test_dataframe_to_dataset_long_string(parser):
+    # Ensure that one long string cell is encoded without padding every row to
+    # its length
+    import tracemalloc
+
+    labels = ["a", None, "é"] * 1000
+    labels[1500] = "x" * 200_000
+    df = pd.DataFrame(
+        {"i": np.arange(3000), "label": labels, "note": ["n"] * 3000},
+    )
+    tracemalloc.start()
+    try:
+        payload = spt.Payload()
+        parser.dataframe_to_dataset_metric(payload, df, "frame")
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert peak < 20_000_000
+    rows = payload.metrics[0].dataset_value.rows
+    assert len(rows) == 3000
+    assert rows[1500].elements[1].string_value == "x" * 200_000
+    assert rows[1501].elements[1].WhichOneof("value") is None
+    assert rows[1502].elements[1].string_value == "é"
+    assert [row.elements[0].long_value for row in rows] == list(range(3000))
+    assert all(row.elements[2].string_value == "n" for row in rows)
+
+
+def test_dataframe_to_dataset_bytes_long_string(parser, monkeypatch):
+    # Ensure that blocks holding one long string cell stay about the size of
+    # their encoded rows
+    import tracemalloc
+
+    monkeypatch.setattr("sparkplug_b_parser.wire._ROWS_PER_BLOCK", 1000)
+    labels = ["a"] * 3000
+    labels[2500] = "x" * 200_000
+    df = pd.DataFrame({"label": labels, "v": np.linspace(0, 1, 3000)})
+    tracemalloc.start()
+    try:
+        raw = parser.dataframe_to_dataset_bytes(spt.Payload(), df, "frame")
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert peak < 20_000_000
+    df_out, _ = parser.parse_datasets_to_dfs(
+        parser.parse_bytes_to_protobuf(raw), columnar=True
+    )
+    assert df_out["label"].tolist() == labels
+    np.testing.assert_array_equal(df_out["v"], df["v"])
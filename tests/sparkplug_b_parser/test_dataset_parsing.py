@@ -1,5 +1,8 @@
+import numpy as np
+import pandas as pd
 import pytest
 import sparkplug_b_parser as spt
+from proto_parser import LRUCache
 
 
 def test_parse_payload_to_dfs(example_message_dataset, parser):
@@ -26,3 +29,285 @@ def test_parse_payload_to_dfs_invalid(example_message_timeseries, parser):
     payload = parser.parse_bytes_to_protobuf(example_message_timeseries)
     dfs, _ = parser.parse_datasets_to_dfs(payload)
     assert dfs is None
+
+
+def test_parse_payload_to_dfs_from_memoryview(example_message_dataset, parser):
+    # Ensure that a slice of a larger receive buffer decodes like bytes
+    buffer = bytearray(b"\xff" * 8) + example_message_dataset
+    payload = parser.parse_bytes_to_protobuf(memoryview(buffer)[8:])
+    dfs, _ = parser.parse_datasets_to_dfs(payload)
+    assert dfs.shape == (3, 5)
+
+
+def test_parse_payload_to_dfs_columnar(example_message_dataset, parser):
+    # Ensure that the columnar mode gives the same values with Sparkplug dtypes
+    payload = parser.parse_bytes_to_protobuf(example_message_dataset)
+    expected, expected_properties = parser.parse_datasets_to_dfs(payload)
+    dfs, properties = parser.parse_datasets_to_dfs(payload, columnar=True)
+    assert properties == expected_properties
+    assert dfs.columns.tolist() == expected.columns.tolist()
+    assert dfs.dtypes.tolist() == ["int32", "int16", "int16", "int16", "int16"]
+    assert (dfs.to_numpy() == expected.to_numpy()).all()
+
+
+def test_parse_payload_to_dfs_columnar_dtypes(parser):
+    # Ensure that signed integers, floats and booleans get matching dtypes
+    payload = spt.Payload()
+    types = [
+        spt.DataSetDataType.Int8,
+        spt.DataSetDataType.Int64,
+        spt.DataSetDataType.UInt16,
+        spt.DataSetDataType.Float,
+        spt.DataSetDataType.Boolean,
+        spt.DataSetDataType.String,
+    ]
+    columns = ["i8", "i64", "u16", "f32", "flag", "label"]
+    dataset = parser.init_dataset_metric(payload, "typed", types, columns)
+    parser.add_rows_to_dataset(
+        dataset,
+        [
+            [0xFFFFFFFF, 2**64 - 2, 65535, 0.5, True, "a"],
+            [127, 5, 1, -1.25, False, "b"],
+        ],
+    )
+    df, _ = parser.parse_datasets_to_dfs(payload, columnar=True)
+    assert df.dtypes.astype(str).tolist()[:5] == [
+        "int8",
+        "int64",
+        "uint16",
+        "float32",
+        "bool",
+    ]
+    assert df["i8"].tolist() == [-1, 127]
+    assert df["i64"].tolist() == [-2, 5]
+    assert df["f32"].tolist() == [0.5, -1.25]
+    assert df["label"].tolist() == ["a", "b"]
+
+
+def test_parse_payload_to_dfs_columnar_ragged_row(example_message_dataset, parser):
+    # Ensure that rows with a missing element are rejected in columnar mode
+    payload = parser.parse_bytes_to_protobuf(example_message_dataset)
+    del payload.metrics[0].dataset_value.rows[1].elements[-1]
+    with pytest.raises(ValueError):
+        parser.parse_datasets_to_dfs(payload, columnar=True)
+
+
+def test_parse_bytes_to_dfs(example_message_dataset, parser):
+    # Ensure that decoding from the wire bytes matches the columnar mode
+    payload = parser.parse_bytes_to_protobuf(example_message_dataset)
+    expected, expected_properties = parser.parse_datasets_to_dfs(
+        payload, columnar=True
+    )
+    buffer = bytearray(b"\xff" * 8) + example_message_dataset
+    df, properties = parser.parse_bytes_to_dfs(memoryview(buffer)[8:])
+    assert properties == expected_properties
+    pd.testing.assert_frame_equal(df, expected)
+
+
+def test_parse_bytes_to_dfs_uniform_rows(parser):
+    # Ensure that many equally sized rows of every type decode correctly
+    types = [
+        spt.DataSetDataType.Int8,
+        spt.DataSetDataType.Int32,
+        spt.DataSetDataType.Int64,
+        spt.DataSetDataType.UInt64,
+        spt.DataSetDataType.Float,
+        spt.DataSetDataType.Double,
+        spt.DataSetDataType.Boolean,
+        spt.DataSetDataType.String,
+    ]
+    df = pd.DataFrame(
+        {
+            "i8": np.full(200, -1, dtype=np.int8),
+            "i32": np.arange(200, dtype=np.int32) - 70000,
+            "i64": np.full(200, -(2**40)),
+            "u64": np.full(200, 2**63 + 5, dtype=np.uint64),
+            "f32": np.linspace(-1, 1, 200, dtype=np.float32),
+            "f64": np.linspace(0, 1, 200),
+            "flag": np.arange(200) % 3 == 0,
+            "label": [f"ü{i % 7}" for i in range(200)],
+        }
+    )
+    payload = spt.Payload()
+    parser.dataframe_to_dataset_metric(payload, df, "frame", types=types)
+    raw = payload.SerializeToString()
+    expected, _ = parser.parse_datasets_to_dfs(payload, columnar=True)
+    result, _ = parser.parse_bytes_to_dfs(raw)
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_parse_bytes_to_dfs_irregular_rows(parser):
+    # Ensure that rows with missing values fall back to Protobuf decoding
+    payload = spt.Payload()
+    dataset = parser.init_dataset_metric(
+        payload,
+        "irregular",
+        [spt.DataSetDataType.Int32, spt.DataSetDataType.Double],
+        ["a", "b"],
+    )
+    parser.add_rows_to_dataset(dataset, [[i, i * 0.5] for i in range(100)])
+    dataset.rows[50].elements[0].Clear()
+    expected, _ = parser.parse_datasets_to_dfs(payload, columnar=True)
+    df, _ = parser.parse_bytes_to_dfs(payload.SerializeToString())
+    pd.testing.assert_frame_equal(df, expected)
+    assert df["a"][50] == 0
+
+
+def test_parse_bytes_to_dfs_no_dataset(example_message_timeseries, parser):
+    # Ensure that a payload without DataSets gives (None, None)
+    assert parser.parse_bytes_to_dfs(example_message_timeseries) == (None, None)
+
+
+@pytest.mark.parametrize("serialized", [True, False])
+def test_iter_dataset_chunks(parser, serialized):
+    # Ensure that the chunks of a DataSet concatenate to the whole DataFrame
+    payload = spt.Payload()
+    dataset = parser.init_dataset_metric(
+        payload,
+        "chunked",
+        [spt.DataSetDataType.Int32, spt.DataSetDataType.String],
+        ["a", "b"],
+        alias=4,
+    )
+    parser.add_rows_to_dataset(dataset, [[i, f"row{i}"] for i in range(250)])
+    # An irregular row is decoded with Protobuf, only within its own chunk
+    dataset.rows[120].elements[0].Clear()
+    expected, properties = parser.parse_datasets_to_dfs(payload, columnar=True)
+    data = payload.SerializeToString() if serialized else payload
+    chunks = list(parser.iter_dataset_chunks(data, chunk_size=100))
+    assert [chunk.start for chunk in chunks] == [0, 100, 200]
+    assert all(chunk.name == "chunked" and chunk.alias == 4 for chunk in chunks)
+    assert chunks[0].properties == properties
+    df = pd.concat([chunk.data for chunk in chunks], ignore_index=True)
+    pd.testing.assert_frame_equal(df, expected)
+
+
+def test_iter_dataset_chunks_as_arrays(example_message_dataset, parser):
+    # Ensure that chunks can be returned as typed column arrays
+    chunks = list(
+        parser.iter_dataset_chunks(example_message_dataset, 2, as_arrays=True)
+    )
+    assert [len(chunk.data[0]) for chunk in chunks] == [2, 1]
+    assert chunks[0].columns == ["idx", "ch1", "ch2", "ch3", "ch4"]
+    assert chunks[0].data[1].dtype == np.int16
+
+
+@pytest.mark.parametrize("columnar", [True, False])
+def test_parse_payload_to_dfs_selection(example_message_dataset, parser, columnar):
+    # Ensure that only the selected metrics and columns are converted
+    payload = parser.parse_bytes_to_protobuf(example_message_dataset)
+    expected, _ = parser.parse_datasets_to_dfs(payload, columnar=columnar)
+    df, properties = parser.parse_datasets_to_dfs(
+        payload,
+        columnar=columnar,
+        metrics=["AXUV_example"],
+        columns={"AXUV_example": ["ch3", "idx"]},
+    )
+    pd.testing.assert_frame_equal(df, expected[["ch3", "idx"]])
+    assert properties["range"] == 5
+    assert parser.parse_datasets_to_dfs(payload, metrics=[12345]) == (None, None)
+
+
+def test_parse_bytes_to_dfs_selection(example_message_dataset, parser):
+    # Ensure that column selection on the wire bytes matches the full decode
+    expected, _ = parser.parse_bytes_to_dfs(example_message_dataset)
+    df, _ = parser.parse_bytes_to_dfs(
+        example_message_dataset, columns={"AXUV_example": ["ch4", "ch1"]}
+    )
+    pd.testing.assert_frame_equal(df, expected[["ch4", "ch1"]])
+    with pytest.raises(ValueError):
+        parser.parse_bytes_to_dfs(
+            example_message_dataset, columns={"AXUV_example": ["nope"]}
+        )
+    assert parser.parse_bytes_to_dfs(example_message_dataset, metrics=["x"]) == (
+        None,
+        None,
+    )
+
+
+@pytest.mark.parametrize("columnar", [True, False])
+def test_parse_payload_to_dfs_schema_cache(example_message_dataset, columnar):
+    # Ensure that DataSets of one schema reuse the extractor built for the first
+    parser = spt.SparkplugBParser()
+    parser.dataset_schema_cache = LRUCache(maxsize=2)
+    payload = parser.parse_bytes_to_protobuf(example_message_dataset)
+    expected, _ = parser.parse_datasets_to_dfs(payload, columnar=columnar)
+    for _ in range(3):
+        df, _ = parser.parse_datasets_to_dfs(payload, columnar=columnar)
+        pd.testing.assert_frame_equal(df, expected)
+    parser.parse_datasets_to_dfs(
+        payload, columnar=columnar, columns={"AXUV_example": ["ch1"]}
+    )
+    info = parser.dataset_schema_cache.info()
+    assert (info.hits, info.misses, info.currsize) == (3, 2, 2)
+    assert spt.SparkplugBParser.dataset_schema_cache is None
+
+
+def test_parse_payload_to_dfs_property_cache(example_message_dataset):
+    # Ensure that cached properties match parsed ones and are shared read-only
+    parser = spt.SparkplugBParser()
+    payload = parser.parse_bytes_to_protobuf(example_message_dataset)
+    _, expected = parser.parse_datasets_to_dfs(payload)
+    parser.property_cache = LRUCache(maxsize=8)
+    _, first = parser.parse_datasets_to_dfs(payload)
+    _, second = parser.parse_datasets_to_dfs(payload)
+    assert first == second == expected
+    assert first is second
+    with pytest.raises(TypeError):
+        first["range"] = 0
+    with pytest.raises(TypeError):
+        first["gain"]["ch1"] = 0
+    info = parser.property_cache.info()
+    assert (info.hits, info.misses, info.hit_rate) == (1, 1, 0.5)
+    assert spt.SparkplugBParser.property_cache is None
+
+
+@pytest.fixture
+def uuid_payload(parser):
+    payload = spt.Payload()
+    dataset = parser.init_dataset_metric(
+        payload,
+        "devices",
+        # UUID (15) has no DataSetDataType, but is a metric value type
+        [
+            spt.DataSetDataType.Int32,
+            spt.MetricDataType.UUID,
+            spt.DataSetDataType.Double,
+        ],
+        ["id", "uuid", "v"],
+    )
+    for i in range(3):
+        row = dataset.rows.add()
+        row.elements.add(int_value=i)
+        row.elements.add(string_value=f"uuid-{i}")
+        row.elements.add(double_value=i / 2)
+    return payload
+
+
+def test_parse_payload_to_dfs_uuid(uuid_payload, parser):
+    # Ensure that columns without a typed array representation hold their values
+    df, _ = parser.parse_datasets_to_dfs(uuid_payload)
+    assert df["uuid"].tolist() == ["uuid-0", "uuid-1", "uuid-2"]
+    assert df["id"].dtype == np.int64
+    df, _ = parser.parse_datasets_to_dfs(uuid_payload, columns={"devices": ["uuid"]})
+    assert df["uuid"].tolist() == ["uuid-0", "uuid-1", "uuid-2"]
+    with pytest.raises(ValueError):
+        parser.parse_datasets_to_dfs(uuid_payload, columnar=True)
+
+
+def test_parse_payload_to_dfs_ragged_rows(uuid_payload, parser):
+    # Ensure that rows with missing trailing elements are padded with NaN
+    del uuid_payload.metrics[0].dataset_value.rows[1].elements[2]
+    df, _ = parser.parse_datasets_to_dfs(uuid_payload)
+    assert df["id"].tolist() == [0, 1, 2]
+    assert df["v"].iloc[0] == 0.0
+    assert np.isnan(df["v"].iloc[1])
+
+
+def test_parse_payload_to_dfs_no_rows(uuid_payload, parser):
+    # Ensure that a DataSet without rows gives an empty DataFrame of objects
+    del uuid_payload.metrics[0].dataset_value.rows[:]
+    df, _ = parser.parse_datasets_to_dfs(uuid_payload)
+    assert df.shape == (0, 3)
+    assert df.columns.tolist() == ["id", "uuid", "v"]
+    assert (df.dtypes == object).all()
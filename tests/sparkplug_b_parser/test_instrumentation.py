@@ -0,0 +1,65 @@
+import pytest
+
+from proto_parser import instrumentation
+
+
+@pytest.fixture
+def enabled_instrumentation():
+    instrumentation.reset()
+    instrumentation.enable()
+    yield instrumentation
+    instrumentation.disable()
+    instrumentation.reset()
+
+
+def test_disabled_by_default(parser, example_message_timeseries):
+    instrumentation.reset()
+    parser.parse_bytes_to_protobuf(example_message_timeseries)
+    assert instrumentation.snapshot() == {}
+
+
+def test_decode_statistics(
+    parser, enabled_instrumentation, example_message_timeseries
+):
+    for _ in range(3):
+        parser.parse_bytes_to_protobuf(example_message_timeseries)
+    stats = enabled_instrumentation.snapshot()["SparkplugBParser.parse_bytes_to_protobuf"]
+    assert stats["calls"] == 3
+    assert stats["errors"] == 0
+    assert stats["bytes_total"] == 3 * len(example_message_timeseries)
+    assert stats["metrics_per_payload"]["payloads"] == 3
+    assert stats["metrics_per_payload"]["mean"] == 5
+    latency = stats["latency_s"]
+    assert sum(latency["histogram"].values()) == 3
+    assert latency["min"] <= latency["mean"] <= latency["max"] <= latency["p99"] * 2
+
+
+def test_error_statistics(parser, enabled_instrumentation):
+    with pytest.raises(TypeError):
+        parser.parse_datasets_to_dfs("not a payload")
+    stats = enabled_instrumentation.snapshot()["SparkplugBParser.parse_datasets_to_dfs"]
+    assert stats["calls"] == 1
+    assert stats["errors"] == 1
+
+
+def test_handled_error_statistics(parser, enabled_instrumentation):
+    # Ensure that decode failures logged and handled by the parser are counted,
+    # including in the enclosing instrumented call
+    parser.parse_bytes_to_protobuf(b"\xff")
+    parser.parse_bytes_to_dict(b"\xff")
+    stats = enabled_instrumentation.snapshot()
+    assert stats["SparkplugBParser.parse_bytes_to_protobuf"]["calls"] == 2
+    assert stats["SparkplugBParser.parse_bytes_to_protobuf"]["errors"] == 2
+    assert stats["SparkplugBParser.parse_bytes_to_dict"]["errors"] == 1
+    parser.parse_bytes_to_protobuf(b"")
+    stats = enabled_instrumentation.snapshot()
+    assert stats["SparkplugBParser.parse_bytes_to_protobuf"]["errors"] == 2
+
+
+def test_json_bytes_are_encoded_size(parser, enabled_instrumentation):
+    # Ensure that JSON strings are measured by their UTF-8 encoded size
+    data = '{"metrics": [{"name": "température"}]}'
+    parser.parse_json_to_protobuf(data)
+    stats = enabled_instrumentation.snapshot()["SparkplugBParser.parse_json_to_protobuf"]
+    assert stats["errors"] == 0
+    assert stats["bytes_total"] == len(data.encode()) == len(data) + 1
@@ -0,0 +1,143 @@
+import numpy as np
+import pandas as pd
+import pytest
+import sparkplug_b_parser as spt
+from sparkplug_b_parser import timeseries
+
+
+def make_payloads(count=40):
+    payloads = []
+    for k in range(count):
+        payload = spt.Payload(timestamp=1000 + k, seq=k % 256)
+        payload.metrics.add(
+            name="temp", alias=1, datatype=spt.MetricDataType.Float, float_value=k
+        )
+        payload.metrics.add(
+            alias=2, datatype=spt.MetricDataType.Int16, int_value=(-k) & 0xFFFFFFFF
+        )
+        payload.metrics.add(
+            name="count",
+            timestamp=5000 + k,
+            datatype=spt.MetricDataType.Int64,
+            long_value=(-(2**40) * k) & 0xFFFFFFFFFFFFFFFF,
+        )
+        payload.metrics.add(
+            name="alarm", datatype=spt.MetricDataType.Boolean, boolean_value=k % 2
+        )
+        payload.metrics.add(
+            name="label", datatype=spt.MetricDataType.String, string_value="x"
+        )
+        if k % 3 == 0:
+            payload.metrics.add(
+                name="alarm", datatype=spt.MetricDataType.Boolean, is_null=True
+            )
+        payloads.append(payload)
+    return payloads
+
+
+def test_concat_metrics_timeseries(example_message_timeseries, parser):
+    # Ensure that every scalar metric becomes one row with its typed value
+    df = parser.concat_metrics([example_message_timeseries])
+    assert df.columns.tolist() == ["timestamp", "metric", "datatype", "value"]
+    assert df["metric"].tolist() == [
+        "temperature",
+        "pressure",
+        "humidity",
+        "vibration",
+        "alarm",
+    ]
+    assert df["timestamp"].dtype == np.int64
+    assert df["timestamp"].iloc[0] == 1626170001000
+    assert df["datatype"].tolist() == [9, 10, 9, 10, 11]
+    assert df["value"].tolist() == pytest.approx([23.7, 101.325, 45.2, 0.002, 1.0])
+
+
+@pytest.mark.parametrize("serialized", [True, False])
+def test_concat_metrics(parser, serialized):
+    # Ensure that names, aliases, timestamps and signed values are read the same
+    # from serialized payloads and from messages
+    payloads = make_payloads()
+    data = [p.SerializeToString() for p in payloads] if serialized else payloads
+    df = parser.concat_metrics(data)
+    assert df["metric"].cat.categories.tolist() == ["temp", 2, "count", "alarm"]
+    assert len(df) == 40 * 4 + 14
+    rows = df[df["timestamp"] == 1003]
+    assert rows["metric"].tolist() == ["temp", 2, "alarm", "alarm"]
+    assert rows["value"].tolist()[:3] == [3.0, -3.0, 1.0]
+    assert np.isnan(rows["value"].iloc[3])
+    count = df[df["metric"] == "count"]
+    assert count["timestamp"].tolist() == list(range(5000, 5040))
+    assert count["value"].iloc[-1] == -(2**40) * 39
+
+
+def test_concat_metrics_wire_matches_messages():
+    # Ensure that the vectorized wire decoding reads every metric field as
+    # Protobuf does
+    payloads = make_payloads()
+    payloads[5].metrics[0].properties.keys.append("units")
+    payloads[5].metrics[0].properties.values.add(type=12, string_value="C")
+    payloads[7].metrics.add(name="image", bytes_value=b"\x00" * 20)
+    expected = timeseries._message_fields(payloads)
+    fields = timeseries._wire_fields([p.SerializeToString() for p in payloads])
+    assert fields.keys == expected.keys
+    for name in ("codes", "timestamps", "payload_timestamps", "datatypes", "fields"):
+        np.testing.assert_array_equal(getattr(fields, name), getattr(expected, name))
+
+
+def test_concat_metrics_selection_and_pivot(parser):
+    # Ensure that metrics are selected by name or alias and pivoted one column
+    # per metric
+    data = [p.SerializeToString() for p in make_payloads()]
+    df = parser.concat_metrics(data, metrics=["temp", 2], pivot=True)
+    assert df.columns.tolist() == ["temp", 2]
+    assert df.index.name == "timestamp"
+    assert df.index.tolist() == list(range(1000, 1040))
+    np.testing.assert_array_equal(df[2].to_numpy(), -np.arange(40.0))
+    assert parser.concat_metrics(data, metrics=["label"]) is None
+    assert parser.concat_metrics([]) is None
+
+
+def test_concat_metrics_pivot_keeps_last(parser):
+    # Ensure that of repeated values of a metric at one timestamp, the last one
+    # is kept and missing values are NaN
+    payload = spt.Payload(timestamp=10)
+    for value in (1.0, 2.0):
+        payload.metrics.add(name="a", double_value=value)
+    payload.metrics.add(name="b", timestamp=20, double_value=3.0)
+    df = parser.concat_metrics([payload], pivot=True)
+    expected = pd.DataFrame(
+        [[2.0, np.nan], [np.nan, 3.0]],
+        index=pd.Index([10, 20], name="timestamp"),
+        columns=pd.Index(["a", "b"], dtype=object, name="metric"),
+    )
+    pd.testing.assert_frame_equal(df, expected)
+
+
+@pytest.mark.parametrize("serialized", [True, False])
+def test_concat_metrics_signed_widths(parser, serialized):
+    # Ensure that signed integers are sign-extended from their own width, as
+    # PayloadView does
+    int8, int16, uint8 = (
+        spt.MetricDataType.Int8,
+        spt.MetricDataType.Int16,
+        spt.MetricDataType.UInt8,
+    )
+    metrics = [
+        (int8, "int_value", 0xFF),
+        (int8, "int_value", 2**32 - 2),
+        (int16, "int_value", 0xFFFE),
+        (int16, "int_value", 0x7FFF),
+        (uint8, "int_value", 0xFF),
+        (int8, "long_value", 2**64 - 3),
+    ]
+    payloads = []
+    for k in range(40):
+        payload = spt.Payload(timestamp=k)
+        for alias, (datatype, field, value) in enumerate(metrics):
+            payload.metrics.add(alias=alias, datatype=datatype, **{field: value})
+        payloads.append(payload)
+    data = [p.SerializeToString() for p in payloads] if serialized else payloads
+    df = parser.concat_metrics(data)
+    expected = [parser.view(payloads[0]).value(alias) for alias in range(6)]
+    assert expected == [-1, -2, -2, 32767, 255, -3]
+    assert df["value"].tolist() == expected * 40
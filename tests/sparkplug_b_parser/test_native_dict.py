@@ -0,0 +1,60 @@
+import base64
+
+import pytest
+from google.protobuf.json_format import MessageToDict
+
+import sparkplug_b_parser as spt
+from sparkplug_b_parser.example_payloads import example_payloads
+
+
+def _jsonify(native: dict) -> dict:
+    """
+    Apply MessageToDict's JSON conventions to a native dict for comparison.
+    """
+    converted = {}
+    for key, value in native.items():
+        if isinstance(value, dict):
+            value = _jsonify(value)
+        elif isinstance(value, list):
+            value = [_jsonify(v) if isinstance(v, dict) else v for v in value]
+        elif isinstance(value, bytes):
+            value = base64.b64encode(value).decode("utf-8")
+        elif key in ("timestamp", "num_of_columns", "numOfColumns", "alias", "seq"):
+            value = str(value)
+        converted[key] = value
+    return converted
+
+
+@pytest.mark.parametrize("name", ["dataset", "json", "timeseries"])
+@pytest.mark.parametrize(
+    "options",
+    [
+        {},
+        {"preserving_proto_field_name": False},
+        {"always_print_fields_with_no_presence": True},
+    ],
+)
+def test_native_dict_matches_message_to_dict(parser, name, options):
+    payload = parser.parse_dict_to_protobuf(example_payloads[name])
+    native = parser.parse_protobuf_to_native_dict(payload, **options)
+    expected = MessageToDict(
+        payload, **{"preserving_proto_field_name": True, **options}
+    )
+    assert _jsonify(native) == expected
+
+
+def test_native_dict_types(parser, example_message_timeseries):
+    native = parser.parse_bytes_to_native_dict(example_message_timeseries)
+    assert native["timestamp"] == 1626170000000
+    assert native["body"] == b"optional raw data here"
+    assert native["metrics"][0]["float_value"] == 23.7
+    assert native["metrics"][4]["boolean_value"] is True
+
+
+def test_native_dict_converter_is_cached(parser):
+    payload = spt.Payload(timestamp=1)
+    parser.parse_protobuf_to_native_dict(payload)
+    converters = type(parser).__dict__["_compiled_converters"]
+    count = len(converters)
+    parser.parse_protobuf_to_native_dict(payload)
+    assert len(converters) == count
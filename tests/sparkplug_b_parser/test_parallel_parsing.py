@@ -0,0 +1,83 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import sparkplug_b_parser as spt
+from proto_parser import LRUCache
+from sparkplug_b_parser.parallel import iter_parse_datasets_parallel
+
+
+def test_parse_datasets_parallel(
+    parser, example_message_dataset, example_message_timeseries
+):
+    # Results should match the sequential path and keep the input order
+    data = [example_message_dataset, example_message_timeseries] * 3
+    results = parser.parse_datasets_parallel(data, chunk_size=2, max_workers=2)
+    assert len(results) == 6
+    expected, expected_properties = parser.parse_datasets_to_dfs(
+        parser.parse_bytes_to_protobuf(example_message_dataset)
+    )
+    for idx, (dfs, properties) in enumerate(results):
+        if idx % 2:
+            assert dfs is None
+            continue
+        assert dfs.equals(expected)
+        assert properties == expected_properties
+
+
+def test_parse_datasets_parallel_executor(parser, example_message_dataset):
+    # A caller-provided executor should be reused and left running
+    with ProcessPoolExecutor(max_workers=1) as executor:
+        results = parser.parse_datasets_parallel(
+            [example_message_dataset, memoryview(example_message_dataset)],
+            executor=executor,
+        )
+        assert executor.submit(int, "3").result() == 3
+    assert [dfs.shape for dfs, _ in results] == [(3, 5), (3, 5)]
+
+
+def test_parse_datasets_parallel_schema_cache(example_message_dataset):
+    # A parser with its own schema cache should still be sent to the workers
+    parser = spt.SparkplugBParser()
+    parser.dataset_schema_cache = LRUCache(maxsize=4)
+    results = parser.parse_datasets_parallel(
+        [example_message_dataset] * 3, chunk_size=2, max_workers=2
+    )
+    expected, _ = parser.parse_datasets_to_dfs(
+        parser.parse_bytes_to_protobuf(example_message_dataset)
+    )
+    assert all(dfs.equals(expected) for dfs, _ in results)
+
+
+def test_parse_datasets_parallel_property_cache(example_message_dataset):
+    # A parser with its own property cache should still be sent to the workers
+    parser = spt.SparkplugBParser()
+    parser.property_cache = LRUCache(maxsize=4)
+    _, expected = parser.parse_datasets_to_dfs(
+        parser.parse_bytes_to_protobuf(example_message_dataset)
+    )
+    with ProcessPoolExecutor(max_workers=1) as executor:
+        results = parser.parse_datasets_parallel(
+            [example_message_dataset] * 3, chunk_size=1, executor=executor
+        )
+    assert [properties for _, properties in results] == [expected] * 3
+    assert parser.property_cache.info().currsize == 1
+
+
+def test_iter_parse_datasets_parallel_is_bounded(parser, example_message_dataset):
+    # Input should be read only a few chunks ahead of the consumed results, so
+    # unbounded streams can be decoded
+    consumed = []
+
+    def stream():
+        while True:
+            consumed.append(1)
+            yield example_message_dataset
+
+    with ProcessPoolExecutor(max_workers=1) as executor:
+        results = iter_parse_datasets_parallel(
+            parser, stream(), chunk_size=2, max_workers=1, executor=executor
+        )
+        for _ in range(5):
+            dfs, _ = next(results)
+            assert dfs.shape == (3, 5)
+        results.close()
+    assert len(consumed) <= 5 + 2 * 2 + 1
@@ -0,0 +1,81 @@
+import pytest
+import sparkplug_b_parser as spt
+
+
+def test_view_lookup_by_name(example_message_timeseries, parser):
+    # Ensure that metrics are found by name and values follow the datatype
+    view = parser.view(example_message_timeseries)
+    assert len(view) == 5
+    assert "humidity" in view and "missing" not in view
+    assert view["temperature"].value == pytest.approx(23.7)
+    # Double metric carrying a float_value falls back to the field that is set
+    assert view.value("pressure") == pytest.approx(101.325)
+    assert view.value("missing", 0) == 0
+    assert view["humidity"] is view.get("humidity")
+    with pytest.raises(KeyError):
+        view["missing"]
+    assert [metric.name for metric in view] == [
+        "temperature",
+        "pressure",
+        "humidity",
+        "vibration",
+        "alarm",
+    ]
+
+
+def test_view_properties_are_lazy(example_message_timeseries, parser):
+    # Ensure that properties are parsed on first access only
+    view = spt.PayloadView(parser.parse_bytes_to_protobuf(example_message_timeseries))
+    metric = view["vibration"]
+    assert metric._properties is None
+    assert metric.properties == {"sensor_id": "VibSensor45", "axis": "Z"}
+    assert metric.properties is metric.properties
+    assert view["humidity"].properties == {}
+
+
+def test_view_lookup_by_alias_and_signed_values(parser):
+    # Ensure that aliases index separately and signed integers are decoded
+    payload = parser.parse_dict_to_protobuf(
+        {
+            "timestamp": 1,
+            "seq": 4,
+            "metrics": [
+                {"alias": 3, "datatype": 2, "int_value": 2**32 - 5},
+                {"alias": 7, "datatype": 4, "long_value": 2**64 - 1},
+                {"alias": 8, "datatype": 8, "long_value": 2**64 - 1},
+                {"alias": 9, "datatype": 3, "is_null": True},
+                {"alias": 3, "datatype": 3, "int_value": 1},
+            ],
+        }
+    )
+    view = parser.view(payload)
+    assert (view.timestamp, view.seq) == (1, 4)
+    assert view[3].value == -5
+    assert view.value(7) == -1
+    assert view.value(8) == 2**64 - 1
+    assert view[9].value is None
+    assert view[3].name is None and view[3].alias == 3
+    assert "3" not in view
+
+
+def test_view_signed_value_widths(parser):
+    # Ensure that signed integers are sign-extended from their own width, as in
+    # columnar DataSets
+    payload = spt.Payload()
+    payload.metrics.add(alias=1, datatype=spt.MetricDataType.Int8, int_value=0xFF)
+    payload.metrics.add(alias=2, datatype=spt.MetricDataType.Int16, int_value=0xFFFE)
+    payload.metrics.add(alias=3, datatype=spt.MetricDataType.Int8, int_value=2**32 - 2)
+    payload.metrics.add(alias=4, datatype=spt.MetricDataType.Int16, int_value=0x7FFF)
+    payload.metrics.add(alias=5, datatype=spt.MetricDataType.UInt8, int_value=0xFF)
+    view = parser.view(payload)
+    assert [view.value(alias) for alias in range(1, 6)] == [-1, -2, -2, 32767, 255]
+
+    dataset = parser.init_dataset_metric(
+        payload,
+        "frame",
+        [spt.DataSetDataType.Int8, spt.DataSetDataType.Int16],
+        ["a", "b"],
+    )
+    parser.add_rows_to_dataset(dataset, [[0xFF, 0xFFFE]])
+    df, _ = parser.parse_datasets_to_dfs(payload, columnar=True)
+    assert df.iloc[0].tolist() == [view.value(1), view.value(2)]
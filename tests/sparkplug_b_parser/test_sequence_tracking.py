@@ -0,0 +1,96 @@
+import numpy as np
+import pytest
+import sparkplug_b_parser as spt
+from sparkplug_b_parser import SeqStatus, SequenceTracker
+
+NODE = spt.DeviceKey("plant", "edge1")
+
+
+def test_update_classifies_messages():
+    # Ensure that gaps, duplicates and late messages are told apart across wrap
+    requested = []
+    tracker = SequenceTracker(on_rebirth=requested.append)
+    statuses = [
+        tracker.update(NODE, seq, birth=birth)
+        for seq, birth in [(0, True), (1, False), (3, False), (3, False), (2, False)]
+    ]
+    assert statuses == [
+        SeqStatus.BIRTH,
+        SeqStatus.OK,
+        SeqStatus.GAP,
+        SeqStatus.DUPLICATE,
+        SeqStatus.REORDERED,
+    ]
+    # One rebirth request until the node is born again
+    assert requested == [NODE]
+    stats = tracker.stats(NODE)
+    assert stats == (5, 1, 1, 1, 1, 3, True)
+
+    tracker.update(NODE, 0, birth=True)
+    assert [tracker.update(NODE, seq % 256) for seq in range(1, 300)] == [
+        SeqStatus.OK
+    ] * 299
+    assert tracker.stats(NODE).awaiting_rebirth is False
+
+
+def test_update_batch_matches_update():
+    # Ensure that a batch is classified as the same messages one by one
+    rng = np.random.default_rng(0)
+    nodes = [spt.DeviceKey("plant", f"edge{n}") for n in rng.integers(0, 4, 500)]
+    counters = {node: int(rng.integers(0, 256)) for node in set(nodes)}
+    seqs = []
+    for node in nodes:
+        step = int(rng.choice([1, 1, 1, 0, -2, 4]))
+        counters[node] = (counters[node] + step) % 256
+        seqs.append(counters[node])
+
+    single, batch = SequenceTracker(), SequenceTracker(capacity=1)
+    expected = [single.update(node, seq) for node, seq in zip(nodes, seqs)]
+    statuses = np.concatenate(
+        [
+            batch.update_batch(nodes[:200], seqs[:200]),
+            batch.update_batch(batch.node_ids(nodes[200:]), seqs[200:]),
+        ]
+    )
+    assert statuses.tolist() == expected
+    for node in counters:
+        assert batch.stats(node) == single.stats(node)
+
+
+def test_update_batch_births_and_rebirth_requests():
+    # Ensure that births restart the sequence and errors request one rebirth
+    requested = []
+    tracker = SequenceTracker(on_rebirth=requested.append)
+    other = spt.DeviceKey("plant", "edge2")
+    statuses = tracker.update_batch(
+        [NODE, other, NODE, NODE, other, NODE, NODE],
+        [200, 7, 201, 205, 9, 0, 1],
+        [True, False, False, False, False, True, False],
+    )
+    assert statuses.tolist() == [
+        SeqStatus.BIRTH,
+        SeqStatus.FIRST,
+        SeqStatus.OK,
+        SeqStatus.GAP,
+        SeqStatus.GAP,
+        SeqStatus.BIRTH,
+        SeqStatus.OK,
+    ]
+    # NODE was born again after its gap, so only edge2 needs a rebirth
+    assert requested == [other]
+    assert tracker.stats(NODE).last_seq == 1
+    assert tracker.stats(NODE).missing == 3
+    with pytest.raises(ValueError):
+        tracker.update_batch([NODE], [1, 2])
+
+
+def test_handle_topics():
+    # Ensure that device messages count against their edge node's sequence
+    tracker = SequenceTracker()
+    assert tracker.handle("spBv1.0/plant/NBIRTH/edge1", 0) == SeqStatus.BIRTH
+    assert tracker.handle("spBv1.0/plant/DBIRTH/edge1/axuv", 1) == SeqStatus.OK
+    assert tracker.handle("spBv1.0/plant/DDATA/edge1/axuv", 2) == SeqStatus.OK
+    assert tracker.handle("spBv1.0/plant/DCMD/edge1/axuv", None) is None
+    assert tracker.handle("spBv1.0/plant/NDEATH/edge1", None) is None
+    assert tracker.stats(NODE).last_seq is None
+    assert len(tracker) == 1
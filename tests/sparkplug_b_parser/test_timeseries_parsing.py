@@ -45,3 +45,20 @@ def test_parse_timeseries_payload(example_message_timeseries, parser):
     )
     # Ensure that the body is parsed correctly
     assert payload.body == b"optional raw data here"
+
+
+def test_parse_bytes_to_dict_selected_metrics(example_message_timeseries, parser):
+    # Ensure that only the selected metrics are decoded and converted
+    result = parser.parse_bytes_to_dict(
+        example_message_timeseries, metrics={"pressure", "vibration"}
+    )
+    assert [metric["name"] for metric in result["metrics"]] == [
+        "pressure",
+        "vibration",
+    ]
+    full = parser.parse_bytes_to_dict(example_message_timeseries)
+    assert result["timestamp"] == full["timestamp"]
+    native = parser.parse_bytes_to_native_dict(
+        example_message_timeseries, metrics=["humidity"]
+    )
+    assert [metric["name"] for metric in native["metrics"]] == ["humidity"]
@@ -0,0 +1,75 @@
+import base64
+import copy
+
+import numpy as np
+import pytest
+from sparkplug_b_parser.example_payloads.byte import EXAMPLE_PAYLOAD_SPARKPLUGB_BYTES
+from sparkplug_b_parser.waveform import sample_dtype
+
+SAMPLES = [
+    np.arange(-4000, 4191, dtype=">i2"),
+    np.arange(8191, dtype=">i2"),
+]
+
+
+@pytest.fixture(scope="module")
+def example_message_waveform(parser):
+    payload = copy.deepcopy(EXAMPLE_PAYLOAD_SPARKPLUGB_BYTES)
+    for metric, samples in zip(payload["metrics"], SAMPLES):
+        metric["bytes_value"] = base64.b64encode(samples.tobytes()).decode()
+    return parser.parse_dict_to_bytes(payload)
+
+
+def test_parse_waveforms(example_message_waveform, parser):
+    # Ensure that samples are read big-endian, scaled by the gain and timed
+    waveforms = parser.parse_waveforms(example_message_waveform)
+    assert [w.name for w in waveforms] == ["AXUV1_ch1", "AXUV1_ch2"]
+    for waveform, samples in zip(waveforms, SAMPLES):
+        assert waveform.raw.dtype == np.dtype(">i2")
+        np.testing.assert_array_equal(waveform.raw, samples)
+        np.testing.assert_array_equal(waveform.values, samples * 1000.0)
+        assert waveform.time.shape == (8191,)
+        assert waveform.time[1] == pytest.approx(1 / 250000)
+        assert waveform.time[-1] == pytest.approx(0.03276)
+        assert waveform.properties["channel_id"] in (0, 1)
+        assert waveform.timestamp == 1737406554
+    # Channels acquired alike share a read-only time axis
+    assert waveforms[0].time is waveforms[1].time
+    assert not waveforms[0].time.flags.writeable
+
+
+def test_parse_waveforms_from_payload(example_message_waveform, parser):
+    # Ensure that a Payload message decodes like its bytes, and metrics filter
+    payload = parser.parse_bytes_to_protobuf(example_message_waveform)
+    expected = parser.parse_waveforms(example_message_waveform)[1]
+    (waveform,) = parser.parse_waveforms(payload, metrics={"AXUV1_ch2"})
+    assert waveform.name == "AXUV1_ch2"
+    np.testing.assert_array_equal(waveform.values, expected.values)
+    np.testing.assert_array_equal(waveform.time, expected.time)
+
+
+def test_parse_waveforms_too_short(parser):
+    # Ensure that a waveform shorter than acq_total_samples is rejected
+    payload = copy.deepcopy(EXAMPLE_PAYLOAD_SPARKPLUGB_BYTES)
+    payload["metrics"][0]["bytes_value"] = base64.b64encode(b"\x00" * 10).decode()
+    payload["metrics"][1]["bytes_value"] = base64.b64encode(b"\x00" * 10).decode()
+    with pytest.raises(ValueError):
+        parser.parse_waveforms(parser.parse_dict_to_bytes(payload))
+
+
+def test_parse_waveforms_skips_other_bytes_metrics(example_message_timeseries, parser):
+    # Ensure that payloads without waveform metrics decode to an empty list
+    assert parser.parse_waveforms(example_message_timeseries) == []
+
+
+@pytest.mark.parametrize(
+    "byte_order, bit_res, signed, expected",
+    [
+        (0, 16, True, ">i2"),
+        (1, 12, True, "<i2"),
+        (1, 8, False, "u1"),
+        (0, 24, True, ">i4"),
+    ],
+)
+def test_sample_dtype(byte_order, bit_res, signed, expected):
+    assert sample_dtype(byte_order, bit_res, signed) == np.dtype(expected)